@@ -1,11 +1,22 @@
 """dataorc-utils public package exports and metadata.
 
 Keep package-level re-exports here for convenience and typing discovery.
+Subpackages are imported on first attribute access (PEP 562), so
+``import dataorc_utils`` stays cheap for short-lived jobs.
 """
 
+from typing import TYPE_CHECKING
+
+from ._lazy import lazy_exports
+
 __author__ = "Equinor"
 __email__ = "toarst@equinor.com"
 
-from . import azure, config, databricks
+if TYPE_CHECKING:  # pragma: no cover
+    from . import azure, config, databricks, tracing
+
+__all__ = ["azure", "config", "databricks", "tracing"]
 
-__all__ = ["azure", "config", "databricks"]
+__getattr__, __dir__ = lazy_exports(
+    __name__, {name: f".{name}" for name in __all__}, globals()
+)
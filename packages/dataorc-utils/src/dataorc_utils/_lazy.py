@@ -0,0 +1,40 @@
+"""PEP 562 lazy attribute loading for package ``__init__`` modules.
+
+Packages declare ``{attribute: module}`` and get ``__getattr__`` / ``__dir__``
+that import the module on first attribute access, so importing a package does
+not pull in optional or heavy dependencies (the Azure SDK, fsspec, asyncio)
+until they are actually used.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import Any, Callable, Mapping
+
+
+def lazy_exports(
+    package: str, exports: Mapping[str, str], namespace: dict[str, Any]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """Build ``__getattr__`` and ``__dir__`` for *package*.
+
+    Args:
+        package: The package's ``__name__``.
+        exports: Attribute name -> relative module (``".keyvault"``). When the
+            attribute is the module itself, map it to ``"." + name``.
+        namespace: The package's ``globals()``; loaded attributes are cached
+            there so later lookups bypass ``__getattr__``.
+    """
+
+    def __getattr__(name: str) -> Any:
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module = importlib.import_module(module_name, package)
+        value = module if module_name == f".{name}" else getattr(module, name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
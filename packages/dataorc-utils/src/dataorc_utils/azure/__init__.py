@@ -1,5 +1,70 @@
-"""Azure helpers for common cloud operations."""
+"""Azure helpers for common cloud operations.
 
-from .keyvault import get_keyvault_secret
+Exports are loaded on first access (PEP 562); the Azure SDK itself is only
+imported when a helper is called.
+"""
 
-__all__ = ["get_keyvault_secret"]
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .credentials import (
+        PinnedChainCredential,
+        configure_credentials,
+        get_credential,
+        prefetch_tokens,
+    )
+    from .keyvault import (
+        configure_secret_cache,
+        disable_secret_cache,
+        get_keyvault_secret,
+        get_keyvault_secrets,
+        invalidate_secret,
+        secret_cache_enabled,
+    )
+    from .keyvault_async import (
+        close_keyvault_async,
+        get_keyvault_secret_async,
+        get_keyvault_secrets_async,
+    )
+    from .rate_limit import TokenBucket
+    from .secret_cache import SecretCache
+
+_EXPORTS = {
+    "PinnedChainCredential": ".credentials",
+    "configure_credentials": ".credentials",
+    "get_credential": ".credentials",
+    "prefetch_tokens": ".credentials",
+    "configure_secret_cache": ".keyvault",
+    "disable_secret_cache": ".keyvault",
+    "get_keyvault_secret": ".keyvault",
+    "get_keyvault_secrets": ".keyvault",
+    "invalidate_secret": ".keyvault",
+    "secret_cache_enabled": ".keyvault",
+    "close_keyvault_async": ".keyvault_async",
+    "get_keyvault_secret_async": ".keyvault_async",
+    "get_keyvault_secrets_async": ".keyvault_async",
+    "TokenBucket": ".rate_limit",
+    "SecretCache": ".secret_cache",
+}
+
+__all__ = [
+    "PinnedChainCredential",
+    "SecretCache",
+    "TokenBucket",
+    "close_keyvault_async",
+    "configure_credentials",
+    "configure_secret_cache",
+    "disable_secret_cache",
+    "get_credential",
+    "get_keyvault_secret",
+    "get_keyvault_secret_async",
+    "get_keyvault_secrets",
+    "get_keyvault_secrets_async",
+    "invalidate_secret",
+    "prefetch_tokens",
+    "secret_cache_enabled",
+]
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS, globals())
@@ -0,0 +1,299 @@
+"""Shared Azure credential factory.
+
+Both ``azure.keyvault`` and ``lake.AdlsLakeFileSystem`` obtain their default
+credential from ``get_credential()`` so a process holds one credential (and one
+token cache) instead of one per helper.
+
+Fast mode avoids probing the full ``DefaultAzureCredential`` chain on every new
+process:
+
+- The first credential in the chain that returns a token is *pinned*, in memory
+  and in a small file shared by processes on the node, and later processes
+  build that credential directly.
+- Optionally, tokens are persisted with ``TokenCachePersistenceOptions`` so
+  sibling processes reuse them (service principal / workload identity only).
+- ``prefetch_tokens()`` warms the storage and Key Vault scopes in the
+  background at job start.
+
+Enable it with ``configure_credentials(fast=True)`` or by setting the
+``DATAORC_FAST_CREDENTIAL`` environment variable to ``1``. The pin file lives
+in ``~/.cache/dataorc`` unless ``DATAORC_CREDENTIAL_CACHE_DIR`` is set.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from ..tracing import traced
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+STORAGE_SCOPE = "https://storage.azure.com/.default"
+KEYVAULT_SCOPE = "https://vault.azure.net/.default"
+
+# Candidate credentials in DefaultAzureCredential order (non-interactive only)
+CREDENTIAL_CHAIN = ("environment", "workload_identity", "managed_identity", "cli")
+
+_TRUTHY = {"1", "true", "yes", "on"}
+
+_lock = threading.Lock()
+_credentials: dict[tuple[bool, bool], Any] = {}
+_settings = {
+    "fast": os.getenv("DATAORC_FAST_CREDENTIAL", "").lower() in _TRUTHY,
+    "persist_tokens": os.getenv("DATAORC_PERSIST_TOKENS", "").lower() in _TRUTHY,
+}
+
+
+def _import_identity() -> Any:
+    try:
+        import azure.identity as identity  # type: ignore
+    except ImportError as exc:
+        raise ImportError(
+            "Azure SDK not installed. Install with 'pip install dataorc-utils[azure]'"
+        ) from exc
+    return identity
+
+
+def _pin_file() -> Path:
+    """Location of the pinned credential kind shared by processes on the node."""
+    root = os.getenv("DATAORC_CREDENTIAL_CACHE_DIR")
+    base = Path(root) if root else Path.home() / ".cache" / "dataorc"
+    return base / "credential.json"
+
+
+def _read_pin() -> str | None:
+    try:
+        kind = json.loads(_pin_file().read_text(encoding="utf-8")).get("kind")
+    except (OSError, ValueError, AttributeError):
+        return None
+    return kind if kind in CREDENTIAL_CHAIN else None
+
+
+def _write_pin(kind: str | None) -> None:
+    path = _pin_file()
+    try:
+        if kind is None:
+            path.unlink(missing_ok=True)
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"kind": kind}), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError as exc:
+        logger.debug("Could not persist pinned credential %s: %s", kind, exc)
+
+
+def _build(kind: str, persist_tokens: bool) -> Any:
+    """Construct a single credential of *kind*; raises if it is unavailable."""
+    identity = _import_identity()
+    kwargs: dict[str, Any] = {}
+    if persist_tokens and kind in ("environment", "workload_identity"):
+        kwargs["cache_persistence_options"] = identity.TokenCachePersistenceOptions(
+            name="dataorc-utils"
+        )
+    if kind == "environment":
+        return identity.EnvironmentCredential(**kwargs)
+    if kind == "workload_identity":
+        return identity.WorkloadIdentityCredential(**kwargs)
+    if kind == "managed_identity":
+        return identity.ManagedIdentityCredential()
+    if kind == "cli":
+        return identity.AzureCliCredential()
+    raise ValueError(f"Unknown credential kind: {kind!r}")
+
+
+class PinnedChainCredential:
+    """Credential chain that remembers which link worked.
+
+    Behaves like ``DefaultAzureCredential`` restricted to non-interactive
+    sources, but once a link returns a token all later calls go straight to it,
+    and the choice is written to a pin file so new processes skip the probe.
+    If the pinned credential can no longer authenticate the full chain is
+    probed again; other errors (network, throttling) are raised as they are.
+    Concurrent probes are coalesced into one.
+    """
+
+    def __init__(
+        self,
+        chain: Iterable[str] = CREDENTIAL_CHAIN,
+        persist_tokens: bool = False,
+        build: Callable[[str, bool], Any] = _build,
+    ) -> None:
+        self._chain = tuple(chain)
+        self._persist_tokens = persist_tokens
+        self._build = build
+        self._lock = threading.Lock()
+        self._probes: SingleFlight[Any] = SingleFlight()
+        self.kind: str | None = None
+        self._active: Any = None
+
+        pinned = _read_pin()
+        if pinned in self._chain:
+            try:
+                self._active = build(pinned, persist_tokens)
+                self.kind = pinned
+            except Exception as exc:
+                logger.debug("Pinned credential %s unavailable: %s", pinned, exc)
+
+    @traced("azure.credential.get_token", capture=("scopes",))
+    def get_token(self, *scopes: str, **kwargs: Any) -> Any:
+        from azure.core.exceptions import ClientAuthenticationError
+
+        active = self._active
+        if active is not None:
+            try:
+                return active.get_token(*scopes, **kwargs)
+            # CredentialUnavailableError is a ClientAuthenticationError
+            except ClientAuthenticationError as exc:
+                logger.info(
+                    "Pinned credential %s failed (%s); re-probing", self.kind, exc
+                )
+                with self._lock:
+                    if self._active is active:
+                        self._active, self.kind = None, None
+                        _write_pin(None)
+
+        def probe() -> Any:
+            # A probe that finished meanwhile may already have pinned a link
+            current = self._active
+            if current is not None and current is not active:
+                return current.get_token(*scopes, **kwargs)
+            return self._probe(*scopes, **kwargs)
+
+        return self._probes.do((scopes, tuple(sorted(kwargs.items()))), probe)
+
+    def _probe(self, *scopes: str, **kwargs: Any) -> Any:
+        identity = _import_identity()
+        errors: list[str] = []
+        for kind in self._chain:
+            credential = None
+            try:
+                credential = self._build(kind, self._persist_tokens)
+                token = credential.get_token(*scopes, **kwargs)
+            except Exception as exc:
+                errors.append(f"{kind}: {exc}")
+                if credential is not None and hasattr(credential, "close"):
+                    credential.close()
+                continue
+            with self._lock:
+                self._active, self.kind = credential, kind
+            _write_pin(kind)
+            logger.info("Pinned Azure credential: %s", kind)
+            return token
+        raise identity.CredentialUnavailableError(
+            "No credential in the chain could authenticate:\n" + "\n".join(errors)
+        )
+
+    def close(self) -> None:
+        active = self._active
+        if active is not None and hasattr(active, "close"):
+            active.close()
+
+
+def configure_credentials(
+    fast: bool | None = None, persist_tokens: bool | None = None
+) -> None:
+    """Set the process-wide defaults used by ``get_credential()``.
+
+    Args:
+        fast: Use ``PinnedChainCredential`` instead of ``DefaultAzureCredential``.
+        persist_tokens: Persist tokens to the shared MSAL cache (fast mode only).
+    """
+    with _lock:
+        if fast is not None:
+            _settings["fast"] = fast
+        if persist_tokens is not None:
+            _settings["persist_tokens"] = persist_tokens
+
+
+@traced("azure.get_credential")
+def get_credential(fast: bool | None = None, persist_tokens: bool | None = None) -> Any:
+    """Return the shared credential for this process, creating it on first use.
+
+    Arguments left as ``None`` fall back to ``configure_credentials()`` /
+    environment defaults.
+
+    Raises:
+        ImportError: If the Azure SDK is not installed.
+    """
+    fast = _settings["fast"] if fast is None else fast
+    persist = _settings["persist_tokens"] if persist_tokens is None else persist_tokens
+    key = (fast, persist and fast)
+    with _lock:
+        credential = _credentials.get(key)
+        if credential is None:
+            if fast:
+                credential = PinnedChainCredential(persist_tokens=persist)
+            else:
+                identity = _import_identity()
+                credential = identity.DefaultAzureCredential(
+                    exclude_interactive_browser_credential=True,
+                    exclude_visual_studio_code_credential=True,
+                )
+            _credentials[key] = credential
+        return credential
+
+
+def discard_credential(credential: Any) -> None:
+    """Drop *credential* from the shared cache so the next call builds a new one."""
+    with _lock:
+        for key, cached in list(_credentials.items()):
+            if cached is credential:
+                del _credentials[key]
+
+
+def reset_credentials(forget_pin: bool = False) -> None:
+    """Drop every shared credential; optionally delete the pin file too."""
+    with _lock:
+        _credentials.clear()
+    if forget_pin:
+        _write_pin(None)
+
+
+def prefetch_tokens(
+    scopes: Iterable[str] = (STORAGE_SCOPE, KEYVAULT_SCOPE),
+    credential: Any | None = None,
+    background: bool = True,
+) -> threading.Thread | None:
+    """Acquire tokens for *scopes* ahead of first use.
+
+    Failures are logged and ignored; the real call will surface them.
+
+    Returns:
+        The started daemon thread when ``background`` is True, else ``None``.
+    """
+    scopes = tuple(scopes)
+
+    def run() -> None:
+        cred = credential if credential is not None else get_credential()
+        for scope in scopes:
+            try:
+                cred.get_token(scope)
+            except Exception as exc:
+                logger.debug("Token prefetch for %s failed: %s", scope, exc)
+
+    if not background:
+        run()
+        return None
+    thread = threading.Thread(target=run, name="dataorc-token-prefetch", daemon=True)
+    thread.start()
+    return thread
+
+
+__all__ = [
+    "CREDENTIAL_CHAIN",
+    "KEYVAULT_SCOPE",
+    "STORAGE_SCOPE",
+    "PinnedChainCredential",
+    "configure_credentials",
+    "discard_credential",
+    "get_credential",
+    "prefetch_tokens",
+    "reset_credentials",
+]
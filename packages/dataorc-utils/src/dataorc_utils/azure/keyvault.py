@@ -3,36 +3,123 @@
 from __future__ import annotations
 
 import logging
+import threading
 import time
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable
+
+from ..tracing import span, traced
+from .credentials import discard_credential, get_credential
+from .rate_limit import KEYVAULT_SECRET_RATE, TokenBucket, retry_after_seconds
+from .secret_cache import SecretCache
+from .singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
-# Module-level cache for credential and clients
+# Module-level cache for credential and clients, guarded by ``_registry_lock``
+_registry_lock = threading.Lock()
 _credential: Any = None
 _clients: dict[str, Any] = {}
 
+# Coalesces concurrent fetches of the same (vault_url, secret_name, version)
+_inflight: SingleFlight[str] = SingleFlight()
+
+# Per-vault client-side rate limiters (kept across credential resets)
+_limiters: dict[str, TokenBucket] = {}
+
+# Opt-in secret value cache; ``None`` means every lookup hits Key Vault
+_secret_cache: SecretCache | None = None
+
+
+def _clear_cache(stale_credential: Any = None) -> None:
+    """Clear cached credentials and clients.
 
-def _clear_cache() -> None:
-    """Clear cached credentials and clients."""
+    When *stale_credential* is given, the cache is only cleared if it still
+    holds that credential. Threads that failed with the same credential then
+    trigger a single reset instead of discarding a replacement built by
+    another thread.
+    """
     global _credential, _clients
-    _credential = None
-    _clients = {}
+    with _registry_lock:
+        if stale_credential is not None and _credential is not stale_credential:
+            return
+        if _credential is not None:
+            discard_credential(_credential)
+        _credential = None
+        _clients = {}
+
+
+def configure_secret_cache(
+    ttl: float = 300.0,
+    max_size: int = 256,
+    refresh_ahead: float = 0.2,
+    max_stale: float = 3600.0,
+) -> SecretCache:
+    """Enable the in-process secret value cache used by ``get_keyvault_secret``.
+
+    Replaces any previously configured cache. See ``SecretCache`` for the
+    meaning of each argument.
+
+    Returns:
+        The newly installed cache.
+    """
+    global _secret_cache
+    _secret_cache = SecretCache(
+        ttl=ttl,
+        max_size=max_size,
+        refresh_ahead=refresh_ahead,
+        max_stale=max_stale,
+    )
+    return _secret_cache
+
+
+def disable_secret_cache() -> None:
+    """Disable the secret value cache and drop all cached values."""
+    global _secret_cache
+    _secret_cache = None
+
+
+def secret_cache_enabled() -> bool:
+    """True if ``configure_secret_cache()`` is in effect."""
+    return _secret_cache is not None
+
 
+def invalidate_secret(
+    vault_url: str | None = None,
+    secret_name: str | None = None,
+    version: str | None = None,
+) -> int:
+    """Drop cached secret values matching the given fields.
 
+    With no arguments every cached value is dropped. Returns the number of
+    entries removed (``0`` when the cache is disabled).
+    """
+    if _secret_cache is None:
+        return 0
+    return _secret_cache.invalidate(vault_url, secret_name, version)
+
+
+@traced("keyvault.get_secret", capture=("secret_name",))
 def get_keyvault_secret(
     vault_url: str,
     secret_name: str,
     max_retries: int = 2,
     retry_delay: float = 1.0,
+    version: str | None = None,
+    use_cache: bool = True,
 ) -> str:
     """Retrieve a secret from Azure Key Vault with retry logic.
 
+    When ``configure_secret_cache()`` has been called, values are served from
+    the in-process cache keyed by ``(vault_url, secret_name, version)``.
+
     Args:
         vault_url: The vault URL (e.g. ``https://myvault.vault.azure.net/``).
         secret_name: The secret name to retrieve.
         max_retries: Maximum retry attempts (default: 3).
         retry_delay: Initial delay in seconds, doubles each retry (default: 1.0).
+        version: Specific secret version; ``None`` fetches the latest.
+        use_cache: Set to ``False`` to bypass the secret cache for this call.
 
     Returns:
         The secret value as a string.
@@ -40,43 +127,157 @@ def get_keyvault_secret(
     Raises:
         ImportError: If the Azure SDK is not installed.
     """
-    global _credential, _clients
+    key = (vault_url, secret_name, version)
+
+    def load() -> str:
+        return _inflight.do(
+            key,
+            lambda: _fetch_secret(
+                vault_url, secret_name, version, max_retries, retry_delay
+            ),
+        )
+
+    cache = _secret_cache
+    if cache is None or not use_cache:
+        return load()
+    return cache.get(key, load)
+
+
+@traced("keyvault.get_secrets")
+def get_keyvault_secrets(
+    vault_url: str,
+    names: Iterable[str],
+    max_workers: int = 8,
+    max_retries: int = 2,
+    retry_delay: float = 1.0,
+    use_cache: bool = True,
+) -> tuple[dict[str, str], dict[str, Exception]]:
+    """Retrieve many secrets from one vault concurrently.
+
+    Requests run on a bounded thread pool sharing the module's cached
+    credential, ``SecretClient`` and per-vault rate limiter, so start-up cost
+    is roughly one round trip instead of one per secret. Duplicate names are
+    fetched once.
+
+    Args:
+        vault_url: The vault URL (e.g. ``https://myvault.vault.azure.net/``).
+        names: Secret names to retrieve.
+        max_workers: Maximum number of concurrent requests (default: 8).
+        max_retries: Maximum retry attempts per secret (default: 2).
+        retry_delay: Initial delay in seconds, doubles each retry (default: 1.0).
+        use_cache: Set to ``False`` to bypass the secret cache.
+
+    Returns:
+        A ``(values, errors)`` tuple: ``values`` maps each retrieved name to
+        its value and ``errors`` maps each failed name to the exception raised.
+
+    Raises:
+        ImportError: If the Azure SDK is not installed.
+    """
+    unique = list(dict.fromkeys(names))
+    values: dict[str, str] = {}
+    errors: dict[str, Exception] = {}
+    if not unique:
+        return values, errors
+
+    # Build the shared credential and client once before fanning out
+    _get_client(vault_url)
+
+    workers = max(1, min(max_workers, len(unique)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(
+                get_keyvault_secret,
+                vault_url,
+                name,
+                max_retries,
+                retry_delay,
+                None,
+                use_cache,
+            ): name
+            for name in unique
+        }
+        for future, name in futures.items():
+            try:
+                values[name] = future.result()
+            except Exception as exc:
+                errors[name] = exc
+
+    return values, errors
+
+
+def _get_limiter(vault_url: str) -> TokenBucket:
+    """Return the shared rate limiter for *vault_url*."""
+    limiter = _limiters.get(vault_url)
+    if limiter is None:
+        limiter = _limiters.setdefault(vault_url, TokenBucket(KEYVAULT_SECRET_RATE))
+    return limiter
+
+
+def _get_client(vault_url: str) -> tuple[Any, Any]:
+    """Return the cached ``(SecretClient, credential)`` pair for *vault_url*.
+
+    Creation happens under ``_registry_lock`` so concurrent first calls build a
+    single credential and a single client per vault.
+    """
+    global _credential
 
+    try:
+        from azure.keyvault.secrets import SecretClient  # type: ignore
+    except ImportError as exc:
+        raise ImportError(
+            "Azure SDK not installed. Install with 'pip install dataorc-utils[azure]'"
+        ) from exc
+
+    with _registry_lock:
+        if _credential is None:
+            _credential = get_credential()
+        if vault_url not in _clients:
+            _clients[vault_url] = SecretClient(
+                vault_url=vault_url, credential=_credential
+            )
+        return _clients[vault_url], _credential
+
+
+def _fetch_secret(
+    vault_url: str,
+    secret_name: str,
+    version: str | None,
+    max_retries: int,
+    retry_delay: float,
+) -> str:
+    """Fetch a secret from Key Vault, retrying transient failures."""
     try:
         from azure.core.exceptions import (  # type: ignore
             ClientAuthenticationError,
             HttpResponseError,
             ServiceRequestError,
         )
-        from azure.identity import DefaultAzureCredential  # type: ignore
-        from azure.keyvault.secrets import SecretClient  # type: ignore
     except ImportError as exc:
         raise ImportError(
             "Azure SDK not installed. Install with 'pip install dataorc-utils[azure]'"
         ) from exc
 
     retryable = (ClientAuthenticationError, HttpResponseError, ServiceRequestError)
+    limiter = _get_limiter(vault_url)
+    credential: Any = None
     last_exc: Exception | None = None
 
     for attempt in range(max_retries):
         try:
-            # Lazy init credential and client
-            if _credential is None:
-                _credential = DefaultAzureCredential(
-                    exclude_interactive_browser_credential=True,
-                    exclude_visual_studio_code_credential=True,
-                )
-            if vault_url not in _clients:
-                _clients[vault_url] = SecretClient(
-                    vault_url=vault_url, credential=_credential
-                )
-
-            return _clients[vault_url].get_secret(secret_name).value
+            client, credential = _get_client(vault_url)
+            limiter.acquire()
+            return client.get_secret(secret_name, version).value
 
         except retryable as exc:
             last_exc = exc
             if attempt < max_retries - 1:
                 delay = retry_delay * (2**attempt)
+                retry_after = retry_after_seconds(exc)
+                if retry_after is not None:
+                    # Throttled: hold back every caller sharing this vault
+                    delay = max(delay, retry_after)
+                    limiter.pause(retry_after)
                 logger.warning(
                     "Key Vault request failed (attempt %d/%d): %s. Retrying in %.1fs...",
                     attempt + 1,
@@ -84,9 +285,10 @@ def get_keyvault_secret(
                     exc,
                     delay,
                 )
-                time.sleep(delay)
+                with span("keyvault.backoff", attempt=attempt + 1, delay=delay):
+                    time.sleep(delay)
                 if isinstance(exc, ClientAuthenticationError):
-                    _clear_cache()
+                    _clear_cache(stale_credential=credential)
             else:
                 logger.error(
                     "Key Vault request failed after %d attempts: %s",
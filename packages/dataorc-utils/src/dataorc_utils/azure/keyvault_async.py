@@ -0,0 +1,336 @@
+"""Asyncio helpers for Azure Key Vault operations.
+
+Async counterparts of ``get_keyvault_secret`` / ``get_keyvault_secrets`` built
+on ``azure.keyvault.secrets.aio``. Clients are cached per event loop (async
+transports cannot be shared across loops), backoff uses ``asyncio.sleep``,
+and calls share the per-vault rate limiter and the opt-in secret cache with
+the synchronous helpers.
+
+Each loop authenticates with its own ``azure.identity.aio``
+``DefaultAzureCredential``. When that or its async transport (``aiohttp``)
+is unavailable, or fast credentials are configured (see
+``configure_credentials``), the shared credential from ``get_credential()``
+is used instead, with token requests run in a worker thread. Credentials and
+clients are built off the event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from ..tracing import span, traced
+from . import credentials, keyvault
+from .credentials import get_credential
+from .rate_limit import retry_after_seconds
+
+logger = logging.getLogger(__name__)
+
+
+class _AsyncCredential:
+    """Async view of the shared synchronous credential.
+
+    Token requests are rare (clients cache tokens until shortly before expiry)
+    and run in a worker thread. The shared credential belongs to the sync
+    helpers too, so it is never closed from here.
+    """
+
+    def __init__(self, credential: Any) -> None:
+        self.credential = credential
+
+    async def get_token(self, *scopes: str, **kwargs: Any) -> Any:
+        return await asyncio.to_thread(self.credential.get_token, *scopes, **kwargs)
+
+    async def close(self) -> None:
+        return None
+
+    async def __aenter__(self) -> "_AsyncCredential":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+
+@dataclass
+class _LoopState:
+    """Credential and clients owned by a single event loop.
+
+    ``in_use`` counts requests running on the clients. A state retired after
+    an authentication failure is closed once its last request finishes.
+    """
+
+    credential: Any = None
+    clients: dict[str, Any] = field(default_factory=dict)
+    in_use: int = 0
+    retired: bool = False
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+_loop_states: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _import_sdk() -> Any:
+    try:
+        from azure.keyvault.secrets.aio import SecretClient  # type: ignore
+    except ImportError as exc:
+        raise ImportError(
+            "Azure SDK not installed. Install with 'pip install dataorc-utils[azure]'"
+        ) from exc
+    return SecretClient
+
+
+def _new_credential() -> Any:
+    """Credential for one loop's clients; blocking, so run in a worker thread."""
+    if not credentials._settings["fast"]:
+        try:
+            from azure.identity.aio import DefaultAzureCredential  # type: ignore
+
+            return DefaultAzureCredential(
+                exclude_interactive_browser_credential=True,
+                exclude_visual_studio_code_credential=True,
+            )
+        except ImportError:
+            # Missing package or async transport (aiohttp)
+            logger.debug("azure.identity.aio unavailable; using the shared credential")
+    return _AsyncCredential(get_credential())
+
+
+async def _get_state() -> _LoopState:
+    """Return the running loop's state, creating its credential on first use."""
+    loop = asyncio.get_running_loop()
+    while True:
+        state = _loop_states.setdefault(loop, _LoopState())
+        if state.credential is None:
+            async with state.lock:
+                if state.credential is None and not state.retired:
+                    state.credential = await asyncio.to_thread(_new_credential)
+        if not state.retired:
+            return state
+        # Retired while the credential was being built
+        if state.in_use == 0:
+            await _close_state(state)
+
+
+async def _get_client(state: _LoopState, vault_url: str) -> Any:
+    """Return the async ``SecretClient`` for *vault_url* in *state*."""
+    client = state.clients.get(vault_url)
+    if client is None:
+        client_cls = _import_sdk()
+        async with state.lock:
+            client = state.clients.get(vault_url)
+            if client is None:
+                client = await asyncio.to_thread(
+                    client_cls, vault_url=vault_url, credential=state.credential
+                )
+                state.clients[vault_url] = client
+    return client
+
+
+async def _close_state(state: _LoopState) -> None:
+    clients, state.clients = state.clients, {}
+    credential, state.credential = state.credential, None
+    for client in clients.values():
+        await client.close()
+    if credential is not None:
+        # A no-op for the shared credential wrapper
+        await credential.close()
+
+
+async def _retire(state: _LoopState) -> None:
+    """Drop *state* after its credential failed to authenticate.
+
+    Only the loop's current state is dropped (like the sync ``_clear_cache``
+    with ``stale_credential``): if a sibling request already replaced it,
+    nothing happens. Clients still serving requests are closed by the last
+    of them.
+    """
+    loop = asyncio.get_running_loop()
+    if _loop_states.get(loop) is state:
+        del _loop_states[loop]
+    if not state.retired:
+        state.retired = True
+        if state.in_use == 0:
+            await _close_state(state)
+
+
+async def close_keyvault_async() -> None:
+    """Close and drop the credential and clients cached for the running loop."""
+    state = _loop_states.pop(asyncio.get_running_loop(), None)
+    if state is None:
+        return
+    state.retired = True
+    if state.in_use == 0:
+        await _close_state(state)
+
+
+@traced("keyvault.get_secret_async", capture=("secret_name",))
+async def get_keyvault_secret_async(
+    vault_url: str,
+    secret_name: str,
+    max_retries: int = 2,
+    retry_delay: float = 1.0,
+    version: str | None = None,
+    use_cache: bool = True,
+) -> str:
+    """Retrieve a secret from Azure Key Vault without blocking the event loop.
+
+    Mirrors ``get_keyvault_secret``: transient failures are retried with
+    exponential backoff (honouring ``Retry-After``), and the secret cache is
+    used when enabled via ``configure_secret_cache()``.
+
+    Args:
+        vault_url: The vault URL (e.g. ``https://myvault.vault.azure.net/``).
+        secret_name: The secret name to retrieve.
+        max_retries: Maximum retry attempts (default: 2).
+        retry_delay: Initial delay in seconds, doubles each retry (default: 1.0).
+        version: Specific secret version; ``None`` fetches the latest.
+        use_cache: Set to ``False`` to bypass the secret cache for this call.
+
+    Returns:
+        The secret value as a string.
+
+    Raises:
+        ImportError: If the Azure SDK is not installed.
+    """
+    cache = keyvault._secret_cache if use_cache else None
+    key = (vault_url, secret_name, version)
+    if cache is not None:
+        cached = cache.lookup(key)
+        if cached is not None:
+            return cached
+
+    try:
+        value = await _fetch_secret(
+            vault_url, secret_name, version, max_retries, retry_delay
+        )
+    except Exception:
+        stale = cache.lookup(key, allow_stale=True) if cache is not None else None
+        if stale is None:
+            raise
+        logger.warning("Secret reload failed; serving stale value for %s", secret_name)
+        return stale
+
+    if cache is not None:
+        cache.put(key, value)
+    return value
+
+
+@traced("keyvault.get_secrets_async")
+async def get_keyvault_secrets_async(
+    vault_url: str,
+    names: Iterable[str],
+    max_concurrency: int = 8,
+    max_retries: int = 2,
+    retry_delay: float = 1.0,
+    use_cache: bool = True,
+) -> tuple[dict[str, str], dict[str, Exception]]:
+    """Retrieve many secrets concurrently on the running event loop.
+
+    Async counterpart of ``get_keyvault_secrets``; await it alongside other
+    start-up I/O (e.g. with ``asyncio.gather``).
+
+    Returns:
+        A ``(values, errors)`` tuple: ``values`` maps each retrieved name to
+        its value and ``errors`` maps each failed name to the exception raised.
+    """
+    unique = list(dict.fromkeys(names))
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def fetch(name: str) -> str:
+        async with semaphore:
+            return await get_keyvault_secret_async(
+                vault_url, name, max_retries, retry_delay, None, use_cache
+            )
+
+    results = await asyncio.gather(
+        *(fetch(name) for name in unique), return_exceptions=True
+    )
+
+    values: dict[str, str] = {}
+    errors: dict[str, Exception] = {}
+    for name, result in zip(unique, results, strict=True):
+        if isinstance(result, Exception):
+            errors[name] = result
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            values[name] = result
+    return values, errors
+
+
+async def _fetch_secret(
+    vault_url: str,
+    secret_name: str,
+    version: str | None,
+    max_retries: int,
+    retry_delay: float,
+) -> str:
+    """Fetch a secret from Key Vault, retrying transient failures."""
+    try:
+        from azure.core.exceptions import (  # type: ignore
+            ClientAuthenticationError,
+            HttpResponseError,
+            ServiceRequestError,
+        )
+    except ImportError as exc:
+        raise ImportError(
+            "Azure SDK not installed. Install with 'pip install dataorc-utils[azure]'"
+        ) from exc
+
+    retryable = (ClientAuthenticationError, HttpResponseError, ServiceRequestError)
+    limiter = keyvault._get_limiter(vault_url)
+    last_exc: Exception | None = None
+
+    for attempt in range(max_retries):
+        state = await _get_state()
+        state.in_use += 1
+        try:
+            client = await _get_client(state, vault_url)
+            while (wait := limiter.try_acquire()) > 0:
+                await asyncio.sleep(wait)
+            secret = await client.get_secret(secret_name, version)
+            return secret.value
+
+        except retryable as exc:
+            last_exc = exc
+            if attempt < max_retries - 1:
+                delay = retry_delay * (2**attempt)
+                retry_after = retry_after_seconds(exc)
+                if retry_after is not None:
+                    delay = max(delay, retry_after)
+                    limiter.pause(retry_after)
+                logger.warning(
+                    "Key Vault request failed (attempt %d/%d): %s. Retrying in %.1fs...",
+                    attempt + 1,
+                    max_retries,
+                    exc,
+                    delay,
+                )
+                if isinstance(exc, ClientAuthenticationError):
+                    await _retire(state)
+                with span("keyvault.backoff", attempt=attempt + 1, delay=delay):
+                    await asyncio.sleep(delay)
+            else:
+                logger.error(
+                    "Key Vault request failed after %d attempts: %s",
+                    max_retries,
+                    exc,
+                )
+        finally:
+            state.in_use -= 1
+            if state.retired and state.in_use == 0:
+                await _close_state(state)
+
+    raise last_exc  # type: ignore[misc]
+
+
+__all__ = [
+    "close_keyvault_async",
+    "get_keyvault_secret_async",
+    "get_keyvault_secrets_async",
+]
@@ -0,0 +1,101 @@
+"""Client-side rate limiting for Azure service calls.
+
+Key Vault throttles secret reads per vault (4000 GET transactions per
+10 seconds at the time of writing). ``TokenBucket`` keeps concurrent callers
+under that budget and lets a ``Retry-After`` response pause every caller
+sharing the bucket, instead of each thread discovering the throttle itself.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable
+
+# Key Vault service limit for secret GETs: 4000 transactions / 10 s per vault
+KEYVAULT_SECRET_RATE = 400.0
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    Args:
+        rate: Tokens added per second.
+        capacity: Maximum burst size. Defaults to ``rate``.
+        clock: Monotonic time source (overridable for tests).
+        sleep: Sleep function (overridable for tests).
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Any] = time.sleep,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """Take *tokens* without blocking.
+
+        Returns ``0`` when the tokens were taken, otherwise the seconds to wait
+        before trying again.
+        """
+        with self._lock:
+            now = self._clock()
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until *tokens* are available; returns the total time waited."""
+        waited = 0.0
+        while True:
+            delay = self.try_acquire(tokens)
+            if delay <= 0:
+                return waited
+            self._sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """Block all acquirers for *seconds* (e.g. from a ``Retry-After`` header)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+            # Resume with an empty bucket so callers ramp back up gradually
+            self._tokens = 0.0
+            self._updated = self._blocked_until
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """Return the ``Retry-After`` delay carried by an Azure SDK error, if any.
+
+    Only the delta-seconds form is supported; HTTP-date values return ``None``.
+    """
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+__all__ = ["KEYVAULT_SECRET_RATE", "TokenBucket", "retry_after_seconds"]
@@ -0,0 +1,222 @@
+"""In-process TTL cache for Key Vault secret values.
+
+The cache is opt-in: ``get_keyvault_secret`` only consults it after
+``configure_secret_cache()`` has been called. Entries are keyed by
+``(vault_url, secret_name, version)`` and support:
+
+- TTL expiry and least-recently-used eviction above ``max_size``.
+- Refresh-ahead: a lookup inside the last ``refresh_ahead`` fraction of an
+  entry's TTL returns the cached value and refreshes it on a background thread.
+- Stale-while-revalidate: when a reload of an expired entry fails (throttling,
+  outage), the stale value is served for up to ``max_stale`` seconds.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+SecretKey = tuple[str, str, str | None]
+
+
+@dataclass(slots=True)
+class _Entry:
+    value: str
+    loaded_at: float
+    expires_at: float
+
+
+class SecretCache:
+    """Thread-safe TTL + LRU cache for secret values.
+
+    Args:
+        ttl: Seconds a loaded value is considered fresh.
+        max_size: Maximum number of entries; least recently used are evicted.
+        refresh_ahead: Fraction of ``ttl`` (0-1) before expiry in which a hit
+            triggers a background refresh. ``0`` disables refresh-ahead.
+        max_stale: Seconds past expiry a value may still be served when the
+            reload fails. ``0`` disables stale-while-revalidate.
+        clock: Monotonic time source (overridable for tests).
+    """
+
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        max_size: int = 256,
+        refresh_ahead: float = 0.2,
+        max_stale: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        if not 0 <= refresh_ahead < 1:
+            raise ValueError("refresh_ahead must be in [0, 1)")
+        self.ttl = ttl
+        self.max_size = max_size
+        self.refresh_ahead = refresh_ahead
+        self.max_stale = max_stale
+        self._clock = clock
+        self._entries: OrderedDict[SecretKey, _Entry] = OrderedDict()
+        self._refreshing: set[SecretKey] = set()
+        # Bumped by invalidate()/clear(); loads started before are not stored
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def get(self, key: SecretKey, loader: Callable[[], str]) -> str:
+        """Return the cached value for *key*, calling *loader* on a miss.
+
+        Exceptions raised by *loader* propagate unless a stale value within
+        ``max_stale`` is available, in which case it is returned instead.
+        """
+        now = self._clock()
+        with self._lock:
+            generation = self._generation
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if now < entry.expires_at:
+                    if self._should_refresh(key, entry, now):
+                        self._refreshing.add(key)
+                        self._start_refresh(key, loader, generation)
+                    return entry.value
+
+        try:
+            value = loader()
+        except Exception:
+            if entry is not None and now - entry.expires_at <= self.max_stale:
+                logger.warning(
+                    "Secret reload failed; serving stale value for %s", key[1]
+                )
+                return entry.value
+            raise
+
+        self._put_if_current(key, value, generation)
+        return value
+
+    def lookup(self, key: SecretKey, allow_stale: bool = False) -> str | None:
+        """Return the cached value for *key* without loading, or ``None``.
+
+        Expired values are only returned when ``allow_stale`` is set and the
+        entry is within ``max_stale`` of its expiry.
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            if now < entry.expires_at:
+                return entry.value
+            if allow_stale and now - entry.expires_at <= self.max_stale:
+                return entry.value
+            return None
+
+    def put(self, key: SecretKey, value: str) -> None:
+        """Insert or replace *key*, evicting the least recently used entries."""
+        with self._lock:
+            self._store(key, value)
+
+    def _put_if_current(self, key: SecretKey, value: str, generation: int) -> None:
+        """`put`, unless the cache was invalidated since *generation*."""
+        with self._lock:
+            if self._generation == generation:
+                self._store(key, value)
+
+    def _store(self, key: SecretKey, value: str) -> None:
+        """Insert *key* (called under the lock)."""
+        now = self._clock()
+        self._entries[key] = _Entry(value, now, now + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Invalidation hooks
+    # ------------------------------------------------------------------
+
+    def invalidate(
+        self,
+        vault_url: str | None = None,
+        secret_name: str | None = None,
+        version: str | None = None,
+    ) -> int:
+        """Drop entries matching every supplied field; returns the count removed.
+
+        Calling with no arguments clears the cache. ``version`` only filters
+        when given, so ``invalidate(vault, name)`` drops every version of a
+        secret. Loads and background refreshes already in flight do not
+        store their result afterwards.
+        """
+        with self._lock:
+            self._generation += 1
+            doomed = [
+                key
+                for key in self._entries
+                if (vault_url is None or key[0] == vault_url)
+                and (secret_name is None or key[1] == secret_name)
+                and (version is None or key[2] == version)
+            ]
+            for key in doomed:
+                del self._entries[key]
+            return len(doomed)
+
+    def clear(self) -> None:
+        """Remove every entry and forget in-flight loads and refreshes."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._refreshing.clear()
+
+    # ------------------------------------------------------------------
+    # Background refresh
+    # ------------------------------------------------------------------
+
+    def _should_refresh(self, key: SecretKey, entry: _Entry, now: float) -> bool:
+        if not self.refresh_ahead or key in self._refreshing:
+            return False
+        return now >= entry.expires_at - self.ttl * self.refresh_ahead
+
+    def _start_refresh(
+        self, key: SecretKey, loader: Callable[[], str], generation: int
+    ) -> None:
+        thread = threading.Thread(
+            target=self._refresh,
+            args=(key, loader, generation),
+            name=f"secret-refresh-{key[1]}",
+            daemon=True,
+        )
+        thread.start()
+
+    def _refresh(
+        self, key: SecretKey, loader: Callable[[], str], generation: int
+    ) -> None:
+        try:
+            self._put_if_current(key, loader(), generation)
+        except Exception as exc:
+            logger.warning("Background refresh of secret %s failed: %s", key[1], exc)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+
+__all__ = ["SecretCache", "SecretKey"]
@@ -0,0 +1,51 @@
+"""Single-flight call coalescing.
+
+When many threads ask for the same key at once, only the first one runs the
+underlying call; the others block and receive the same result (or exception).
+This keeps a burst of identical lookups from turning into a burst of identical
+HTTP requests.
+"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+from typing import Callable, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Coalesce concurrent calls that share a key into one execution."""
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, Future[T]] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Run *fn* for *key*, or wait for an identical call already in flight."""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(fn())
+        except BaseException as exc:
+            future.set_exception(exc)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return future.result()
+
+    def in_flight(self) -> int:
+        """Return the number of keys currently being fetched."""
+        with self._lock:
+            return len(self._calls)
+
+
+__all__ = ["SingleFlight"]
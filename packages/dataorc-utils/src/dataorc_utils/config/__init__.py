@@ -8,6 +8,16 @@ submodules so callers can `from dataorc_utils.config import ...`.
 from .enums import CoreParam, Defaults
 from .manager import PipelineParameterManager
 from .models import CorePipelineConfig, InfraContext
+from .paths import (
+    ParsedLakePath,
+    PathLayout,
+    parse_lake_path,
+    register_layout,
+    render_paths,
+)
+from .resolver import ConfigResolver, ResolvedConfig
+from .secrets import SecretRef, is_secret_ref, parse_secret_ref, prefetch_secrets
+from .serialization import ConfigCache
 from .validation import print_config
 
 __all__ = [
@@ -15,6 +25,18 @@ __all__ = [
     "Defaults",
     "InfraContext",
     "CorePipelineConfig",
+    "ConfigCache",
+    "ConfigResolver",
+    "ResolvedConfig",
+    "ParsedLakePath",
+    "PathLayout",
+    "parse_lake_path",
+    "register_layout",
+    "render_paths",
+    "SecretRef",
+    "is_secret_ref",
+    "parse_secret_ref",
+    "prefetch_secrets",
     "print_config",
     "PipelineParameterManager",
 ]
@@ -12,6 +12,11 @@ class CoreParam(str, Enum):
     DATALAKE_NAME = "datalake_name"
     DATALAKE_CONTAINER_NAME = "datalake_container_name"
     ENV = "env"
+    # Optional name of a registered lake path layout (see config.paths)
+    DATALAKE_PATH_LAYOUT = "datalake_path_layout"
+    # Optional LakeRouter backend ("local", "adls" or "fsspec") and local mount root
+    DATALAKE_BACKEND = "datalake_backend"
+    DATALAKE_MOUNT_ROOT = "datalake_mount_root"
 
     # Data Lake Structure Parameters
     # Following pattern: [containername/]{layer}/{domain}/{product}/{version}/output/{processing_method}
@@ -6,11 +6,41 @@ Cluster environment variables / wheel packaging.
 
 from __future__ import annotations
 
-import os
-from typing import Any, Mapping, Optional
+from types import MappingProxyType
+from typing import Any, Iterable, Iterator, Mapping, Optional
 
+from ..tracing import traced
 from .enums import CoreParam, Defaults
-from .models import CorePipelineConfig, InfraContext
+from .models import CorePipelineConfig, FrozenEnvVars, InfraContext
+from .resolver import ConfigResolver, ResolvedConfig
+from .rules import run_rules_checks
+from .serialization import FORMAT_VERSION, ConfigCache, cache_key
+
+_DEFAULTS: Mapping[CoreParam, str] = MappingProxyType(
+    {
+        CoreParam.BRONZE_VERSION: Defaults.VERSION,
+        CoreParam.SILVER_VERSION: Defaults.VERSION,
+        CoreParam.GOLD_VERSION: Defaults.VERSION,
+        CoreParam.BRONZE_PROCESSING_METHOD: Defaults.BRONZE_PROCESSING_METHOD,
+        CoreParam.SILVER_PROCESSING_METHOD: Defaults.SILVER_PROCESSING_METHOD,
+        CoreParam.GOLD_PROCESSING_METHOD: Defaults.GOLD_PROCESSING_METHOD,
+    }
+)
+
+# Per-table keys accepted by build_core_configs / iter_core_configs
+TABLE_SPEC_FIELDS: tuple[str, ...] = (
+    CoreParam.DOMAIN.value,
+    CoreParam.PRODUCT.value,
+    CoreParam.TABLE_NAME.value,
+    CoreParam.BRONZE_VERSION.value,
+    CoreParam.SILVER_VERSION.value,
+    CoreParam.GOLD_VERSION.value,
+    CoreParam.BRONZE_PROCESSING_METHOD.value,
+    CoreParam.SILVER_PROCESSING_METHOD.value,
+    CoreParam.GOLD_PROCESSING_METHOD.value,
+)
+
+TableSpecs = Iterable[Mapping[str, Any]] | Mapping[str, Iterable[Any]]
 
 
 class PipelineParameterManager:
@@ -33,9 +63,11 @@ class PipelineParameterManager:
         Initialize parameter manager.
 
         Args:
-            environments_config: Dictionary of environment configurations
-            domain_configs: Dictionary of domain configurations
-            product_configs: Dictionary of product configurations
+            environments_config: Per-environment settings, ``{env: {key: value}}``
+            domain_configs: Per-domain settings, ``{domain: {key: value}}``
+            product_configs: Per-product settings, ``{product: {key: value}}``;
+                entries under ``"{domain}.{product}"`` are applied on top
+            case_fallback: Fall back to other casings when looking up env vars
         """
         # Wheel-based packaging for configuration delivery.
         self.environments_config: Mapping[str, Any] = environments_config or {}
@@ -43,18 +75,17 @@ class PipelineParameterManager:
         self.product_configs: Mapping[str, Any] = product_configs or {}
         self.case_fallback = case_fallback
         self._local_environment = "dev"  # Default for local development
+        self.resolver = ConfigResolver(
+            defaults={param.value: value for param, value in _DEFAULTS.items()},
+            environments=self.environments_config,
+            domains=self.domain_configs,
+            products=self.product_configs,
+            case_fallback=case_fallback,
+        )
 
     def _get_default_value(self, param: CoreParam) -> str:
         """Get default value for a core parameter."""
-        defaults_map = {
-            CoreParam.BRONZE_VERSION: Defaults.VERSION,
-            CoreParam.SILVER_VERSION: Defaults.VERSION,
-            CoreParam.GOLD_VERSION: Defaults.VERSION,
-            CoreParam.BRONZE_PROCESSING_METHOD: Defaults.BRONZE_PROCESSING_METHOD,
-            CoreParam.SILVER_PROCESSING_METHOD: Defaults.SILVER_PROCESSING_METHOD,
-            CoreParam.GOLD_PROCESSING_METHOD: Defaults.GOLD_PROCESSING_METHOD,
-        }
-        return defaults_map.get(param, "")
+        return _DEFAULTS.get(param, "")
 
     def get_env_variables(
         self, var_names: list[str], required: bool = False
@@ -74,15 +105,13 @@ class PipelineParameterManager:
         """
         result = {}
         missing = []
+        # One snapshot of os.environ per call, indexed for case_fallback
+        snapshot = self.resolver.refresh_environment()
 
         for var_name in var_names:
-            # Lookup strategy: exact first. If case_fallback enabled, try UPPER then lower.
-            env_value = os.getenv(var_name)
-            if env_value is None and self.case_fallback:
-                if var_name.upper() != var_name:
-                    env_value = os.getenv(var_name.upper())
-                if env_value is None and var_name.lower() != var_name:
-                    env_value = os.getenv(var_name.lower())
+            # Lookup strategy: exact first. If case_fallback enabled, try UPPER,
+            # lower, then any other casing.
+            env_value = snapshot.get(var_name, self.case_fallback)
 
             if env_value is not None:
                 result[var_name] = env_value
@@ -99,6 +128,49 @@ class PipelineParameterManager:
 
         return result
 
+    @traced("config.resolve")
+    def resolve(
+        self,
+        env: Optional[str] = None,
+        domain: str = "",
+        product: str = "",
+        overrides: Optional[Mapping[str, Any]] = None,
+        env_var_names: Iterable[str] = (),
+        use_env_vars: bool = True,
+    ) -> ResolvedConfig:
+        """Resolve settings through every configuration layer.
+
+        Precedence, lowest first: defaults, ``environments_config[env]``,
+        ``domain_configs[domain]``, ``product_configs[product]``, *overrides*,
+        then environment variables. The result records which layer supplied
+        each key (``resolved.source(key)``).
+
+        Args:
+            env: Environment name; defaults to the ``env`` environment variable
+                or the local default ("dev").
+            domain, product: Select the domain and product layers.
+            overrides: Explicit values; ``None`` values are ignored.
+            env_var_names: Extra keys to read from environment variables.
+            use_env_vars: Set to False to skip the environment-variable layer.
+        """
+        if use_env_vars or env is None:
+            # Pick up os.environ changes made since the last call
+            snapshot = self.resolver.refresh_environment()
+        if env is None:
+            env = (
+                snapshot.get(CoreParam.ENV.value, self.case_fallback)
+                or self._local_environment
+            )
+        return self.resolver.resolve(
+            env,
+            domain,
+            product,
+            overrides=overrides,
+            env_var_names=env_var_names,
+            use_env_vars=use_env_vars,
+        )
+
+    @traced("config.prepare_infrastructure")
     def prepare_infrastructure(self, env_vars: list[str]) -> InfraContext:
         """Read and return infrastructure context (no dataset identifiers).
 
@@ -124,6 +196,7 @@ class PipelineParameterManager:
 
         return InfraContext(env=infra_vars[CoreParam.ENV.value], variables=infra_vars)
 
+    @traced("config.build_core_config", capture=("table_name",))
     def build_core_config(
         self,
         infra: InfraContext,
@@ -137,21 +210,26 @@ class PipelineParameterManager:
         silver_processing_method: Optional[str] = None,
         gold_processing_method: Optional[str] = None,
     ) -> CorePipelineConfig:
-        """Compose a CorePipelineConfig from infra plus pipeline-specific overrides."""
+        """Compose a CorePipelineConfig from infra plus pipeline-specific overrides.
+
+        Versions and processing methods not passed explicitly come from the
+        product, domain and environment configs, then the defaults.
+        """
         # Resolve defaults if None supplied
-        bv = bronze_version or self._get_default_value(CoreParam.BRONZE_VERSION)
-        sv = silver_version or self._get_default_value(CoreParam.SILVER_VERSION)
-        gv = gold_version or self._get_default_value(CoreParam.GOLD_VERSION)
+        layered = self.resolver.resolve_layers(infra.env, domain, product).values
+        bv = bronze_version or layered[CoreParam.BRONZE_VERSION.value]
+        sv = silver_version or layered[CoreParam.SILVER_VERSION.value]
+        gv = gold_version or layered[CoreParam.GOLD_VERSION.value]
 
-        bpm = bronze_processing_method or self._get_default_value(
-            CoreParam.BRONZE_PROCESSING_METHOD
-        )
-        spm = silver_processing_method or self._get_default_value(
-            CoreParam.SILVER_PROCESSING_METHOD
+        bpm = (
+            bronze_processing_method
+            or layered[CoreParam.BRONZE_PROCESSING_METHOD.value]
         )
-        gpm = gold_processing_method or self._get_default_value(
-            CoreParam.GOLD_PROCESSING_METHOD
+        spm = (
+            silver_processing_method
+            or layered[CoreParam.SILVER_PROCESSING_METHOD.value]
         )
+        gpm = gold_processing_method or layered[CoreParam.GOLD_PROCESSING_METHOD.value]
 
         config = CorePipelineConfig(
             env=infra.env,
@@ -168,3 +246,129 @@ class PipelineParameterManager:
         )
         config.validate_rules()
         return config
+
+    @traced("config.load_core_config", capture=("table_name",))
+    def load_core_config(
+        self,
+        infra: InfraContext,
+        domain: str = "",
+        product: str = "",
+        table_name: str = "",
+        cache: Optional[ConfigCache] = None,
+        **overrides: Optional[str],
+    ) -> CorePipelineConfig:
+        """Warm-start variant of ``build_core_config`` backed by a ``ConfigCache``.
+
+        The cache key covers the infrastructure variables, the table identity,
+        the explicit overrides and the resolved configuration layers, so any
+        change to them builds (and stores) a fresh config. Cache hits are
+        re-validated against this process's rules; rule results are memoised,
+        so this is cheap.
+
+        Args:
+            cache: Cache to use; defaults to ``ConfigCache()``.
+            **overrides: Keyword arguments of ``build_core_config``
+                (``bronze_version``, ``gold_processing_method``, ...).
+        """
+        cache = cache or ConfigCache()
+        layered = self.resolver.resolve_layers(infra.env, domain, product).values
+        key = cache_key(
+            FORMAT_VERSION,
+            infra.env,
+            dict(infra.variables),
+            [domain, product, table_name],
+            overrides,
+            dict(layered),
+        )
+        return cache.get_or_build(
+            key,
+            lambda: self.build_core_config(
+                infra, domain, product, table_name, **overrides
+            ),
+        )
+
+    def iter_core_configs(
+        self,
+        infra: InfraContext,
+        table_specs: TableSpecs,
+        validate: bool = True,
+    ) -> Iterator[CorePipelineConfig]:
+        """Lazily build one CorePipelineConfig per table spec.
+
+        Args:
+            infra: Infrastructure context shared by every table.
+            table_specs: Either an iterable of row mappings or a columnar
+                mapping of equal-length sequences (e.g. ``df.to_dict("list")``).
+                Keys are those of ``build_core_config`` (``domain``, ``product``,
+                ``table_name``, ``<layer>_version``, ``<layer>_processing_method``);
+                missing or empty values fall back to the product, domain and
+                environment configs, then the defaults.
+            validate: Run ``validate_rules`` on each config.
+
+        Yields:
+            Valid configs in input order. Layered defaults are resolved once
+            per (domain, product) and every config shares a single read-only ``env_vars`` mapping.
+
+        Raises:
+            ValueError: After the last valid config has been yielded, if any
+                table spec was invalid. The message lists every failure.
+        """
+        env_vars = FrozenEnvVars(infra.variables)
+        defaulted = tuple(param.value for param in _DEFAULTS)
+        errors: list[str] = []
+
+        for index, spec in enumerate(_iter_table_specs(table_specs)):
+            unknown = spec.keys() - TABLE_SPEC_FIELDS
+            if unknown:
+                errors.append(f"[#{index}] unknown table spec keys: {sorted(unknown)}")
+                continue
+            domain = spec.get("domain") or ""
+            product = spec.get("product") or ""
+            layered = self.resolver.resolve_layers(infra.env, domain, product).values
+            config = CorePipelineConfig(
+                env=infra.env,
+                domain=domain,
+                product=product,
+                table_name=spec.get("table_name") or "",
+                env_vars=env_vars,
+                **{field: spec.get(field) or layered[field] for field in defaulted},
+            )
+            if validate:
+                try:
+                    run_rules_checks(config)
+                except ValueError as exc:
+                    label = ".".join([config.domain, config.product, config.table_name])
+                    errors.append(f"[#{index} {label}] {exc}")
+                    continue
+            yield config
+
+        if errors:
+            raise ValueError(
+                f"Invalid table specs ({len(errors)}):\n" + "\n".join(errors)
+            )
+
+    @traced("config.build_core_configs")
+    def build_core_configs(
+        self,
+        infra: InfraContext,
+        table_specs: TableSpecs,
+        validate: bool = True,
+    ) -> list[CorePipelineConfig]:
+        """Build CorePipelineConfigs for many tables at once.
+
+        Eager form of ``iter_core_configs``: every table is validated before
+        returning, and a single ValueError lists all failures across tables.
+        """
+        configs: list[CorePipelineConfig] = []
+        configs.extend(self.iter_core_configs(infra, table_specs, validate=validate))
+        return configs
+
+
+def _iter_table_specs(table_specs: TableSpecs) -> Iterator[Mapping[str, Any]]:
+    """Yield row mappings from row-wise or columnar table specs."""
+    if isinstance(table_specs, Mapping):
+        columns = list(table_specs)
+        for row in zip(*(table_specs[c] for c in columns), strict=True):
+            yield dict(zip(columns, row, strict=True))
+    else:
+        yield from table_specs
@@ -1,9 +1,11 @@
 """Core configuration data classes."""
 
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Any, Mapping, NoReturn, Optional
 
 from .enums import Defaults
+from .paths import build_paths, path_values, resolve_layout
+from .secrets import is_secret_ref, prefetch_secrets, resolve_secret_ref
 
 
 @dataclass
@@ -22,8 +24,45 @@ class InfraContext:
     variables: dict[str, str] = field(default_factory=dict)
 
 
+class FrozenEnvVars(dict):
+    """Read-only snapshot of infrastructure variables.
+
+    A ``dict`` that rejects mutation. Unlike ``MappingProxyType`` it can be
+    pickled, deep-copied and JSON-encoded, so configs holding one still work
+    with ``dataclasses.asdict`` and ``copy.deepcopy``.
+    """
+
+    __slots__ = ()
+
+    def _readonly(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError(f"{type(self).__name__} is read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+    def __copy__(self) -> "FrozenEnvVars":
+        return self
+
+    def __deepcopy__(self, memo: dict) -> "FrozenEnvVars":
+        return self
+
+
+class _Memo:
+    """Slots for values memoised on a `CorePipelineConfig`.
+
+    Declared on a plain base class so they are not dataclass fields and stay
+    out of ``fields()``, ``asdict()``, equality and ``repr``. Unset until first
+    use.
+    """
+
+    __slots__ = ("_paths", "_fingerprint", "_secrets")
+
+
 @dataclass(frozen=True, slots=True)
-class CorePipelineConfig:
+class CorePipelineConfig(_Memo):
     """Immutable pipeline configuration snapshot.
 
     Path pattern (with container): {container}/{layer}/{domain}/{product}/{table_name}/{version}/output/{processing_method}
@@ -31,12 +70,20 @@ class CorePipelineConfig:
 
     When datalake_container_name is omitted from env_vars, the layer name
     (bronze/silver/gold) is assumed to be the storage container itself.
+    Custom layouts can be selected via datalake_path_layout (see `config.paths`).
 
     Construct via PipelineParameterManager.build_core_config() in production code.
 
-    The `env_vars` dict holds infrastructure environment variables
+    The `env_vars` mapping holds infrastructure environment variables
     (e.g., datalake_name, datalake_container_name, Azure IDs, etc.) captured during
-    prepare_infrastructure().
+    prepare_infrastructure(). It is frozen into a read-only `FrozenEnvVars`
+    snapshot on construction, so memoised paths cannot go stale; configs
+    built in bulk share one.
+    Values of the form ``kv://<vault>/<secret>`` are Key Vault references,
+    resolved by `get` on first access or in bulk by `prefetch` (see
+    `config.secrets`). Resolved values are remembered on the config unless
+    the Key Vault secret cache is enabled, in which case every `get` goes
+    through it and its TTL and refresh apply.
     """
 
     # Required
@@ -58,7 +105,55 @@ class CorePipelineConfig:
     gold_processing_method: str = Defaults.GOLD_PROCESSING_METHOD
 
     # Flexible infrastructure variables (datalake_name, container, Azure IDs, etc.)
-    env_vars: dict[str, str] = field(default_factory=dict)
+    env_vars: Mapping[str, str] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.env_vars, FrozenEnvVars):
+            object.__setattr__(self, "env_vars", FrozenEnvVars(self.env_vars))
+
+    # Memoised in _Memo slots: lake/work paths for all layers (_paths, see
+    # config.paths), the stable fingerprint (_fingerprint, see
+    # config.serialization) and resolved Key Vault references (_secrets)
+
+    def _cached_path(self, kind: str, layer: str) -> Optional[str]:
+        paths = getattr(self, "_paths", None)
+        if paths is None:
+            paths = build_paths(self)
+            object.__setattr__(self, "_paths", paths)
+        return paths.get((kind, layer))
+
+    def fingerprint(self) -> str:
+        """Deterministic SHA-256 hex digest over every field, env_vars included."""
+        digest = getattr(self, "_fingerprint", None)
+        if digest is None:
+            from .serialization import config_digest
+
+            digest = config_digest(self)
+            object.__setattr__(self, "_fingerprint", digest)
+        return digest
+
+    def to_bytes(self, validate: bool = True) -> bytes:
+        """Serialise to a compact payload for workers or on-disk caches.
+
+        With ``validate`` the rules run first, so invalid configs are not
+        sent. Receivers validate again with their own rules.
+        """
+        from .serialization import config_to_bytes
+
+        return config_to_bytes(self, validate=validate)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, validate: bool = True) -> "CorePipelineConfig":
+        """Rebuild a config from `to_bytes` output, validating it unless
+        ``validate`` is False."""
+        from .serialization import config_from_bytes
+
+        return config_from_bytes(data, validate=validate)
+
+    def __reduce__(self):
+        # Pickle via the wire format so the receiving process skips
+        # validation.
+        return (_config_from_bytes, (self.to_bytes(validate=False),))
 
     # Allow the CorePipelineConfig to behave like a read-only mapping instead of exposing the env_vars directly
     def get(self, key: str) -> str:
@@ -68,11 +163,46 @@ class CorePipelineConfig:
             raise RuntimeError(
                 f"Missing or invalid environment configuration variable '{key}'"
             )
+        if is_secret_ref(val):
+            return self._secret(val)
         return val
 
     def __getitem__(self, key: str) -> str:
         return self.get(key)
 
+    def prefetch(self, max_workers: int = 8) -> "CorePipelineConfig":
+        """Resolve every Key Vault reference in ``env_vars`` concurrently.
+
+        Use `config.secrets.prefetch_secrets` to resolve a batch of configs
+        with each distinct secret fetched once. Returns ``self``.
+        """
+        prefetch_secrets(self, max_workers=max_workers)
+        return self
+
+    def _secret(self, ref: str) -> str:
+        if _secret_cache_enabled():
+            # The Key Vault secret cache owns expiry and refresh
+            return resolve_secret_ref(ref)
+        secrets = getattr(self, "_secrets", None)
+        if secrets is None:
+            secrets = {}
+            object.__setattr__(self, "_secrets", secrets)
+        value = secrets.get(ref)
+        if value is None:
+            value = secrets[ref] = resolve_secret_ref(ref)
+        return value
+
+    def _store_secrets(self, values: Mapping[str, str]) -> None:
+        if _secret_cache_enabled():
+            return
+        secrets = getattr(self, "_secrets", None)
+        if secrets is None:
+            secrets = {}
+            object.__setattr__(self, "_secrets", secrets)
+        for val in self.env_vars.values():
+            if val in values:
+                secrets[val] = values[val]
+
     # Convenience properties that return the canonical lake path for each layer.
     def get_lake_path(
         self,
@@ -94,6 +224,12 @@ class CorePipelineConfig:
             In this mode each layer (bronze/silver/gold) is its own storage container,
             so no extra container prefix is needed in the path.
 
+        When datalake_path_layout is set, the named layout registered with
+        `config.paths.register_layout` is used instead.
+
+        Paths without overrides are rendered for all layers on first use and
+        memoised on the instance.
+
             Args:
                 layer: bronze, silver, or gold
                 processing_method_override: override processing method for specific layer
@@ -102,32 +238,31 @@ class CorePipelineConfig:
             Returns:
                 Full data lake path
         """
-        # Allow callers to override identifiers; fall back to the instance values.
-        domain = domain_override or self.domain
-        product = product_override or self.product
-        table_name = table_name_override or self.table_name
-        container = self.env_vars.get("datalake_container_name", "")
-
-        if not all([domain, product, table_name]):
-            raise ValueError(
-                "domain, product and table_name must be set to generate lake path"
+        if not (
+            processing_method_override
+            or version_override
+            or domain_override
+            or product_override
+            or table_name_override
+        ):
+            cached = self._cached_path("lake", layer)
+            if cached is not None:
+                return cached
+
+        layout = resolve_layout(self.env_vars)
+        return layout.render(
+            path_values(
+                self,
+                layout,
+                layer,
+                processing_method_override=processing_method_override,
+                version_override=version_override,
+                domain_override=domain_override,
+                product_override=product_override,
+                table_name_override=table_name_override,
             )
-
-        # Resolve attribute names directly (e.g. bronze_version, bronze_processing_method)
-        v_attr = f"{layer}_version"
-        p_attr = f"{layer}_processing_method"
-
-        version = version_override or getattr(self, v_attr, Defaults.VERSION)
-        processing_method = processing_method_override or getattr(
-            self, p_attr, Defaults.BRONZE_PROCESSING_METHOD
         )
 
-        # When container is set, prefix the path with it; otherwise the layer
-        # itself acts as the container ("layer-as-container" mode).
-        if container:
-            return f"{container}/{layer}/{domain}/{product}/{table_name}/{version}/output/{processing_method}"
-        return f"{layer}/{domain}/{product}/{table_name}/{version}/output/{processing_method}"
-
     def get_work_path(
         self,
         layer: str,
@@ -138,28 +273,34 @@ class CorePipelineConfig:
     ) -> str:
         """Return the working path for a layer.
 
-        This reuses `get_lake_path(...)` and replaces the trailing
-        `/output/{processing_method}` segment with `/work`. If the
-        expected `/output/` segment isn't found, `/work` is appended.
+        Rendered from the layout's work template, which for the built-in
+        layouts replaces the trailing `/output/{processing_method}` segment of
+        the lake path with `/work`.
         """
-        # Reuse get_lake_path to compose the canonical path and then
-        # convert it to a work path by replacing the output segment.
-        lake_path = self.get_lake_path(
-            layer,
-            processing_method_override=None,
-            version_override=version_override,
-            domain_override=domain_override,
-            product_override=product_override,
-            table_name_override=table_name_override,
+        if not (
+            version_override
+            or domain_override
+            or product_override
+            or table_name_override
+        ):
+            cached = self._cached_path("work", layer)
+            if cached is not None:
+                return cached
+
+        layout = resolve_layout(self.env_vars)
+        return layout.render(
+            path_values(
+                self,
+                layout,
+                layer,
+                version_override=version_override,
+                domain_override=domain_override,
+                product_override=product_override,
+                table_name_override=table_name_override,
+            ),
+            work=True,
         )
 
-        marker = "/output/"
-        idx = lake_path.find(marker)
-        if idx >= 0:
-            return lake_path[:idx] + "/work"
-        # Fallback: append /work if format differs
-        return lake_path.rstrip("/") + "/work"
-
     def validate_rules(self, layers: list | None = None) -> bool:
         """Run repository-config rules against this CorePipelineConfig.
 
@@ -182,3 +323,13 @@ class CorePipelineConfig:
     @property
     def gold_lake_path(self) -> str:
         return self.get_lake_path("gold")
+
+
+def _secret_cache_enabled() -> bool:
+    from ..azure.keyvault import secret_cache_enabled
+
+    return secret_cache_enabled()
+
+
+def _config_from_bytes(data: bytes) -> CorePipelineConfig:
+    return CorePipelineConfig.from_bytes(data, validate=False)
@@ -0,0 +1,397 @@
+"""Lake path templates for `CorePipelineConfig`.
+
+A `PathLayout` declares the lake (output) and work path templates once; the
+templates are parsed and validated when the layout is created, so rendering a
+path is a single ``str.format_map`` call.
+
+Two layouts are built in and selected automatically:
+
+- ``container``: ``{container}/{layer}/{domain}/{product}/{table_name}/{version}/output/{processing_method}``
+- ``layer_as_container``: the same without the ``{container}/`` prefix, used
+  when ``datalake_container_name`` is not set.
+
+Custom layouts (date partitions, extra segments, ...) are added with
+`register_layout` and selected per config through the ``datalake_path_layout``
+infrastructure variable. Template fields other than the built-in ones are
+read from ``env_vars``. Variables that shape paths (account, container,
+layout and template fields) cannot be ``kv://`` Key Vault references:
+secrets must not end up in paths, and building a path never calls Key Vault.
+
+Layouts also work in reverse: `parse_lake_path` splits a lake or work path
+(or any file below one) back into its components.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from string import Formatter
+from typing import TYPE_CHECKING, Iterable, Mapping, Optional
+
+from .enums import CoreParam, Defaults
+from .secrets import is_secret_ref
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .models import CorePipelineConfig
+
+LAYERS: tuple[str, ...] = ("bronze", "silver", "gold")
+
+_CONTAINER_KEY = CoreParam.DATALAKE_CONTAINER_NAME.value
+_LAYOUT_KEY = CoreParam.DATALAKE_PATH_LAYOUT.value
+
+# Fields resolved from the config itself; anything else comes from env_vars
+BUILTIN_FIELDS = frozenset(
+    {
+        "container",
+        "env",
+        "layer",
+        "domain",
+        "product",
+        "table_name",
+        "version",
+        "processing_method",
+    }
+)
+
+
+def _template_fields(template: str) -> tuple[str, ...]:
+    names: list[str] = []
+    for _, name, _, _ in Formatter().parse(template):
+        if name is None:
+            continue
+        if not name or not name.isidentifier():
+            raise ValueError(
+                f"Path template fields must be plain names, got {name!r} in {template!r}"
+            )
+        if name not in names:
+            names.append(name)
+    return tuple(names)
+
+
+# Field patterns used when parsing paths; other fields match one path segment
+_FIELD_PATTERNS = {
+    "layer": "|".join(LAYERS),
+    "version": r"v[0-9]+(?:r[0-9]+)?",
+}
+
+
+def _compile_pattern(template: str) -> re.Pattern[str]:
+    """Compile *template* into a regex matching the path and anything below it."""
+    parts: list[str] = []
+    seen: set[str] = set()
+    for literal, name, _, _ in Formatter().parse(template):
+        parts.append(re.escape(literal))
+        if name is None:
+            continue
+        if name in seen:
+            parts.append(f"(?P={name})")
+        else:
+            seen.add(name)
+            parts.append(f"(?P<{name}>{_FIELD_PATTERNS.get(name, '[^/]+')})")
+    return re.compile("".join(parts) + r"(?:/(?P<_rest>.*))?")
+
+
+def _derive_work_template(lake_template: str) -> str:
+    """Replace the trailing ``/output/...`` part of *lake_template* with ``/work``."""
+    marker = "/output/"
+    idx = lake_template.find(marker)
+    if idx >= 0:
+        return lake_template[:idx] + "/work"
+    return lake_template.rstrip("/") + "/work"
+
+
+@dataclass(frozen=True)
+class PathLayout:
+    """Compiled lake/work path templates.
+
+    Args:
+        name: Registry name used by ``datalake_path_layout``.
+        lake_template: Output path template.
+        work_template: Work path template. Derived from ``lake_template`` by
+            replacing ``/output/...`` with ``/work`` when omitted.
+    """
+
+    name: str
+    lake_template: str
+    work_template: str = ""
+    lake_fields: tuple[str, ...] = field(init=False, repr=False)
+    work_fields: tuple[str, ...] = field(init=False, repr=False)
+    extra_fields: frozenset[str] = field(init=False, repr=False)
+    lake_pattern: re.Pattern[str] = field(init=False, repr=False, compare=False)
+    work_pattern: re.Pattern[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if not self.work_template:
+            object.__setattr__(
+                self, "work_template", _derive_work_template(self.lake_template)
+            )
+        lake_fields = _template_fields(self.lake_template)
+        work_fields = _template_fields(self.work_template)
+        object.__setattr__(self, "lake_fields", lake_fields)
+        object.__setattr__(self, "work_fields", work_fields)
+        object.__setattr__(
+            self,
+            "extra_fields",
+            frozenset(lake_fields + work_fields) - BUILTIN_FIELDS,
+        )
+        object.__setattr__(self, "lake_pattern", _compile_pattern(self.lake_template))
+        object.__setattr__(self, "work_pattern", _compile_pattern(self.work_template))
+
+    def render(self, values: dict[str, str], work: bool = False) -> str:
+        """Render the lake (or work) path from a field -> value mapping."""
+        template = self.work_template if work else self.lake_template
+        try:
+            return template.format_map(values)
+        except KeyError as exc:
+            raise ValueError(
+                f"Path layout '{self.name}' requires env var {exc.args[0]!r}"
+            ) from None
+
+    def parse(self, path: str, work: bool = False) -> Optional[dict[str, str]]:
+        """Inverse of `render`: return the template values, or ``None``.
+
+        Paths below the rendered path (e.g. data files) also match; the
+        remainder is returned under ``"_rest"`` (empty when absent).
+        """
+        pattern = self.work_pattern if work else self.lake_pattern
+        match = pattern.fullmatch(path.strip("/"))
+        if match is None:
+            return None
+        values = match.groupdict()
+        values["_rest"] = values["_rest"] or ""
+        return values
+
+
+@dataclass(frozen=True)
+class ParsedLakePath:
+    """Components recovered from a lake or work path by `parse_lake_path`."""
+
+    layer: str
+    domain: str
+    product: str
+    table_name: str
+    version: str
+    processing_method: str = ""
+    container: str = ""
+    kind: str = "lake"
+    layout: str = ""
+    rest: str = ""
+    extras: Mapping[str, str] = field(default_factory=dict, compare=False)
+
+
+CONTAINER_LAYOUT = PathLayout(
+    name="container",
+    lake_template="{container}/{layer}/{domain}/{product}/{table_name}/{version}/output/{processing_method}",
+)
+LAYER_AS_CONTAINER_LAYOUT = PathLayout(
+    name="layer_as_container",
+    lake_template="{layer}/{domain}/{product}/{table_name}/{version}/output/{processing_method}",
+)
+
+LAYOUTS: dict[str, PathLayout] = {
+    CONTAINER_LAYOUT.name: CONTAINER_LAYOUT,
+    LAYER_AS_CONTAINER_LAYOUT.name: LAYER_AS_CONTAINER_LAYOUT,
+}
+
+
+# Incremented on every registration so caches of rendered paths can expire
+_registry_version = 0
+
+
+def register_layout(
+    name: str, lake_template: str, work_template: str = ""
+) -> PathLayout:
+    """Compile and register a custom layout; returns the compiled layout."""
+    global _registry_version
+    layout = PathLayout(name, lake_template, work_template)
+    LAYOUTS[name] = layout
+    _registry_version += 1
+    return layout
+
+
+def layouts_version() -> int:
+    """Counter that changes whenever `register_layout` is called."""
+    return _registry_version
+
+
+def parse_lake_path(
+    path: str, layouts: Optional[Iterable[PathLayout]] = None
+) -> ParsedLakePath:
+    """Split a lake or work path back into its components.
+
+    Tries each layout (default: every registered layout, built-ins first)
+    against the lake template, then the work template. Layers must be one of
+    `LAYERS` and versions must look like ``v1`` / ``v1r2``, which keeps the
+    container and layer-as-container layouts apart.
+
+    Raises:
+        ValueError: If no layout matches *path*.
+    """
+    candidates = LAYOUTS.values() if layouts is None else layouts
+    for work in (False, True):
+        for layout in candidates:
+            values = layout.parse(path, work=work)
+            if values is None:
+                continue
+            rest = values.pop("_rest")
+            builtin = {k: values.pop(k) for k in BUILTIN_FIELDS & values.keys()}
+            return ParsedLakePath(
+                layer=builtin["layer"],
+                domain=builtin.get("domain", ""),
+                product=builtin.get("product", ""),
+                table_name=builtin.get("table_name", ""),
+                version=builtin.get("version", ""),
+                processing_method=builtin.get("processing_method", ""),
+                container=builtin.get("container", ""),
+                kind="work" if work else "lake",
+                layout=layout.name,
+                rest=rest,
+                extras=values,
+            )
+    raise ValueError(f"Path does not match any lake path layout: {path!r}")
+
+
+def path_variable(env_vars: Mapping[str, str], key: str, default: str = "") -> str:
+    """Value of a variable that shapes paths or storage endpoints.
+
+    Raises:
+        ValueError: If the value is a ``kv://`` Key Vault reference.
+    """
+    value = env_vars.get(key, default)
+    if is_secret_ref(value):
+        raise ValueError(
+            f"'{key}' is used to build lake paths and cannot be a Key Vault "
+            f"reference ({value!r})"
+        )
+    return value
+
+
+def resolve_layout(env_vars: Mapping[str, str]) -> PathLayout:
+    """Pick the layout for a config from its infrastructure variables."""
+    name = path_variable(env_vars, _LAYOUT_KEY)
+    if name:
+        try:
+            return LAYOUTS[name]
+        except KeyError:
+            raise ValueError(f"Unknown lake path layout: {name!r}") from None
+    if path_variable(env_vars, _CONTAINER_KEY):
+        return CONTAINER_LAYOUT
+    return LAYER_AS_CONTAINER_LAYOUT
+
+
+def path_values(
+    config: "CorePipelineConfig",
+    layout: PathLayout,
+    layer: str,
+    processing_method_override: Optional[str] = None,
+    version_override: Optional[str] = None,
+    domain_override: Optional[str] = None,
+    product_override: Optional[str] = None,
+    table_name_override: Optional[str] = None,
+) -> dict[str, str]:
+    """Collect the template values for *layer* of *config*.
+
+    Raises:
+        ValueError: If domain, product or table_name is empty, or a variable
+            used in the path is a Key Vault reference.
+    """
+    domain = domain_override or config.domain
+    product = product_override or config.product
+    table_name = table_name_override or config.table_name
+    if not (domain and product and table_name):
+        raise ValueError(
+            "domain, product and table_name must be set to generate lake path"
+        )
+
+    env_vars = config.env_vars
+    values = {
+        "container": path_variable(env_vars, _CONTAINER_KEY),
+        "env": config.env,
+        "layer": layer,
+        "domain": domain,
+        "product": product,
+        "table_name": table_name,
+        "version": version_override
+        or getattr(config, f"{layer}_version", Defaults.VERSION),
+        "processing_method": processing_method_override
+        or getattr(
+            config, f"{layer}_processing_method", Defaults.BRONZE_PROCESSING_METHOD
+        ),
+    }
+    for name in layout.extra_fields:
+        if name in env_vars:
+            values[name] = path_variable(env_vars, name)
+    return values
+
+
+def abfss_uri(config: "CorePipelineConfig", layer: str, work: bool = False) -> str:
+    """Return the ``abfss://`` URI of a layer's lake (or work) path.
+
+    The first path segment is the container: ``datalake_container_name`` in
+    container mode, the layer itself in layer-as-container mode.
+
+    Raises:
+        ValueError: If ``datalake_name`` is not set in ``env_vars`` or is a
+            Key Vault reference.
+    """
+    account = path_variable(config.env_vars, CoreParam.DATALAKE_NAME.value)
+    if not account:
+        raise ValueError("datalake_name must be set to build abfss:// URIs")
+    path = config.get_work_path(layer) if work else config.get_lake_path(layer)
+    container, _, rest = path.partition("/")
+    return f"abfss://{container}@{account}.dfs.core.windows.net/{rest}"
+
+
+def build_paths(config: "CorePipelineConfig") -> dict[tuple[str, str], str]:
+    """Render lake and work paths for every layer of *config* in one pass.
+
+    Returns a mapping keyed by ``("lake" | "work", layer)``.
+    """
+    layout = resolve_layout(config.env_vars)
+    paths: dict[tuple[str, str], str] = {}
+    for layer in LAYERS:
+        values = path_values(config, layout, layer)
+        paths[("lake", layer)] = layout.render(values)
+        paths[("work", layer)] = layout.render(values, work=True)
+    return paths
+
+
+def render_paths(
+    configs: Iterable["CorePipelineConfig"], layer: str, work: bool = False
+) -> list[str]:
+    """Render the lake (or work) path of *layer* for many configs at once.
+
+    Unlike ``get_lake_path`` this does not populate each config's memo, so it
+    is cheaper when only one layer of a large catalog is needed.
+    """
+    layouts: dict[tuple[str | None, bool], PathLayout] = {}
+    out: list[str] = []
+    for config in configs:
+        env_vars = config.env_vars
+        layout_key = (
+            env_vars.get(_LAYOUT_KEY),
+            bool(env_vars.get(_CONTAINER_KEY)),
+        )
+        layout = layouts.get(layout_key)
+        if layout is None:
+            layout = layouts[layout_key] = resolve_layout(env_vars)
+        out.append(layout.render(path_values(config, layout, layer), work=work))
+    return out
+
+
+__all__ = [
+    "abfss_uri",
+    "LAYERS",
+    "LAYOUTS",
+    "CONTAINER_LAYOUT",
+    "LAYER_AS_CONTAINER_LAYOUT",
+    "ParsedLakePath",
+    "PathLayout",
+    "build_paths",
+    "parse_lake_path",
+    "path_values",
+    "path_variable",
+    "register_layout",
+    "render_paths",
+    "resolve_layout",
+]
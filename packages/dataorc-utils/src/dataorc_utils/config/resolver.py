@@ -0,0 +1,218 @@
+"""Hierarchical configuration resolution.
+
+Merges configuration layers in increasing order of precedence::
+
+    defaults -> environment -> domain -> product -> overrides -> env vars
+
+and records which layer supplied each key. The static part of the merge
+(defaults through product) is memoised per ``(env, domain, product)``, and
+environment variables are read from a one-time `EnvSnapshot`, so resolving
+config for thousands of tables costs dictionary lookups.
+
+Layer shapes:
+
+- ``environments``: ``{env: {key: value}}``
+- ``domains``: ``{domain: {key: value}}``
+- ``products``: ``{product: {key: value}}``; entries under a
+  ``"{domain}.{product}"`` key are applied on top, for product names shared
+  across domains.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping, Optional
+
+LAYER_DEFAULTS = "defaults"
+LAYER_ENVIRONMENT = "environment"
+LAYER_DOMAIN = "domain"
+LAYER_PRODUCT = "product"
+LAYER_OVERRIDES = "overrides"
+LAYER_ENV_VARS = "env_vars"
+
+
+class EnvSnapshot:
+    """Immutable, case-insensitively indexed copy of ``os.environ``.
+
+    Lookups follow `PipelineParameterManager` semantics: exact name first and,
+    with ``case_fallback``, then UPPER, lower and finally any other casing.
+    """
+
+    def __init__(self, environ: Optional[Mapping[str, str]] = None) -> None:
+        source = os.environ if environ is None else environ
+        self._exact: dict[str, str] = dict(source)
+        self._folded: dict[str, str] = {}
+        for key, value in self._exact.items():
+            self._folded.setdefault(key.casefold(), value)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._exact
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    def get(self, name: str, case_fallback: bool = False) -> Optional[str]:
+        value = self._exact.get(name)
+        if value is not None or not case_fallback:
+            return value
+        value = self._exact.get(name.upper())
+        if value is None:
+            value = self._exact.get(name.lower())
+        if value is None:
+            value = self._folded.get(name.casefold())
+        return value
+
+
+@dataclass(frozen=True)
+class ResolvedConfig:
+    """Result of a hierarchical resolve: merged values plus per-key provenance."""
+
+    values: Mapping[str, Any]
+    provenance: Mapping[str, str]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.values.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        return self.values[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.values
+
+    def source(self, key: str) -> Optional[str]:
+        """Return the layer name that supplied *key*."""
+        return self.provenance.get(key)
+
+
+class ConfigResolver:
+    """Memoised resolver over defaults/environment/domain/product layers."""
+
+    def __init__(
+        self,
+        defaults: Optional[Mapping[str, Any]] = None,
+        environments: Optional[Mapping[str, Mapping[str, Any]]] = None,
+        domains: Optional[Mapping[str, Mapping[str, Any]]] = None,
+        products: Optional[Mapping[str, Mapping[str, Any]]] = None,
+        env_snapshot: Optional[EnvSnapshot] = None,
+        case_fallback: bool = False,
+    ) -> None:
+        self.defaults: Mapping[str, Any] = defaults or {}
+        self.environments: Mapping[str, Mapping[str, Any]] = environments or {}
+        self.domains: Mapping[str, Mapping[str, Any]] = domains or {}
+        self.products: Mapping[str, Mapping[str, Any]] = products or {}
+        self.case_fallback = case_fallback
+        self._env_snapshot = env_snapshot
+        self._layers: dict[tuple[str, str, str], ResolvedConfig] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def env_snapshot(self) -> EnvSnapshot:
+        """The environment snapshot, taken on first use."""
+        if self._env_snapshot is None:
+            self._env_snapshot = EnvSnapshot()
+        return self._env_snapshot
+
+    def refresh_environment(self) -> EnvSnapshot:
+        """Re-snapshot ``os.environ`` (e.g. after it was modified)."""
+        snapshot = self._env_snapshot = EnvSnapshot()
+        return snapshot
+
+    def clear_cache(self) -> None:
+        """Forget memoised layer merges (call after mutating the layer dicts)."""
+        with self._lock:
+            self._layers.clear()
+
+    def resolve_layers(
+        self, env: str = "", domain: str = "", product: str = ""
+    ) -> ResolvedConfig:
+        """Merge defaults -> environment -> domain -> product (memoised)."""
+        key = (env, domain, product)
+        cached = self._layers.get(key)
+        if cached is not None:
+            return cached
+
+        values: dict[str, Any] = {}
+        provenance: dict[str, str] = {}
+        layers = (
+            (LAYER_DEFAULTS, self.defaults),
+            (LAYER_ENVIRONMENT, self.environments.get(env) if env else None),
+            (LAYER_DOMAIN, self.domains.get(domain) if domain else None),
+            (LAYER_PRODUCT, self._product_layer(domain, product)),
+        )
+        for name, layer in layers:
+            if not layer:
+                continue
+            values.update(layer)
+            provenance.update(dict.fromkeys(layer, name))
+
+        resolved = ResolvedConfig(
+            MappingProxyType(values), MappingProxyType(provenance)
+        )
+        with self._lock:
+            self._layers[key] = resolved
+        return resolved
+
+    def resolve(
+        self,
+        env: str = "",
+        domain: str = "",
+        product: str = "",
+        overrides: Optional[Mapping[str, Any]] = None,
+        env_var_names: Iterable[str] = (),
+        use_env_vars: bool = True,
+    ) -> ResolvedConfig:
+        """Resolve every layer, including overrides and environment variables.
+
+        Args:
+            env, domain, product: Select the environment/domain/product layers.
+            overrides: Explicit values; ``None`` values are ignored.
+            env_var_names: Extra keys to look up in the environment, on top of
+                every key already present in the merged layers.
+            use_env_vars: Set to False to skip the environment-variable layer.
+        """
+        base = self.resolve_layers(env, domain, product)
+        if not overrides and not use_env_vars:
+            return base
+
+        values = dict(base.values)
+        provenance = dict(base.provenance)
+        if overrides:
+            for key, value in overrides.items():
+                if value is not None:
+                    values[key] = value
+                    provenance[key] = LAYER_OVERRIDES
+
+        if use_env_vars:
+            snapshot = self.env_snapshot
+            for key in (*values, *env_var_names):
+                value = snapshot.get(key, self.case_fallback)
+                if value is not None:
+                    values[key] = value
+                    provenance[key] = LAYER_ENV_VARS
+
+        return ResolvedConfig(MappingProxyType(values), MappingProxyType(provenance))
+
+    def _product_layer(self, domain: str, product: str) -> Optional[Mapping[str, Any]]:
+        if not product:
+            return None
+        layer = self.products.get(product)
+        scoped = self.products.get(f"{domain}.{product}") if domain else None
+        if scoped is None:
+            return layer
+        return {**(layer or {}), **scoped}
+
+
+__all__ = [
+    "ConfigResolver",
+    "EnvSnapshot",
+    "ResolvedConfig",
+    "LAYER_DEFAULTS",
+    "LAYER_ENVIRONMENT",
+    "LAYER_DOMAIN",
+    "LAYER_PRODUCT",
+    "LAYER_OVERRIDES",
+    "LAYER_ENV_VARS",
+]
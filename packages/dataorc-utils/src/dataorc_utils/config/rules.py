@@ -1,34 +1,75 @@
 """Rule framework for configuration validation.
 
-Extensible mechanism for validating `CorePipelineConfig` objects. Each rule is a
-callable taking (config, layer) and returning True or raising ValueError.
+Extensible mechanism for validating `CorePipelineConfig` objects.
+
+Rules come in two forms:
+
+- `Rule`: declares the per-layer fields it depends on (``version``,
+  ``lake_path``, ...) and a ``check`` that returns an error message or
+  ``None``. Because the inputs are declared, each rule is evaluated once per
+  distinct input and the result reused across configs.
+- `RuleFunc`: the original callable taking (config, layer) and returning True
+  or raising ValueError. These keep working through `adapt_rule`.
 
 Built‑in rules:
 - `lowercase_lake_path_rule`: lake paths must not contain uppercase letters.
+- `version_format_rule`: versions must look like ``v1`` or ``v1r2`` and appear
+  as a segment of the lake path.
 
 Add new rules by appending to `RULES` or passing a custom list to
-`run_rules_checks`.
+`run_rules_checks` / `validate_config`. `validate_config` and `validate_configs`
+return a structured `ValidationReport` instead of raising.
 """
 
 from __future__ import annotations
 
 import re
-from typing import TYPE_CHECKING, Callable, Iterable, List
+import threading
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from itertools import repeat
+from typing import TYPE_CHECKING, Any, Callable, Iterable, List
+
+from .paths import layouts_version
 
 if TYPE_CHECKING:  # pragma: no cover
     from .models import CorePipelineConfig
 
 RuleFunc = Callable[["CorePipelineConfig", str], bool]
 
+LAYERS: tuple[str, ...] = ("bronze", "silver", "gold")
+
+# Cap on memoised entries per cache before it is reset
+_MAX_CACHE_ENTRIES = 65536
+
+# Cap on shared engines kept by `get_engine` before the registry is reset
+_MAX_ENGINES = 32
+
+_MISSING = object()
+
 
 def lowercase_lake_path_rule(config: "CorePipelineConfig", layer: str) -> bool:
     path = config.get_lake_path(layer)
-    if any(ch.isalpha() and ch.isupper() for ch in path):
+    if path.lower() != path:
         raise ValueError(f"Lake path contains uppercase letters: '{path}'")
     return True
 
 
-_VERSION_PATTERN = re.compile(r"^v[0-9]+(?:r[0-9]+)?$")
+_VERSION_PATTERN = re.compile(r"^v([0-9]+)(?:r([0-9]+))?$")
+
+
+def version_sort_key(value: str) -> tuple[int, int]:
+    """Sort key for versions accepted by `version_format_rule`.
+
+    Orders ``v1 < v1r2 < v2 < v10``.
+
+    Raises:
+        ValueError: If *value* is not a valid version.
+    """
+    match = _VERSION_PATTERN.match(value)
+    if match is None:
+        raise ValueError(f"Invalid version {value!r}; expected v<integer>[r<integer>]")
+    return int(match.group(1)), int(match.group(2) or 0)
 
 
 def version_format_rule(config: "CorePipelineConfig", layer: str) -> bool:
@@ -40,49 +81,423 @@ def version_format_rule(config: "CorePipelineConfig", layer: str) -> bool:
     """
     attr = f"{layer}_version"
     value = getattr(config, attr)
+    message = _check_version_format(layer, value)
+    if message is None:
+        message = _check_version_in_path(layer, value, config.get_lake_path(layer))
+    if message is not None:
+        raise ValueError(message)
+    return True
+
+
+# ----------------------------------------------------------------------
+# Declarative rules
+# ----------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class RuleViolation:
+    """A single failed check."""
+
+    rule: str
+    layer: str
+    field: str
+    message: str
+
+
+@dataclass
+class ValidationReport:
+    """Structured result of validating one config."""
+
+    violations: list[RuleViolation] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.violations
+
+    def __bool__(self) -> bool:
+        return self.ok
+
+    def to_message(self) -> str:
+        return "Rule checks failed:\n" + "\n".join(
+            f"[{v.layer}] {v.message}" for v in self.violations
+        )
+
+    def raise_for_violations(self) -> bool:
+        """Raise ValueError listing every violation; return True when clean."""
+        if self.violations:
+            raise ValueError(self.to_message())
+        return True
+
+
+@dataclass(frozen=True, eq=False)
+class Rule:
+    """A validation rule with declared inputs.
+
+    Args:
+        name: Rule name used in reports.
+        fields: Per-layer inputs passed to ``check``. Available fields are
+            ``layer``, ``env``, ``domain``, ``product``, ``table_name``,
+            ``version``, ``processing_method``, ``container``, ``lake_path``
+            and ``work_path``.
+        check: Called with the declared fields as positional arguments, in
+            order; returns an error message, or ``None`` when the input is valid.
+        field: Field reported in violations; defaults to the last declared field.
+        requires: Names of rules, listed before this one, that must pass for
+            a layer for this rule to run on it. Other names are ignored.
+    """
+
+    name: str
+    fields: tuple[str, ...]
+    check: Callable[..., str | None]
+    field: str = ""
+    requires: tuple[str, ...] = ()
+
+    @property
+    def reported_field(self) -> str:
+        return self.field or self.fields[-1]
+
+
+def _check_lowercase_path(path: str) -> str | None:
+    if path.lower() != path:
+        return f"Lake path contains uppercase letters: '{path}'"
+    return None
+
+
+def _check_version_format(layer: str, value: str) -> str | None:
     if not isinstance(value, str) or not _VERSION_PATTERN.match(value):
-        raise ValueError(
-            f"Version for layer '{layer}' must match pattern 'v<integer>' or 'v<integer>r<integer>' (e.g. v1 or v1r2); got: {value!r}"
+        return (
+            f"Version for layer '{layer}' must match pattern 'v<integer>' "
+            f"or 'v<integer>r<integer>' (e.g. v1 or v1r2); got: {value!r}"
         )
-    path = config.get_lake_path(layer)
+    return None
+
+
+def _check_version_in_path(layer: str, value: str, path: str) -> str | None:
     # Ensure token boundary match in path
     if f"/{value}/" not in path:
-        raise ValueError(
-            f"Lake path for layer '{layer}' does not include expected version token '{value}': {path}"
+        return (
+            f"Lake path for layer '{layer}' does not include expected "
+            f"version token '{value}': {path}"
         )
-    return True
+    return None
+
+
+LOWERCASE_LAKE_PATH = Rule("lowercase_lake_path", ("lake_path",), _check_lowercase_path)
+VERSION_FORMAT = Rule("version_format", ("layer", "version"), _check_version_format)
+VERSION_IN_PATH = Rule(
+    "version_in_path",
+    ("layer", "version", "lake_path"),
+    _check_version_in_path,
+    field="version",
+    requires=("version_format",),
+)
+
+# Compiled equivalents of the built-in RuleFuncs
+_COMPILED: dict[Callable[..., Any], tuple[Rule, ...]] = {
+    lowercase_lake_path_rule: (LOWERCASE_LAKE_PATH,),
+    version_format_rule: (VERSION_FORMAT, VERSION_IN_PATH),
+}
+
+
+class _LegacyCheck:
+    """``check`` of an adapted RuleFunc; picklable when the function is."""
+
+    __slots__ = ("func",)
+
+    def __init__(self, func: RuleFunc) -> None:
+        self.func = func
+
+    def __call__(self, config: "CorePipelineConfig", layer: str) -> str | None:
+        try:
+            self.func(config, layer)
+        except Exception as exc:
+            return str(exc)
+        return None
+
+
+def adapt_rule(func: RuleFunc) -> Rule:
+    """Wrap a legacy (config, layer) RuleFunc as a `Rule`.
+
+    The adapted rule depends on the whole config, so it is memoised per
+    config fingerprint rather than per field value.
+    """
+    name = getattr(func, "__name__", repr(func))
+    return Rule(name, ("config", "layer"), _LegacyCheck(func), field="config")
+
+
+# Fields with few distinct values across a catalog; rules reading only these are
+# memoised per input. Rules reading paths or the whole config are not, since
+# those inputs are unique per table and the report cache already covers repeats.
+_LOW_CARDINALITY_FIELDS = frozenset(
+    {"layer", "env", "domain", "product", "version", "processing_method", "container"}
+)
+
+
+# Field getters are module-level functions (or `_ConfigAttr` objects) so that
+# engines can be pickled to process pools.
+
+
+def _get_layer(config: "CorePipelineConfig", layer: str) -> str:
+    return layer
+
+
+def _get_config(config: "CorePipelineConfig", layer: str) -> "CorePipelineConfig":
+    return config
+
+
+def _get_lake_path(config: "CorePipelineConfig", layer: str) -> str:
+    return config.get_lake_path(layer)
+
+
+def _get_work_path(config: "CorePipelineConfig", layer: str) -> str:
+    return config.get_work_path(layer)
+
+
+def _get_version(config: "CorePipelineConfig", layer: str) -> str:
+    return getattr(config, f"{layer}_version")
+
+
+def _get_processing_method(config: "CorePipelineConfig", layer: str) -> str:
+    return getattr(config, f"{layer}_processing_method")
+
+
+def _get_container(config: "CorePipelineConfig", layer: str) -> str:
+    return config.env_vars.get("datalake_container_name", "")
+
+
+class _ConfigAttr:
+    """Getter for a plain config attribute (``env``, ``domain``, ...)."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __call__(self, config: "CorePipelineConfig", layer: str) -> Any:
+        return getattr(config, self.name)
+
+
+_FIELD_GETTERS: dict[str, Callable[["CorePipelineConfig", str], Any]] = {
+    "layer": _get_layer,
+    "config": _get_config,
+    "lake_path": _get_lake_path,
+    "work_path": _get_work_path,
+    "version": _get_version,
+    "processing_method": _get_processing_method,
+    "container": _get_container,
+}
+
+
+def _field_getter(name: str) -> Callable[["CorePipelineConfig", str], Any]:
+    getter = _FIELD_GETTERS.get(name)
+    if getter is None:
+        return _ConfigAttr(name)
+    return getter
+
+
+def config_fingerprint(config: "CorePipelineConfig") -> tuple:
+    """Hashable key covering every field of *config*, ``env_vars`` included."""
+    return (
+        config.env,
+        config.domain,
+        config.product,
+        config.table_name,
+        config.bronze_version,
+        config.silver_version,
+        config.gold_version,
+        config.bronze_processing_method,
+        config.silver_processing_method,
+        config.gold_processing_method,
+        tuple(sorted(config.env_vars.items())),
+    )
+
+
+class RuleEngine:
+    """Evaluates a fixed set of rules with memoisation.
+
+    Rules that only read low-cardinality fields (layer, version, ...) are
+    cached by the values of those fields, and whole reports are cached by
+    `config_fingerprint`. Report caches are dropped when a path layout is
+    registered, since lake paths may render differently.
+
+    Engines are thread-safe and picklable (caches are not pickled), so
+    `validate_many` works with thread and process pools as long as custom
+    rule callables are themselves picklable (module-level functions).
+    """
+
+    def __init__(self, rules: Iterable[Rule | RuleFunc]) -> None:
+        compiled: list[Rule] = []
+        for rule in rules:
+            if isinstance(rule, Rule):
+                compiled.append(rule)
+            elif rule in _COMPILED:
+                compiled.extend(_COMPILED[rule])
+            else:
+                compiled.append(adapt_rule(rule))
+        self.rules: tuple[Rule, ...] = tuple(compiled)
+        self._plan = tuple(
+            (
+                rule,
+                tuple(_field_getter(name) for name in rule.fields),
+                set(rule.fields) <= _LOW_CARDINALITY_FIELDS,
+            )
+            for rule in self.rules
+        )
+        self._results: dict[tuple, str | None] = {}
+        self._reports: dict[tuple, tuple[RuleViolation, ...]] = {}
+        self._layouts_version = layouts_version()
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"rules": self.rules}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(state["rules"])
+
+    def validate(
+        self, config: "CorePipelineConfig", layers: Iterable[str] | None = None
+    ) -> ValidationReport:
+        """Validate *config* and return a structured report."""
+        layers = LAYERS if layers is None else tuple(layers)
+        version = layouts_version()
+        if version != self._layouts_version:
+            with self._lock:
+                self._reports = {}
+                self._layouts_version = version
+        report_key = (config_fingerprint(config), layers)
+        cached = self._reports.get(report_key)
+        if cached is not None:
+            return ValidationReport(list(cached))
+
+        violations: list[RuleViolation] = []
+        for layer in layers:
+            # Rules that failed (or were skipped) for this layer
+            failed: set[str] = set()
+            for rule, getters, memoise in self._plan:
+                if rule.requires and not failed.isdisjoint(rule.requires):
+                    failed.add(rule.name)
+                    continue
+                message = self._evaluate(rule, getters, memoise, config, layer)
+                if message is not None:
+                    failed.add(rule.name)
+                    violations.append(
+                        RuleViolation(rule.name, layer, rule.reported_field, message)
+                    )
+
+        with self._lock:
+            if len(self._reports) >= _MAX_CACHE_ENTRIES:
+                self._reports.clear()
+            self._reports[report_key] = tuple(violations)
+        return ValidationReport(violations)
+
+    def validate_many(
+        self,
+        configs: Iterable["CorePipelineConfig"],
+        layers: Iterable[str] | None = None,
+        executor: Executor | None = None,
+    ) -> list[ValidationReport]:
+        """Validate many configs, optionally on *executor* (thread or process pool)."""
+        layers = None if layers is None else tuple(layers)
+        if executor is None:
+            return [self.validate(config, layers) for config in configs]
+        return list(executor.map(self.validate, configs, repeat(layers)))
+
+    def _evaluate(
+        self,
+        rule: Rule,
+        getters: tuple[Callable[["CorePipelineConfig", str], Any], ...],
+        memoise: bool,
+        config: "CorePipelineConfig",
+        layer: str,
+    ) -> str | None:
+        try:
+            inputs = tuple(getter(config, layer) for getter in getters)
+        except Exception as exc:
+            return str(exc)
+
+        if memoise:
+            key = (rule, *inputs)
+            # Single lookup: another thread may clear the cache at any time
+            cached = self._results.get(key, _MISSING)
+            if cached is not _MISSING:
+                return cached  # type: ignore[return-value]
+
+        try:
+            message = rule.check(*inputs)
+        except Exception as exc:
+            message = str(exc)
+
+        if memoise:
+            with self._lock:
+                if len(self._results) >= _MAX_CACHE_ENTRIES:
+                    self._results.clear()
+                self._results[key] = message
+        return message
 
 
 RULES: List[RuleFunc] = [lowercase_lake_path_rule, version_format_rule]
 
+_engines: dict[tuple, RuleEngine] = {}
+_engines_lock = threading.Lock()
 
-def run_rules_checks(
+
+def get_engine(rules: Iterable[Rule | RuleFunc] | None = None) -> RuleEngine:
+    """Return a shared `RuleEngine` for *rules* (defaults to `RULES`).
+
+    At most `_MAX_ENGINES` engines are kept; the registry is reset beyond that.
+    """
+    rules = tuple(RULES if rules is None else rules)
+    engine = _engines.get(rules)
+    if engine is None:
+        engine = RuleEngine(rules)
+        with _engines_lock:
+            if len(_engines) >= _MAX_ENGINES:
+                _engines.clear()
+            engine = _engines.setdefault(rules, engine)
+    return engine
+
+
+def validate_config(
     config: "CorePipelineConfig",
     layers: Iterable[str] | None = None,
-    rules: Iterable[RuleFunc] | None = None,
-) -> bool:
-    if layers is None:
-        layers = ("bronze", "silver", "gold")
-    if rules is None:
-        rules = RULES
+    rules: Iterable[Rule | RuleFunc] | None = None,
+) -> ValidationReport:
+    """Validate *config* and return a structured `ValidationReport`."""
+    return get_engine(rules).validate(config, layers)
 
-    errors: list[str] = []
-    for layer in layers:
-        for rule in rules:
-            try:
-                rule(config, layer)
-            except Exception as exc:  # noqa: BLE001
-                errors.append(f"[{layer}] {exc}")
 
-    if errors:
-        raise ValueError("Rule checks failed:\n" + "\n".join(errors))
-    return True
+def validate_configs(
+    configs: Iterable["CorePipelineConfig"],
+    layers: Iterable[str] | None = None,
+    rules: Iterable[Rule | RuleFunc] | None = None,
+    executor: Executor | None = None,
+) -> list[ValidationReport]:
+    """Validate many configs; pass an executor to spread work across workers."""
+    return get_engine(rules).validate_many(configs, layers, executor)
+
+
+def run_rules_checks(
+    config: "CorePipelineConfig",
+    layers: Iterable[str] | None = None,
+    rules: Iterable[Rule | RuleFunc] | None = None,
+) -> bool:
+    return validate_config(config, layers, rules).raise_for_violations()
 
 
 __all__ = [
     "RuleFunc",
     "RULES",
+    "Rule",
+    "RuleEngine",
+    "RuleViolation",
+    "ValidationReport",
+    "adapt_rule",
+    "config_fingerprint",
+    "get_engine",
     "lowercase_lake_path_rule",
     "version_format_rule",
+    "version_sort_key",
     "run_rules_checks",
+    "validate_config",
+    "validate_configs",
 ]
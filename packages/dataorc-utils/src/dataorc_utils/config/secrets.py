@@ -0,0 +1,141 @@
+"""Key Vault secret references in infrastructure variables.
+
+An environment variable whose value has the form ``kv://<vault>/<secret>``
+(optionally ``kv://<vault>/<secret>/<version>``) is a reference to a Key
+Vault secret rather than the value itself. ``<vault>`` is either a vault name
+(``https://<vault>.vault.azure.net/``) or a full host name for other clouds.
+
+References stay in ``env_vars``, so the secret never ends up in the
+environment, in fingerprints, in serialised configs or in `print_config`
+output. Variables that shape lake paths (``datalake_name``,
+``datalake_container_name``, the layout and its template fields) must not
+be references; building a path with one raises ``ValueError``. `CorePipelineConfig.get` resolves a reference on first access;
+`prefetch_secrets` resolves every reference of one or many configs up front,
+fetching each distinct secret once and concurrently through the shared,
+thread-safe Key Vault client of `dataorc_utils.azure`.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Iterable, NamedTuple, Optional
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .models import CorePipelineConfig
+
+SECRET_REF_PREFIX = "kv://"
+
+
+class SecretRef(NamedTuple):
+    """Parsed ``kv://`` reference."""
+
+    vault_url: str
+    name: str
+    version: Optional[str] = None
+
+
+def is_secret_ref(value: object) -> bool:
+    """True if *value* is a ``kv://`` secret reference."""
+    return isinstance(value, str) and value.startswith(SECRET_REF_PREFIX)
+
+
+def parse_secret_ref(value: str) -> SecretRef:
+    """Parse ``kv://<vault>/<secret>[/<version>]``.
+
+    Raises:
+        ValueError: If *value* is not a well-formed reference.
+    """
+    if not is_secret_ref(value):
+        raise ValueError(f"Not a Key Vault reference: {value!r}")
+    parts = value[len(SECRET_REF_PREFIX) :].split("/")
+    if len(parts) not in (2, 3) or not all(parts):
+        raise ValueError(
+            f"Invalid Key Vault reference {value!r}; "
+            "expected kv://<vault>/<secret>[/<version>]"
+        )
+    vault = parts[0]
+    host = vault if "." in vault else f"{vault}.vault.azure.net"
+    return SecretRef(
+        f"https://{host}/", parts[1], parts[2] if len(parts) == 3 else None
+    )
+
+
+def resolve_secret_ref(value: str) -> str:
+    """Fetch the secret referenced by *value* from Key Vault."""
+    from ..azure.keyvault import get_keyvault_secret
+
+    ref = parse_secret_ref(value)
+    return get_keyvault_secret(ref.vault_url, ref.name, version=ref.version)
+
+
+def prefetch_secrets(
+    configs: "CorePipelineConfig | Iterable[CorePipelineConfig]",
+    max_workers: int = 8,
+) -> int:
+    """Resolve every secret reference of one or many configs concurrently.
+
+    Each distinct reference is fetched once, however many configs (tables)
+    use it; configs built in bulk share one ``env_vars`` mapping and so one
+    set of references. Afterwards `CorePipelineConfig.get` returns the values
+    without calling Key Vault; with the secret cache enabled (see
+    `azure.configure_secret_cache`) they are served from that cache until
+    they expire.
+
+    Args:
+        configs: A config or an iterable of configs.
+        max_workers: Maximum number of concurrent Key Vault requests.
+
+    Returns:
+        The number of distinct references resolved.
+
+    Raises:
+        RuntimeError: If any reference could not be resolved; the first
+            failure is chained and the message names the variables involved.
+        ValueError: If a reference is malformed.
+    """
+    from .models import CorePipelineConfig
+
+    if isinstance(configs, CorePipelineConfig):
+        configs = [configs]
+    configs = list(configs)
+
+    # reference -> variable names using it, for error messages
+    refs: dict[str, set[str]] = {}
+    for config in configs:
+        for key, value in config.env_vars.items():
+            if is_secret_ref(value):
+                parse_secret_ref(value)
+                refs.setdefault(value, set()).add(key)
+    if not refs:
+        return 0
+
+    values: dict[str, str] = {}
+    errors: dict[str, Exception] = {}
+    workers = max(1, min(max_workers, len(refs)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {ref: pool.submit(resolve_secret_ref, ref) for ref in refs}
+        for ref, future in futures.items():
+            try:
+                values[ref] = future.result()
+            except Exception as exc:
+                errors[ref] = exc
+
+    for config in configs:
+        config._store_secrets(values)
+
+    if errors:
+        names = sorted(key for ref in errors for key in refs[ref])
+        raise RuntimeError(
+            f"Failed to resolve Key Vault references for: {', '.join(names)}"
+        ) from next(iter(errors.values()))
+    return len(values)
+
+
+__all__ = [
+    "SECRET_REF_PREFIX",
+    "SecretRef",
+    "is_secret_ref",
+    "parse_secret_ref",
+    "prefetch_secrets",
+    "resolve_secret_ref",
+]
@@ -0,0 +1,205 @@
+"""Stable fingerprints, compact wire format and warm-start cache for configs.
+
+- `config_digest` is a deterministic SHA-256 over every field of a
+  `CorePipelineConfig`, ``env_vars`` included. Unlike
+  `rules.config_fingerprint` it is stable across processes and machines, so it
+  can key on-disk caches.
+- `config_to_bytes` / `config_from_bytes` use a compact JSON encoding. The
+  receiver validates against its own rules and layouts unless told not to;
+  the sender's ``validated`` flag is informational only. Rule results are
+  memoised per process, so re-validating a known config is cheap.
+- `ConfigCache` stores serialised configs on disk so repeated task launches on
+  the same node can load a config instead of rebuilding it. The cache lives
+  in ``~/.cache/dataorc/configs`` unless ``DATAORC_CONFIG_CACHE_DIR`` is set;
+  its files are readable by the owner only.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .models import CorePipelineConfig
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+# Serialised fields, in wire order
+CONFIG_FIELDS: tuple[str, ...] = (
+    "env",
+    "domain",
+    "product",
+    "table_name",
+    "bronze_version",
+    "silver_version",
+    "gold_version",
+    "bronze_processing_method",
+    "silver_processing_method",
+    "gold_processing_method",
+)
+
+
+def _canonical(values: list[Any], env_vars: dict[str, str]) -> bytes:
+    return json.dumps(
+        [FORMAT_VERSION, values, env_vars],
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+
+def _fields(config: "CorePipelineConfig") -> tuple[list[Any], dict[str, str]]:
+    return [getattr(config, name) for name in CONFIG_FIELDS], dict(config.env_vars)
+
+
+def config_digest(config: "CorePipelineConfig") -> str:
+    """Return the hex SHA-256 fingerprint of *config*."""
+    values, env_vars = _fields(config)
+    return hashlib.sha256(_canonical(values, env_vars)).hexdigest()
+
+
+def config_to_bytes(config: "CorePipelineConfig", validate: bool = True) -> bytes:
+    """Serialise *config*.
+
+    Args:
+        config: The config to serialise.
+        validate: Run the rule checks (memoised) first and record that they
+            passed in the payload.
+
+    Raises:
+        ValueError: If ``validate`` is True and the config fails validation.
+    """
+    if validate:
+        config.validate_rules()
+    values, env_vars = _fields(config)
+    return json.dumps(
+        [FORMAT_VERSION, values, env_vars, config.fingerprint(), validate],
+        separators=(",", ":"),
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+
+def config_from_bytes(data: bytes, validate: bool = True) -> "CorePipelineConfig":
+    """Rebuild a config produced by `config_to_bytes`.
+
+    The config is validated against this process's rules and layouts unless
+    ``validate`` is False; the payload's own ``validated`` flag and digest are
+    not trusted. Rule results are memoised, so this is cheap for configs seen
+    before.
+
+    Raises:
+        ValueError: If the payload is malformed or the config fails validation.
+    """
+    from .models import CorePipelineConfig
+
+    try:
+        version, values, env_vars, _digest, _validated = json.loads(data)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Invalid serialised config: {exc}") from None
+    if version != FORMAT_VERSION or len(values) != len(CONFIG_FIELDS):
+        raise ValueError(f"Unsupported serialised config format: {version!r}")
+
+    config = CorePipelineConfig(
+        **dict(zip(CONFIG_FIELDS, values, strict=True)), env_vars=env_vars
+    )
+    if validate:
+        config.validate_rules()
+    return config
+
+
+def _default_cache_dir() -> Path:
+    root = os.getenv("DATAORC_CONFIG_CACHE_DIR")
+    return Path(root) if root else Path.home() / ".cache" / "dataorc" / "configs"
+
+
+def cache_key(*parts: Any) -> str:
+    """Hash JSON-serialisable *parts* into a cache key."""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ConfigCache:
+    """On-disk warm-start cache of validated configs.
+
+    Entries are created with mode ``0o600`` and re-validated when loaded.
+
+    Args:
+        directory: Cache directory; defaults to ``DATAORC_CONFIG_CACHE_DIR`` or
+            ``~/.cache/dataorc/configs``.
+        max_age: Seconds after which an entry is rebuilt; ``None`` keeps
+            entries until they are invalidated.
+    """
+
+    def __init__(
+        self, directory: Optional[str | Path] = None, max_age: Optional[float] = None
+    ) -> None:
+        self.directory = Path(directory) if directory else _default_cache_dir()
+        self.max_age = max_age
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def load(self, key: str) -> Optional["CorePipelineConfig"]:
+        """Return the cached config for *key*, or ``None`` if absent or unusable."""
+        path = self._path(key)
+        try:
+            if self.max_age is not None:
+                if time.time() - path.stat().st_mtime > self.max_age:
+                    return None
+            return config_from_bytes(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.debug("Ignoring unusable cached config %s: %s", path, exc)
+            return None
+
+    def store(self, key: str, config: "CorePipelineConfig") -> None:
+        """Write *config* under *key*; failures are logged and ignored."""
+        data = config_to_bytes(config)
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.unlink(missing_ok=True)
+            fd = os.open(tmp, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+        except OSError as exc:
+            logger.debug("Could not persist config %s: %s", path, exc)
+
+    def get_or_build(
+        self, key: str, build: Callable[[], "CorePipelineConfig"]
+    ) -> "CorePipelineConfig":
+        """Load the config for *key*, or build, validate and store it."""
+        config = self.load(key)
+        if config is None:
+            config = build()
+            self.store(key, config)
+        return config
+
+    def invalidate(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Delete every cached config."""
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+
+__all__ = [
+    "CONFIG_FIELDS",
+    "ConfigCache",
+    "cache_key",
+    "config_digest",
+    "config_from_bytes",
+    "config_to_bytes",
+]
@@ -3,6 +3,7 @@ Parameter validation logic.
 """
 
 from .models import CorePipelineConfig
+from .secrets import is_secret_ref
 
 
 def print_config(
@@ -46,5 +47,9 @@ def print_config(
     if config.env_vars:
         print("   🔧 Infrastructure Variables:")
         for key, value in sorted(config.env_vars.items()):
-            display_value = value if value else "(empty)"
+            # Key Vault references are shown as such, never resolved
+            if is_secret_ref(value):
+                display_value = f"{value} (Key Vault reference)"
+            else:
+                display_value = value if value else "(empty)"
             print(f"     {key}: {display_value}")
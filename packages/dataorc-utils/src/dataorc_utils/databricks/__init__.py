@@ -1,10 +1,46 @@
 """Databricks helpers: mounts and argument parsing.
 
-Provide a compact, typed public surface: `ensure_mount`, `OAuthConfig`, `parse_args`.
+Provide a compact, typed public surface: `ensure_mount`, `ensure_mounts`,
+`MountSpec`, `OAuthConfig`, `configure_abfss`, `parse_args`.
+Exports are loaded on first access (PEP 562).
 """
 
-from .args import parse_args
-from .mounts import OAuthConfig, ensure_mount
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .abfss import AbfssAccess, configure_abfss
+    from .args import parse_args
+    from .mounts import (
+        MountSpec,
+        MountSummary,
+        OAuthConfig,
+        ensure_mount,
+        ensure_mounts,
+    )
+
+_EXPORTS = {
+    "AbfssAccess": ".abfss",
+    "configure_abfss": ".abfss",
+    "parse_args": ".args",
+    "OAuthConfig": ".mounts",
+    "ensure_mount": ".mounts",
+    "ensure_mounts": ".mounts",
+    "MountSpec": ".mounts",
+    "MountSummary": ".mounts",
+}
 
 # Public API
-__all__ = ["OAuthConfig", "ensure_mount", "parse_args"]
+__all__ = [
+    "AbfssAccess",
+    "MountSpec",
+    "MountSummary",
+    "OAuthConfig",
+    "configure_abfss",
+    "ensure_mount",
+    "ensure_mounts",
+    "parse_args",
+]
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS, globals())
@@ -0,0 +1,155 @@
+"""Mount-free ``abfss://`` access for Spark and fsspec.
+
+Instead of mounting containers under ``/mnt`` (a FUSE indirection with
+cluster-wide side effects), `configure_abfss` applies storage-account scoped
+OAuth settings (``fs.azure.account.*.<account>.dfs.core.windows.net``) to the
+current Spark session and returns the ``abfss://`` URIs of each layer, plus
+matching fsspec ``storage_options``.
+
+- Secrets are read from Databricks secret scopes once per (scope, key) and
+  cached for the process.
+- Settings already applied to a session are not set again, so calling this
+  for every table of a job costs a dictionary lookup after the first call.
+
+Example:
+    from dataorc_utils.databricks import configure_abfss
+
+    access = configure_abfss(
+        config,
+        tenant_id="my-tenant-id",
+        secret_scope="kv-sdf-dh",
+        client_id_key="db-sp-id",
+        client_secret_key="db-sp-secret",
+        spark=spark,
+    )
+    df = spark.read.format("delta").load(access.uris["silver"])
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import weakref
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from ..config.enums import CoreParam
+from ..config.paths import LAYERS, abfss_uri, path_variable
+from ..tracing import traced
+from . import mounts
+from .mounts import OAuthConfig
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ..config.models import CorePipelineConfig
+
+_lock = threading.Lock()
+_secrets: dict[tuple[str, str], str] = {}
+# Spark session -> account -> fingerprint of the settings applied to it
+_applied: weakref.WeakKeyDictionary[Any, dict[str, str]] = weakref.WeakKeyDictionary()
+
+
+@dataclass(frozen=True, slots=True)
+class AbfssAccess:
+    """Result of `configure_abfss`.
+
+    Attributes:
+        account: Storage account (``datalake_name``).
+        uris: Layer -> ``abfss://`` URI of its lake (or work) path.
+        storage_options: fsspec/adlfs ``storage_options`` for the account.
+        applied: True when settings were (re)applied to the Spark session.
+    """
+
+    account: str
+    uris: dict[str, str]
+    storage_options: dict[str, str] = field(repr=False)
+    applied: bool = False
+
+
+def _get_secret(scope: str, key: str, refresh: bool = False) -> str:
+    cache_key = (scope, key)
+    if not refresh:
+        value = _secrets.get(cache_key)
+        if value is not None:
+            return value
+    dbutils = mounts._get_dbutils()
+    if dbutils is None:  # pragma: no cover
+        raise RuntimeError("dbutils is not available. Run inside Databricks.")
+    value = dbutils.secrets.get(scope=scope, key=key)
+    with _lock:
+        _secrets[cache_key] = value
+    return value
+
+
+def clear_abfss_cache() -> None:
+    """Forget cached secrets and applied-session fingerprints."""
+    with _lock:
+        _secrets.clear()
+        _applied.clear()
+
+
+def _apply_to_spark(spark: Any, account: str, settings: dict[str, str]) -> bool:
+    digest = hashlib.sha256(
+        json.dumps(settings, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    with _lock:
+        applied = _applied.setdefault(spark, {})
+        if applied.get(account) == digest:
+            return False
+    for key, value in settings.items():
+        spark.conf.set(key, value)
+    with _lock:
+        applied[account] = digest
+    return True
+
+
+@traced("databricks.configure_abfss")
+def configure_abfss(
+    config: "CorePipelineConfig",
+    tenant_id: str,
+    secret_scope: str,
+    client_id_key: str,
+    client_secret_key: str,
+    spark: Any | None = None,
+    work: bool = False,
+    refresh_secrets: bool = False,
+) -> AbfssAccess:
+    """Configure direct ``abfss://`` access for the storage account of *config*.
+
+    Args:
+        config: Config whose ``env_vars`` hold ``datalake_name``.
+        tenant_id: Azure tenant ID used for the OAuth token endpoint.
+        secret_scope: Databricks secret scope holding the client id and secret.
+        client_id_key: Secret key of the service principal client id.
+        client_secret_key: Secret key of the service principal client secret.
+        spark: Spark session to configure; when ``None`` only the URIs and
+            fsspec options are returned.
+        work: Return work-path URIs instead of lake (output) paths.
+        refresh_secrets: Re-read the secrets (e.g. after rotation).
+
+    Raises:
+        ValueError: If ``datalake_name`` is missing from ``config.env_vars`` or
+            is a Key Vault reference.
+    """
+    account = path_variable(config.env_vars, CoreParam.DATALAKE_NAME.value)
+    if not account:
+        raise ValueError("datalake_name must be set to configure abfss:// access")
+
+    oauth = OAuthConfig(
+        tenant_id=tenant_id,
+        client_id=_get_secret(secret_scope, client_id_key, refresh_secrets),
+        client_secret=_get_secret(secret_scope, client_secret_key, refresh_secrets),
+    )
+    applied = False
+    if spark is not None:
+        applied = _apply_to_spark(spark, account, oauth.to_dict(account))
+
+    return AbfssAccess(
+        account=account,
+        uris={layer: abfss_uri(config, layer, work=work) for layer in LAYERS},
+        storage_options=oauth.to_storage_options(account),
+        applied=applied,
+    )
+
+
+__all__ = ["AbfssAccess", "clear_abfss_cache", "configure_abfss"]
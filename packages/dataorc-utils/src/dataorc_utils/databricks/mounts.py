@@ -8,6 +8,9 @@ Design goals:
 - Explicit: caller supplies `container_name`, `datalake_name`, and auth settings
   are retrieved from Databricks secrets.
 - Reusable: small focused functions to assist pipelines.
+- Batched: `ensure_mounts` mounts many containers with one ``mounts()``
+  snapshot, one secret lookup per scope/key, and no ``updateMount`` call
+  (which refreshes the mount cache cluster-wide) when nothing changed.
 
 Example:
     from dataorc_utils.databricks.mounts import ensure_mount
@@ -25,13 +28,44 @@ Example:
 
 from __future__ import annotations
 
+import hashlib
+import hmac
+import json
 import logging
-from dataclasses import dataclass
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
 
-try:  # Import guarded for non-Databricks local environments.
-    from databricks.sdk.runtime import dbutils  # type: ignore
-except Exception:  # pragma: no cover
-    dbutils = None  # type: ignore
+from ..tracing import traced
+
+_UNSET: Any = object()
+
+
+def _get_dbutils() -> Any:
+    """Return ``dbutils``, importing the Databricks runtime on first use.
+
+    The import is deferred because ``databricks.sdk.runtime`` is slow to load
+    and absent outside Databricks; ``None`` is cached in that case. Setting the
+    module attribute ``dbutils`` (e.g. in tests) overrides the lookup.
+    """
+    value = globals().get("dbutils", _UNSET)
+    if value is _UNSET:
+        try:  # Import guarded for non-Databricks local environments.
+            from databricks.sdk.runtime import dbutils as value  # type: ignore
+        except Exception:  # pragma: no cover
+            value = None
+        globals()["dbutils"] = value
+    return value
+
+
+def __getattr__(name: str) -> Any:
+    # PEP 562: keep `from dataorc_utils.databricks.mounts import dbutils` working
+    if name == "dbutils":
+        return _get_dbutils()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 @dataclass(slots=True)
@@ -42,19 +76,39 @@ class OAuthConfig:
     client_id: str
     client_secret: str
 
-    def to_dict(self) -> dict[str, str]:
-        return {
+    def to_dict(self, datalake_name: str | None = None) -> dict[str, str]:
+        """Hadoop ABFS OAuth settings.
+
+        With ``datalake_name`` the keys are scoped to that storage account
+        (``fs.azure.account.auth.type.<account>.dfs.core.windows.net``), as
+        needed when setting them on a Spark session rather than a mount.
+        """
+        settings = {
             "fs.azure.account.auth.type": "OAuth",
             "fs.azure.account.oauth.provider.type": "org.apache.hadoop.fs.azurebfs.oauth2.ClientCredsTokenProvider",
             "fs.azure.account.oauth2.client.id": self.client_id,
             "fs.azure.account.oauth2.client.secret": self.client_secret,
             "fs.azure.account.oauth2.client.endpoint": f"https://login.microsoftonline.com/{self.tenant_id}/oauth2/token",
         }
+        if datalake_name:
+            suffix = f".{datalake_name}.dfs.core.windows.net"
+            return {f"{key}{suffix}": value for key, value in settings.items()}
+        return settings
+
+    def to_storage_options(self, datalake_name: str) -> dict[str, str]:
+        """fsspec / adlfs ``storage_options`` for the storage account."""
+        return {
+            "account_name": datalake_name,
+            "tenant_id": self.tenant_id,
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+        }
 
 
 def _get_oauth_config(
     tenant_id: str, secret_scope: str, client_id_key: str, client_secret_key: str
 ) -> OAuthConfig:
+    dbutils = _get_dbutils()
     if dbutils is None:  # pragma: no cover
         raise RuntimeError(
             "dbutils is not available. This module must run inside a Databricks notebook/cluster."
@@ -79,6 +133,7 @@ def _is_mounted(mount_point: str) -> bool:
 
     Guarded for non-databricks environments.
     """
+    dbutils = _get_dbutils()
     if dbutils is None:  # pragma: no cover
         return False
     try:
@@ -88,6 +143,7 @@ def _is_mounted(mount_point: str) -> bool:
         return False
 
 
+@traced("databricks.ensure_mount", capture=("mount_point",))
 def ensure_mount(
     container_name: str,
     datalake_name: str,
@@ -103,6 +159,7 @@ def ensure_mount(
     If the mount exists and `update_if_exists` is True, `dbutils.fs.updateMount` is used.
     Otherwise it attempts a fresh mount.
     """
+    dbutils = _get_dbutils()
     if dbutils is None:  # pragma: no cover
         raise RuntimeError("dbutils is not available. Run inside Databricks.")
 
@@ -133,3 +190,285 @@ def ensure_mount(
     except Exception as exc:  # pragma: no cover - Databricks runtime errors
         logger.warning("Verification of mount %s failed: %s", mount_point, exc)
         return False
+
+
+# ----------------------------------------------------------------------
+# Batch mounting
+# ----------------------------------------------------------------------
+
+
+@dataclass(frozen=True, slots=True)
+class MountSpec:
+    """One container to mount; same fields as the `ensure_mount` arguments."""
+
+    container_name: str
+    datalake_name: str
+    tenant_id: str
+    secret_scope: str
+    client_id_key: str
+    client_secret_key: str
+    mount_point: str = "/mnt/datalakestore"
+    update_if_exists: bool = True
+
+
+@dataclass(slots=True)
+class MountResult:
+    """Outcome for one mount point.
+
+    ``action`` is one of ``mounted``, ``updated``, ``unchanged`` (source and
+    OAuth config fingerprint match the existing mount), ``skipped`` (exists
+    and ``update_if_exists`` is False) or ``failed``.
+    """
+
+    mount_point: str
+    source: str
+    action: str
+    verified: bool | None = None
+    error: str = ""
+
+
+@dataclass(slots=True)
+class MountSummary:
+    """Results of `ensure_mounts`, in spec order."""
+
+    results: list[MountResult] = field(default_factory=list)
+
+    def _with(self, *actions: str) -> list[MountResult]:
+        return [r for r in self.results if r.action in actions]
+
+    @property
+    def changed(self) -> list[MountResult]:
+        return self._with("mounted", "updated")
+
+    @property
+    def unchanged(self) -> list[MountResult]:
+        return self._with("unchanged", "skipped")
+
+    @property
+    def failed(self) -> list[MountResult]:
+        return [r for r in self.results if r.action == "failed" or r.verified is False]
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+_state_lock = threading.Lock()
+_key: bytes | None = None
+
+
+def _state_dir() -> Path:
+    root = os.getenv("DATAORC_MOUNT_STATE_DIR")
+    return Path(root) if root else Path.home() / ".cache" / "dataorc"
+
+
+def _state_file() -> Path:
+    """Driver-local record of the config fingerprint applied to each mount."""
+    return _state_dir() / "mounts.json"
+
+
+def _fingerprint_key() -> bytes:
+    """Random HMAC key for fingerprints, created once per driver.
+
+    Keying the hash keeps the stored fingerprints from being used to test
+    guesses of the client secret. If the key cannot be persisted a
+    process-local one is used, so mounts are simply updated once more.
+    """
+    global _key
+    with _state_lock:
+        if _key is not None:
+            return _key
+        path = _state_dir() / "mounts.key"
+        try:
+            _key = path.read_bytes()
+        except OSError:
+            _key = os.urandom(32)
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+                with os.fdopen(fd, "wb") as fh:
+                    fh.write(_key)
+            except FileExistsError:
+                _key = path.read_bytes()
+            except OSError as exc:
+                logging.getLogger(__name__).debug(
+                    "Could not persist mount fingerprint key: %s", exc
+                )
+        return _key
+
+
+def _fingerprint(source: str, configs: dict[str, str]) -> str:
+    # Keyed hash only; secrets are never written to disk
+    payload = json.dumps([source, configs], sort_keys=True).encode("utf-8")
+    return hmac.new(_fingerprint_key(), payload, hashlib.sha256).hexdigest()
+
+
+def _load_fingerprints() -> dict[str, str]:
+    try:
+        data = json.loads(_state_file().read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save_fingerprints(updates: dict[str, str | None]) -> None:
+    if not updates:
+        return
+    path = _state_file()
+    with _state_lock:
+        data = _load_fingerprints()
+        for mount_point, digest in updates.items():
+            if digest is None:
+                data.pop(mount_point, None)
+            else:
+                data[mount_point] = digest
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.unlink(missing_ok=True)
+            fd = os.open(tmp, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(data, fh)
+            os.replace(tmp, path)
+        except OSError as exc:
+            logging.getLogger(__name__).debug("Could not persist mount state: %s", exc)
+
+
+@traced("databricks.ensure_mounts")
+def ensure_mounts(
+    specs: Iterable[MountSpec],
+    max_workers: int = 8,
+    verify: bool = True,
+) -> MountSummary:
+    """Mount or update many ADLS Gen2 containers at once.
+
+    Compared with calling `ensure_mount` in a loop:
+
+    - ``dbutils.fs.mounts()`` is read once.
+    - Each (scope, key) secret is fetched once, in parallel.
+    - A mount whose source and OAuth config fingerprint are unchanged since
+      it was last applied from this driver is left alone (no ``updateMount``).
+      Fingerprints are HMAC-SHA256 digests, keyed with a random per-driver
+      key, kept in ``~/.cache/dataorc/mounts.json`` (or
+      ``$DATAORC_MOUNT_STATE_DIR``); rotating a secret changes them. Only
+      this function records fingerprints; after changing a mount by other
+      means (``ensure_mount``, ``dbutils``) delete the state file to force
+      an update.
+    - Mount, update and verification calls run in parallel.
+
+    Args:
+        specs: Containers to mount. Mount points must be unique.
+        max_workers: Thread pool size for secret lookups and mount calls.
+        verify: List each mounted or updated mount point afterwards.
+
+    Returns:
+        A `MountSummary` describing what changed. Failures are reported in the
+        summary rather than raised.
+
+    Raises:
+        RuntimeError: If ``dbutils`` is not available.
+        ValueError: If two specs share a mount point.
+    """
+    dbutils = _get_dbutils()
+    if dbutils is None:  # pragma: no cover
+        raise RuntimeError("dbutils is not available. Run inside Databricks.")
+
+    logger = logging.getLogger(__name__)
+    specs = list(specs)
+    mount_points = [spec.mount_point for spec in specs]
+    duplicates = sorted({m for m in mount_points if mount_points.count(m) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate mount points: {', '.join(duplicates)}")
+
+    try:
+        existing = {m.mountPoint: m.source for m in dbutils.fs.mounts()}
+    except Exception as exc:  # pragma: no cover - Databricks runtime errors
+        logger.warning("Could not list mounts: %s", exc)
+        existing = {}
+    fingerprints = _load_fingerprints()
+    summary = MountSummary()
+    if not specs:
+        return summary
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # Resolve each distinct secret once
+        secret_keys = sorted(
+            {
+                (spec.secret_scope, key)
+                for spec in specs
+                for key in (spec.client_id_key, spec.client_secret_key)
+            }
+        )
+
+        def get_secret(scope_key: tuple[str, str]) -> str | Exception:
+            try:
+                return dbutils.secrets.get(scope=scope_key[0], key=scope_key[1])
+            except Exception as exc:
+                return exc
+
+        secrets = dict(zip(secret_keys, pool.map(get_secret, secret_keys), strict=True))
+
+        def apply(spec: MountSpec) -> tuple[MountResult, str | None]:
+            source = _build_abfss_uri(spec.container_name, spec.datalake_name)
+            mount_point = spec.mount_point
+            mounted = mount_point in existing
+            if mounted and not spec.update_if_exists:
+                return MountResult(mount_point, source, "skipped"), None
+
+            client_id = secrets[(spec.secret_scope, spec.client_id_key)]
+            client_secret = secrets[(spec.secret_scope, spec.client_secret_key)]
+            for value in (client_id, client_secret):
+                if isinstance(value, Exception):
+                    return MountResult(
+                        mount_point, source, "failed", error=str(value)
+                    ), None
+            configs = OAuthConfig(spec.tenant_id, client_id, client_secret).to_dict()
+            digest = _fingerprint(source, configs)
+
+            if (
+                mounted
+                and existing[mount_point].rstrip("/") == source.rstrip("/")
+                and fingerprints.get(mount_point) == digest
+            ):
+                return MountResult(mount_point, source, "unchanged"), None
+
+            try:
+                if mounted:
+                    logger.info("Updating mount at %s -> %s", mount_point, source)
+                    dbutils.fs.updateMount(
+                        source=source, mount_point=mount_point, extra_configs=configs
+                    )
+                    action = "updated"
+                else:
+                    logger.info("Mounting %s at %s", source, mount_point)
+                    dbutils.fs.mount(
+                        source=source, mount_point=mount_point, extra_configs=configs
+                    )
+                    action = "mounted"
+            except Exception as exc:
+                logger.warning("Mounting %s at %s failed: %s", source, mount_point, exc)
+                return MountResult(mount_point, source, "failed", error=str(exc)), None
+
+            result = MountResult(mount_point, source, action)
+            if verify:
+                try:
+                    dbutils.fs.ls(mount_point)
+                    result.verified = True
+                except Exception as exc:
+                    logger.warning(
+                        "Verification of mount %s failed: %s", mount_point, exc
+                    )
+                    result.verified, result.error = False, str(exc)
+            return result, digest
+
+        outcomes = list(pool.map(apply, specs))
+
+    _save_fingerprints(
+        {
+            result.mount_point: digest
+            for result, digest in outcomes
+            if result.action in ("mounted", "updated")
+        }
+    )
+    summary.results.extend(result for result, _ in outcomes)
+    return summary
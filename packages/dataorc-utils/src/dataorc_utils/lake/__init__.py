@@ -1,12 +1,75 @@
-"""Data lake filesystem utilities."""
+"""Data lake filesystem utilities.
 
-from .adls_filesystem import AdlsLakeFileSystem
-from .filesystem import LakeFileSystem
+Backends are loaded on first access (PEP 562), so using the local
+`LakeFileSystem` does not import the Azure SDK, and importing the package does
+not require the ``azure`` extra.
+"""
+
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
 from .protocols import JSONValue, LakeFileSystemProtocol
 
+if TYPE_CHECKING:  # pragma: no cover
+    from .adls_filesystem import AdlsLakeFileSystem
+    from .buffered import BufferedLakeWriter
+    from .catalog import LakeCatalogIndex
+    from .delta import DeltaFile, DeltaLogReader, DeltaSnapshot
+    from .filesystem import LakeFileSystem
+    from .hedging import HedgePolicy, Hedger, HedgeStats, shared_hedger
+    from .lock import LakeLock
+    from .partitioned import PartitionedWriter, PartitionFile, PartitionManifest
+    from .router import LakeRouter
+    from .sensor import AllOf, AnyOf, Marker, wait_for_paths, wait_for_paths_async
+
+_EXPORTS = {
+    "AllOf": ".sensor",
+    "AnyOf": ".sensor",
+    "AdlsLakeFileSystem": ".adls_filesystem",
+    "BufferedLakeWriter": ".buffered",
+    "DeltaFile": ".delta",
+    "DeltaLogReader": ".delta",
+    "DeltaSnapshot": ".delta",
+    "HedgePolicy": ".hedging",
+    "HedgeStats": ".hedging",
+    "Hedger": ".hedging",
+    "shared_hedger": ".hedging",
+    "LakeCatalogIndex": ".catalog",
+    "LakeFileSystem": ".filesystem",
+    "LakeLock": ".lock",
+    "LakeRouter": ".router",
+    "Marker": ".sensor",
+    "PartitionedWriter": ".partitioned",
+    "PartitionFile": ".partitioned",
+    "PartitionManifest": ".partitioned",
+    "wait_for_paths": ".sensor",
+    "wait_for_paths_async": ".sensor",
+}
+
 __all__ = [
+    "AllOf",
+    "AnyOf",
     "AdlsLakeFileSystem",
+    "BufferedLakeWriter",
+    "DeltaFile",
+    "DeltaLogReader",
+    "DeltaSnapshot",
+    "HedgePolicy",
+    "HedgeStats",
+    "Hedger",
+    "LakeCatalogIndex",
     "LakeFileSystem",
     "LakeFileSystemProtocol",
+    "LakeLock",
+    "LakeRouter",
+    "Marker",
+    "PartitionFile",
+    "PartitionManifest",
+    "PartitionedWriter",
     "JSONValue",
+    "shared_hedger",
+    "wait_for_paths",
+    "wait_for_paths_async",
 ]
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS, globals())
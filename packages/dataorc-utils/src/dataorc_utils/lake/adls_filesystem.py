@@ -12,16 +12,72 @@ Requires the ``azure`` extra::
 from __future__ import annotations
 
 import logging
+import os
+import threading
 import urllib.parse
-from typing import Any
+from typing import Any, Callable, Iterator
 
-from azure.identity import DefaultAzureCredential
 from azure.storage.filedatalake import DataLakeServiceClient
 
+from ..azure.credentials import get_credential
+from ..tracing import traced
+from .hedging import HedgePolicy, Hedger, HedgeStats, shared_hedger
 from .protocols import LakeFileSystemProtocol
 
 logger = logging.getLogger(__name__)
 
+# Largest single append_data call, and attempts when a concurrent append wins
+_APPEND_CHUNK_BYTES = 4 * 1024 * 1024
+_APPEND_ATTEMPTS = 5
+# Files whose end offset and ETag are remembered after an append
+_APPEND_ENDS_MAX = 1024
+
+# Service clients of unpickled instances: (account_url, credential recipe) ->
+# client, rebuilt after a fork
+_pool_lock = threading.Lock()
+_pool: dict[tuple[str, Any], DataLakeServiceClient] = {}
+_pool_pid = os.getpid()
+
+
+class _PendingAppend:
+    """One `AdlsLakeFileSystem.append_text` call waiting to be sent."""
+
+    __slots__ = ("data", "done", "error")
+
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.done = False
+        self.error: BaseException | None = None
+
+
+def _pooled_service(account_url: str, recipe: tuple[str, Any]) -> DataLakeServiceClient:
+    """Shared service client per account and credential recipe in this process."""
+    global _pool_pid
+    key = (account_url, recipe)
+    with _pool_lock:
+        if _pool_pid != os.getpid():
+            _pool.clear()
+            _pool_pid = os.getpid()
+        service = _pool.get(key)
+        if service is None:
+            kind, value = recipe
+            if kind == "factory":
+                credential = value()
+            elif kind == "value":
+                credential = value
+            else:
+                credential = get_credential()
+            service = _pool[key] = DataLakeServiceClient(
+                account_url=account_url, credential=credential
+            )
+        return service
+
+
+def clear_client_pool() -> None:
+    """Drop the pooled service clients used by unpickled instances."""
+    with _pool_lock:
+        _pool.clear()
+
 
 class AdlsLakeFileSystem(LakeFileSystemProtocol):
     """ADLS Gen2-backed file operations — drop-in for LakeFileSystem.
@@ -33,7 +89,23 @@ class AdlsLakeFileSystem(LakeFileSystemProtocol):
         base_path: Optional prefix inside the container prepended to
             every path.
         credential: Any Azure credential accepted by the SDK.
-            Defaults to ``DefaultAzureCredential()``.
+            Defaults to the shared ``dataorc_utils.azure.get_credential()``.
+        service_client: An existing ``DataLakeServiceClient`` to share between
+            instances (``account_url`` and ``credential`` are then only used
+            when the instance is pickled).
+        credential_factory: Picklable callable returning the credential; used
+            instead of ``credential`` so pickled copies can rebuild it.
+        hedging: Hedge ``read_text``, ``read_bytes`` and ``exists`` against
+            slow responses: ``True`` for the default `HedgePolicy`, a policy,
+            or a `Hedger`. ``True`` and policies use `shared_hedger`, so
+            instances never start thread pools of their own. Off by default.
+
+    Instances are picklable for process pools and Spark closures: they
+    serialise to the account URL, container, base path and a credential
+    recipe (the shared default credential, ``credential_factory``, or a
+    SAS/key string), and reconnect on first use in the receiving process
+    through a per-process client pool. Other credential objects cannot be
+    pickled; pass ``credential_factory`` for them.
 
     Example::
 
@@ -56,7 +128,7 @@ class AdlsLakeFileSystem(LakeFileSystemProtocol):
             uri: Full ABFSS path, e.g.
                 ``"abfss://{container}@{account}.dfs.core.windows.net/{path}"``
             credential: Any Azure credential accepted by the SDK.
-                Defaults to ``DefaultAzureCredential()``.
+                Defaults to the shared ``dataorc_utils.azure.get_credential()``.
         """
         parsed = urllib.parse.urlparse(uri)
         if parsed.scheme != "abfss":
@@ -81,58 +153,290 @@ class AdlsLakeFileSystem(LakeFileSystemProtocol):
         container: str,
         base_path: str = "",
         credential: Any | None = None,
+        service_client: DataLakeServiceClient | None = None,
+        credential_factory: Callable[[], Any] | None = None,
+        hedging: HedgePolicy | Hedger | bool | None = None,
     ):
-        self._credential = credential or DefaultAzureCredential()
-        self._service = DataLakeServiceClient(
-            account_url=account_url,
-            credential=self._credential,
-        )
+        if isinstance(hedging, Hedger):
+            self._hedger: Hedger | None = hedging
+        elif isinstance(hedging, HedgePolicy):
+            self._hedger = shared_hedger(hedging)
+        else:
+            self._hedger = shared_hedger() if hedging else None
+        if credential_factory is not None:
+            self._recipe: tuple[str, Any] = ("factory", credential_factory)
+        elif credential is None:
+            self._recipe = ("default", None)
+        elif isinstance(credential, str):
+            self._recipe = ("value", credential)
+        else:
+            self._recipe = ("object", type(credential).__name__)
+        self._account_url = account_url
+        self._container = container
+        if service_client is not None:
+            self._credential = service_client.credential
+            self._service = service_client
+        else:
+            if credential is None and credential_factory is not None:
+                credential = credential_factory()
+            self._credential = credential or get_credential()
+            self._service = DataLakeServiceClient(
+                account_url=account_url,
+                credential=self._credential,
+            )
         self._fs_client = self._service.get_file_system_client(
             file_system=container,
         )
         self._base_path = base_path.strip("/")
+        self._init_appends()
+
+    def _init_appends(self) -> None:
+        # Appends waiting per resolved path, paths with an append being sent,
+        # and (end offset, ETag) of files this instance appended to last
+        self._append_cond = threading.Condition()
+        self._append_queues: dict[str, list[_PendingAppend]] = {}
+        self._appending: set[str] = set()
+        self._append_ends: dict[str, tuple[int, str]] = {}
+
+    # ------------------------------------------------------------------
+    # Pickling
+    # ------------------------------------------------------------------
+
+    def __getstate__(self) -> dict[str, Any]:
+        if self._recipe[0] == "object":
+            raise TypeError(
+                f"AdlsLakeFileSystem with a {self._recipe[1]} credential cannot be "
+                "pickled; pass credential_factory= instead"
+            )
+        return {
+            "account_url": self._account_url,
+            "container": self._container,
+            "base_path": self._base_path,
+            "recipe": self._recipe,
+            "hedging": self._hedger.policy if self._hedger else None,
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        # Clients are rebuilt lazily (see __getattr__)
+        self._account_url = state["account_url"]
+        self._container = state["container"]
+        self._base_path = state["base_path"]
+        self._recipe = state["recipe"]
+        policy = state.get("hedging")
+        self._hedger = shared_hedger(policy) if policy is not None else None
+        self._init_appends()
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for the clients of an unpickled instance
+        if name in ("_service", "_fs_client", "_credential"):
+            service = _pooled_service(self._account_url, self._recipe)
+            self._service = service
+            self._credential = service.credential
+            self._fs_client = service.get_file_system_client(
+                file_system=self._container
+            )
+            return self.__dict__[name]
+        raise AttributeError(
+            f"{type(self).__name__!r} object has no attribute {name!r}"
+        )
+
+    @property
+    def hedge_stats(self) -> dict[str, HedgeStats]:
+        """Hedging counters per operation; empty when hedging is off."""
+        return self._hedger.stats() if self._hedger else {}
+
+    def _idempotent(self, op: str, fn: Callable[[], Any]) -> Any:
+        """Run an idempotent request, hedged when enabled."""
+        if self._hedger is None:
+            return fn()
+        return self._hedger.call(op, fn)
 
     # ------------------------------------------------------------------
     # Text operations
     # ------------------------------------------------------------------
 
+    def _download(self, path: str) -> bytes | None:
+        """Read a file; ``None`` only if it does not exist, other errors raise.
+
+        Used where a failed read must not pass for a missing file, e.g. by
+        `DeltaLogReader`.
+        """
+        from azure.core.exceptions import ResourceNotFoundError
+
+        file_client = self._fs_client.get_file_client(self._resolve(path))
+        try:
+            return self._idempotent(
+                "read", lambda: file_client.download_file().readall()
+            )
+        except ResourceNotFoundError:
+            return None
+
+    @traced("adls.read_text", capture=("path",))
     def read_text(self, path: str) -> str | None:
         """Read a UTF-8 text file. Returns ``None`` if the file does not exist."""
-        resolved = self._resolve(path)
         try:
-            file_client = self._fs_client.get_file_client(resolved)
-            download = file_client.download_file()
-            return download.readall().decode("utf-8")
+            data = self._download(path)
+            return None if data is None else data.decode("utf-8")
         except Exception:
-            logger.debug("Could not read %s", resolved, exc_info=True)
+            logger.debug("Could not read %s", self._resolve(path), exc_info=True)
             return None
 
+    @traced("adls.read_bytes", capture=("path",))
+    def read_bytes(self, path: str) -> bytes | None:
+        """Read a binary file. Returns ``None`` if the file does not exist."""
+        try:
+            return self._download(path)
+        except Exception:
+            logger.debug("Could not read %s", self._resolve(path), exc_info=True)
+            return None
+
+    @traced("adls.write_text", capture=("path",))
     def write_text(self, path: str, content: str) -> None:
         """Write (or overwrite) a UTF-8 text file.
 
         Parent "directories" are created implicitly by ADLS Gen2.
         """
         resolved = self._resolve(path)
+        self._append_ends.pop(resolved, None)
         file_client = self._fs_client.get_file_client(resolved)
         file_client.upload_data(content.encode("utf-8"), overwrite=True)
 
+    @traced("adls.write_bytes", capture=("path",))
+    def write_bytes(self, path: str, data: bytes) -> None:
+        """Write (or overwrite) a binary file."""
+        resolved = self._resolve(path)
+        self._append_ends.pop(resolved, None)
+        file_client = self._fs_client.get_file_client(resolved)
+        file_client.upload_data(data, overwrite=True)
+
+    @traced("adls.append_text", capture=("path",))
+    def append_text(self, path: str, content: str) -> None:
+        """Append UTF-8 text with ``append_data`` + ``flush_data``.
+
+        The data is staged at the current end of the file and committed with
+        a single flush that is conditional on the file's ETag. If another
+        writer appended in between, the append is retried at the new offset,
+        so concurrent appends are not lost.
+
+        Appends to one file from several threads are batched: while one is
+        being sent, later ones queue up and go out together in the next
+        append. The end offset and ETag returned by a flush are remembered,
+        so consecutive appends skip the ``get_file_properties`` probe.
+        """
+        data = content.encode("utf-8")
+        if not data:
+            return
+        resolved = self._resolve(path)
+        entry = _PendingAppend(data)
+        with self._append_cond:
+            self._append_queues.setdefault(resolved, []).append(entry)
+            while not entry.done and resolved in self._appending:
+                self._append_cond.wait()
+            if entry.done:
+                if entry.error is not None:
+                    raise entry.error
+                return
+            # Send everything queued for this file, ours included
+            self._appending.add(resolved)
+            batch = self._append_queues.pop(resolved)
+
+        error: BaseException | None = None
+        try:
+            self._append(resolved, b"".join(e.data for e in batch))
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            with self._append_cond:
+                for queued in batch:
+                    queued.done, queued.error = True, error
+                self._appending.discard(resolved)
+                self._append_cond.notify_all()
+
+    def _append(self, resolved: str, data: bytes) -> None:
+        from azure.core import MatchConditions
+        from azure.core.exceptions import (
+            HttpResponseError,
+            ResourceExistsError,
+            ResourceNotFoundError,
+        )
+
+        file_client = self._fs_client.get_file_client(resolved)
+        for attempt in range(_APPEND_ATTEMPTS):
+            known = self._append_ends.pop(resolved, None)
+            if known is not None:
+                offset, etag = known
+            else:
+                try:
+                    props = file_client.get_file_properties()
+                except ResourceNotFoundError:
+                    try:
+                        file_client.create_file(
+                            match_condition=MatchConditions.IfMissing
+                        )
+                    except ResourceExistsError:
+                        pass
+                    props = file_client.get_file_properties()
+                offset, etag = props.size, props.etag
+            try:
+                for start in range(0, len(data), _APPEND_CHUNK_BYTES):
+                    chunk = data[start : start + _APPEND_CHUNK_BYTES]
+                    file_client.append_data(
+                        chunk, offset=offset + start, length=len(chunk)
+                    )
+                response = file_client.flush_data(
+                    offset + len(data),
+                    etag=etag,
+                    match_condition=MatchConditions.IfNotModified,
+                )
+            except HttpResponseError as exc:
+                # 412: modified since read; 400/409: stale flush position.
+                # A remembered end may be stale in other ways (e.g. the file
+                # was deleted), so any error is retried with a fresh probe.
+                if known is None and exc.status_code not in (400, 409, 412):
+                    raise
+                if attempt == _APPEND_ATTEMPTS - 1:
+                    raise
+                logger.debug("Append to %s raced, retrying", resolved)
+                continue
+            new_etag = response.get("etag") if isinstance(response, dict) else None
+            if new_etag:
+                if len(self._append_ends) >= _APPEND_ENDS_MAX:
+                    self._append_ends.clear()
+                self._append_ends[resolved] = (offset + len(data), new_etag)
+            return
+
     # ------------------------------------------------------------------
     # Directory / existence helpers
     # ------------------------------------------------------------------
 
+    @traced("adls.exists", capture=("path",))
     def exists(self, path: str) -> bool:
         """Check whether a file exists."""
         resolved = self._resolve(path)
         try:
             file_client = self._fs_client.get_file_client(resolved)
-            file_client.get_file_properties()
+            self._idempotent("exists", file_client.get_file_properties)
             return True
         except Exception:
             return False
 
+    def iter_paths(self, path: str = "") -> Iterator[str]:
+        """Yield every file and directory below *path*, relative to ``base_path``.
+
+        Uses the service's paged recursive listing, fetching pages lazily.
+        """
+        resolved = self._resolve(path).rstrip("/")
+        prefix = f"{self._base_path}/" if self._base_path else ""
+        for props in self._fs_client.get_paths(path=resolved or None, recursive=True):
+            name = props.name
+            yield name[len(prefix) :] if prefix and name.startswith(prefix) else name
+
+    @traced("adls.delete", capture=("path",))
     def delete(self, path: str) -> bool:
         """Delete a file. Returns ``True`` if deleted, ``False`` otherwise."""
         resolved = self._resolve(path)
+        self._append_ends.pop(resolved, None)
         try:
             file_client = self._fs_client.get_file_client(resolved)
             file_client.delete_file()
@@ -0,0 +1,231 @@
+"""BufferedLakeWriter - write-behind wrapper for any lake filesystem.
+
+Small status, audit and metrics files are queued and written on a background
+thread pool, so ``write_text`` / ``write_json`` return immediately instead of
+waiting for an upload.
+
+- Repeated writes to a path that has not been sent yet are collapsed; only
+  the last content is written. Queued appends to a path are concatenated and
+  sent as one append.
+- Writes to one path are never sent concurrently, so the last write wins.
+- Buffered bytes (queued plus in flight) are bounded by ``max_buffered_bytes``;
+  writers block while the budget is exhausted.
+- Reads, ``exists`` and ``delete`` see queued writes; reading a path with
+  queued appends waits for them.
+- Errors from background writes are re-raised by `flush` and `close`.
+
+Example::
+
+    with BufferedLakeWriter(fs) as out:
+        for step in steps:
+            out.write_json(f"_status/{step}.json", {...})
+    # every write has been sent (or its error raised) here
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from .protocols import LakeFileSystemProtocol
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BUFFERED_BYTES = 32 * 1024 * 1024
+
+
+class BufferedLakeWriter(LakeFileSystemProtocol):
+    """Write-behind `LakeFileSystemProtocol` wrapping another backend.
+
+    Args:
+        fs: Backend that performs the writes; paths are passed through as is.
+        max_workers: Concurrent background writes.
+        max_buffered_bytes: Budget for queued plus in-flight content (UTF-8
+            bytes). A single write larger than the budget is still accepted
+            once the buffer is empty.
+
+    Attributes:
+        written: Writes completed by the backend.
+        coalesced: Writes replaced by, or appends merged into, a later
+            queued operation on the same path.
+    """
+
+    def __init__(
+        self,
+        fs: LakeFileSystemProtocol,
+        max_workers: int = 4,
+        max_buffered_bytes: int = DEFAULT_MAX_BUFFERED_BYTES,
+    ) -> None:
+        self.fs = fs
+        self.max_workers = max_workers
+        self.max_buffered_bytes = max_buffered_bytes
+        self.written = 0
+        self.coalesced = 0
+        self._base_path = ""
+        self._cond = threading.Condition()
+        # path -> (content, size, is_append)
+        self._pending: dict[str, tuple[str, int, bool]] = {}
+        self._writing: dict[str, tuple[str, bool]] = {}
+        self._bytes = 0
+        self._active = 0
+        self._errors: list[tuple[str, BaseException]] = []
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._closed = False
+
+    # ------------------------------------------------------------------
+    # LakeFileSystemProtocol
+    # ------------------------------------------------------------------
+
+    def write_text(self, path: str, content: str) -> None:
+        """Queue a write and return without waiting for it."""
+        self._enqueue(path, content, append=False)
+
+    def append_text(self, path: str, content: str) -> None:
+        """Queue an append; queued appends to one path are sent together."""
+        self._enqueue(path, content, append=True)
+
+    def read_text(self, path: str) -> str | None:
+        """Read a file, including content that is still queued."""
+        with self._cond:
+            queued = self._pending.get(path)
+            if queued is not None and not queued[2]:
+                return queued[0]
+            writing = self._writing.get(path)
+            if queued is None and writing is not None and not writing[1]:
+                return writing[0]
+            # Appends only make sense on top of the stored file
+            while path in self._pending or path in self._writing:
+                self._cond.wait()
+        return self.fs.read_text(path)
+
+    def exists(self, path: str) -> bool:
+        with self._cond:
+            if path in self._pending or path in self._writing:
+                return True
+        return self.fs.exists(path)
+
+    def delete(self, path: str) -> bool:
+        """Drop a queued write of *path* and delete it from the backend."""
+        with self._cond:
+            queued = self._pending.pop(path, None)
+            if queued is not None:
+                self._bytes -= queued[1]
+                self._cond.notify_all()
+            while path in self._writing:
+                self._cond.wait()
+        return self.fs.delete(path) or queued is not None
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    def flush(self) -> None:
+        """Wait for every queued write; re-raise the first background error."""
+        with self._cond:
+            while self._pending or self._writing:
+                self._cond.wait()
+            errors, self._errors = self._errors, []
+        if errors:
+            path, exc = errors[0]
+            note = f"Buffered lake write to {path!r} failed"
+            if len(errors) > 1:
+                note += f" (and {len(errors) - 1} more)"
+            exc.add_note(note)
+            raise exc
+
+    def close(self) -> None:
+        """Flush, then stop the background pool. Further writes raise."""
+        with self._cond:
+            self._closed = True
+        try:
+            self.flush()
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+
+    def __enter__(self) -> BufferedLakeWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        # Do not mask the body's exception with a write error
+        try:
+            self.close()
+        except Exception:
+            logger.warning("Buffered lake writes failed", exc_info=True)
+
+    # ------------------------------------------------------------------
+    # Background writes
+    # ------------------------------------------------------------------
+
+    def _enqueue(self, path: str, content: str, append: bool) -> None:
+        size = len(content.encode("utf-8"))
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("BufferedLakeWriter is closed")
+            while self._bytes and self._bytes + size > self.max_buffered_bytes:
+                self._cond.wait()
+            previous = self._pending.pop(path, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+                self.coalesced += 1
+                if append:
+                    # Extend the queued write or append
+                    content = previous[0] + content
+                    size += previous[1]
+                    append = previous[2]
+            self._pending[path] = (content, size, append)
+            self._bytes += size
+            self._pump()
+
+    def _next_path(self) -> Optional[str]:
+        """Oldest queued path that is not being written (called under the lock)."""
+        for path in self._pending:
+            if path not in self._writing:
+                return path
+        return None
+
+    def _pump(self) -> None:
+        """Start workers for queued writes (called under the lock)."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="lake-write"
+            )
+        # Workers drain the queue until it is empty, so one more is enough
+        if self._active < self.max_workers:
+            self._active += 1
+            self._pool.submit(self._drain)
+
+    def _drain(self) -> None:
+        while True:
+            with self._cond:
+                path = self._next_path()
+                if path is None:
+                    self._active -= 1
+                    return
+                content, size, append = self._pending.pop(path)
+                self._writing[path] = (content, append)
+            error: Optional[BaseException] = None
+            try:
+                if append:
+                    self.fs.append_text(path, content)
+                else:
+                    self.fs.write_text(path, content)
+            except BaseException as exc:
+                error = exc
+            with self._cond:
+                del self._writing[path]
+                self._bytes -= size
+                if error is None:
+                    self.written += 1
+                else:
+                    self._errors.append((path, error))
+                self._cond.notify_all()
+
+
+__all__ = ["BufferedLakeWriter"]
@@ -0,0 +1,341 @@
+"""Catalog index of the tables and versions present in a lake.
+
+`LakeCatalogIndex` is a trie over ``layer / domain / product / table /
+version`` built from a (paged) listing of lake paths. Each path is parsed with
+`dataorc_utils.config.paths.parse_lake_path`, so the container and
+layer-as-container layouts are both understood. The index answers questions
+such as "latest silver version of table X" or "all tables in domain Y" with a
+few dictionary lookups instead of listing the lake again.
+
+The index is persisted as a single compact JSON file through any
+`LakeFileSystemProtocol` backend, and can be refreshed incrementally: add newly
+listed paths, or replace just the subtree that was re-listed.
+
+Example::
+
+    index = LakeCatalogIndex.scan(fs)           # or .from_paths(listing)
+    index.save(fs, "_catalog/index.json")
+    ...
+    index = LakeCatalogIndex.load(fs, "_catalog/index.json")
+    index.latest_version("silver", "finance", "forecast", "positions")  # "v2"
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Iterable, Iterator, Optional
+
+from ..config.paths import LAYERS, PathLayout, parse_lake_path
+from ..config.rules import version_sort_key
+from .protocols import LakeFileSystemProtocol
+
+FORMAT_VERSION = 1
+
+# layer -> domain -> product -> table -> version -> processing methods
+_Tree = dict[str, dict[str, dict[str, dict[str, dict[str, set[str]]]]]]
+_TableKey = tuple[str, str, str, str]
+
+
+def _listing_name(item: Any) -> str:
+    """Path of a listing entry: str, dbutils ``FileInfo`` or ADLS ``PathProperties``."""
+    if isinstance(item, str):
+        return item
+    path = getattr(item, "path", None)
+    return path if isinstance(path, str) else item.name
+
+
+def _iter_listing(listing: Iterable[Any]) -> Iterator[Any]:
+    """Flatten a listing that may be a sequence of pages."""
+    for item in listing:
+        if (
+            isinstance(item, str)
+            or hasattr(item, "path")
+            or hasattr(item, "name")
+            or not isinstance(item, Iterable)
+        ):
+            yield item
+        else:
+            yield from item
+
+
+class LakeCatalogIndex:
+    """Trie of lake tables and their versions.
+
+    Args:
+        layouts: Layouts used to parse paths; defaults to every registered layout.
+    """
+
+    def __init__(self, layouts: Optional[Iterable[PathLayout]] = None) -> None:
+        self._layouts = tuple(layouts) if layouts is not None else None
+        self._tree: _Tree = {}
+        self._latest: dict[_TableKey, str] = {}
+        self.updated_at: float = 0.0
+        self.skipped = 0
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_paths(
+        cls,
+        listing: Iterable[Any],
+        strip_prefix: str = "",
+        layouts: Optional[Iterable[PathLayout]] = None,
+    ) -> LakeCatalogIndex:
+        """Build an index from a listing (paths, pages of paths or listing entries)."""
+        index = cls(layouts)
+        index.add_paths(listing, strip_prefix=strip_prefix)
+        return index
+
+    @classmethod
+    def scan(
+        cls,
+        fs: Any,
+        path: str = "",
+        layouts: Optional[Iterable[PathLayout]] = None,
+    ) -> LakeCatalogIndex:
+        """Build an index by listing *path* on *fs* with ``fs.iter_paths``."""
+        return cls.from_paths(fs.iter_paths(path), layouts=layouts)
+
+    def add_path(self, path: str) -> bool:
+        """Index one lake path; returns False if it is not a lake output path."""
+        try:
+            parsed = parse_lake_path(path, self._layouts)
+        except ValueError:
+            return False
+        if parsed.kind != "lake":
+            return False
+        self._insert(
+            (parsed.layer, parsed.domain, parsed.product, parsed.table_name),
+            parsed.version,
+            parsed.processing_method,
+        )
+        return True
+
+    def add_paths(self, listing: Iterable[Any], strip_prefix: str = "") -> int:
+        """Index every entry of *listing*; returns the number of paths indexed.
+
+        Entries may be strings, dbutils ``FileInfo`` objects (``.path``) or ADLS
+        ``PathProperties`` (``.name``), optionally grouped in pages.
+        ``strip_prefix`` is removed from the start of each path (e.g.
+        ``"dbfs:/mnt/lake/"``). Unrecognised paths are counted in ``skipped``.
+        """
+        added = 0
+        for item in _iter_listing(listing):
+            path = _listing_name(item)
+            if strip_prefix and path.startswith(strip_prefix):
+                path = path[len(strip_prefix) :]
+            if self.add_path(path):
+                added += 1
+            else:
+                self.skipped += 1
+        self.updated_at = time.time()
+        return added
+
+    def refresh(
+        self,
+        listing: Iterable[Any],
+        layer: str,
+        domain: Optional[str] = None,
+        product: Optional[str] = None,
+        table_name: Optional[str] = None,
+        strip_prefix: str = "",
+    ) -> int:
+        """Replace one subtree with a fresh listing of it.
+
+        Drops everything indexed under ``layer[/domain[/product[/table_name]]]``,
+        then indexes *listing*. Use after re-listing only the part of the lake
+        that changed.
+        """
+        self.remove(layer, domain, product, table_name)
+        return self.add_paths(listing, strip_prefix=strip_prefix)
+
+    def remove(
+        self,
+        layer: str,
+        domain: Optional[str] = None,
+        product: Optional[str] = None,
+        table_name: Optional[str] = None,
+        version: Optional[str] = None,
+    ) -> None:
+        """Remove a subtree (a whole layer down to a single version).
+
+        Raises:
+            ValueError: If a level is given without the levels above it.
+        """
+        keys = [layer, domain, product, table_name, version]
+        while keys and not keys[-1]:
+            keys.pop()
+        if not all(keys):
+            raise ValueError("remove() needs every level above the deepest one given")
+        node: Any = self._tree
+        for key in keys[:-1]:
+            node = node.get(key)
+            if node is None:
+                return
+        node.pop(keys[-1], None)
+        prefix = tuple(keys[:4])
+        for table_key in [k for k in self._latest if k[: len(prefix)] == prefix]:
+            del self._latest[table_key]
+            versions = self._versions_node(*table_key)
+            if versions:
+                self._latest[table_key] = max(versions, key=version_sort_key)
+        self._prune()
+
+    def _insert(self, table_key: _TableKey, version: str, method: str) -> None:
+        layer, domain, product, table = table_key
+        versions = (
+            self._tree.setdefault(layer, {})
+            .setdefault(domain, {})
+            .setdefault(product, {})
+            .setdefault(table, {})
+        )
+        methods = versions.get(version)
+        if methods is None:
+            methods = versions[version] = set()
+            latest = self._latest.get(table_key)
+            if latest is None or version_sort_key(version) > version_sort_key(latest):
+                self._latest[table_key] = version
+        if method:
+            methods.add(method)
+
+    def _prune(self) -> None:
+        """Drop branches left empty by `remove`."""
+
+        def prune(node: dict) -> None:
+            for key in [k for k, child in node.items() if isinstance(child, dict)]:
+                prune(node[key])
+                if not node[key]:
+                    del node[key]
+
+        prune(self._tree)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _versions_node(
+        self, layer: str, domain: str, product: str, table_name: str
+    ) -> dict[str, set[str]]:
+        return (
+            self._tree.get(layer, {})
+            .get(domain, {})
+            .get(product, {})
+            .get(table_name, {})
+        )
+
+    def latest_version(
+        self, layer: str, domain: str, product: str, table_name: str
+    ) -> Optional[str]:
+        """Highest version of a table (``v1 < v1r2 < v2``), or ``None``."""
+        return self._latest.get((layer, domain, product, table_name))
+
+    def versions(
+        self, layer: str, domain: str, product: str, table_name: str
+    ) -> list[str]:
+        """All versions of a table in ascending order."""
+        return sorted(
+            self._versions_node(layer, domain, product, table_name),
+            key=version_sort_key,
+        )
+
+    def processing_methods(
+        self, layer: str, domain: str, product: str, table_name: str, version: str
+    ) -> list[str]:
+        """Processing methods present for one table version."""
+        versions = self._versions_node(layer, domain, product, table_name)
+        return sorted(versions.get(version, ()))
+
+    def domains(self, layer: str) -> list[str]:
+        return sorted(self._tree.get(layer, {}))
+
+    def products(self, layer: str, domain: str) -> list[str]:
+        return sorted(self._tree.get(layer, {}).get(domain, {}))
+
+    def tables(
+        self,
+        layer: Optional[str] = None,
+        domain: Optional[str] = None,
+        product: Optional[str] = None,
+    ) -> list[_TableKey]:
+        """``(layer, domain, product, table_name)`` keys matching the filters."""
+        return sorted(
+            key
+            for key in self._latest
+            if (layer is None or key[0] == layer)
+            and (domain is None or key[1] == domain)
+            and (product is None or key[2] == product)
+        )
+
+    def __len__(self) -> int:
+        """Number of indexed tables."""
+        return len(self._latest)
+
+    def __contains__(self, table_key: object) -> bool:
+        return table_key in self._latest
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> dict[str, Any]:
+        tree = {
+            layer: {
+                domain: {
+                    product: {
+                        table: {v: sorted(m) for v, m in versions.items()}
+                        for table, versions in tables.items()
+                    }
+                    for product, tables in products.items()
+                }
+                for domain, products in domains.items()
+            }
+            for layer, domains in self._tree.items()
+        }
+        return {"format": FORMAT_VERSION, "updated_at": self.updated_at, "tree": tree}
+
+    @classmethod
+    def from_dict(
+        cls, data: dict[str, Any], layouts: Optional[Iterable[PathLayout]] = None
+    ) -> LakeCatalogIndex:
+        """Rebuild an index from `to_dict` output.
+
+        Raises:
+            ValueError: If the data has an unsupported format.
+        """
+        if not isinstance(data, dict) or data.get("format") != FORMAT_VERSION:
+            raise ValueError("Unsupported lake catalog index format")
+        index = cls(layouts)
+        for layer, domains in data["tree"].items():
+            if layer not in LAYERS:
+                continue
+            for domain, products in domains.items():
+                for product, tables in products.items():
+                    for table, versions in tables.items():
+                        for version, methods in versions.items():
+                            key = (layer, domain, product, table)
+                            index._insert(key, version, "")
+                            index._versions_node(*key)[version].update(methods)
+        index.updated_at = float(data.get("updated_at") or 0.0)
+        return index
+
+    def save(self, fs: LakeFileSystemProtocol, path: str) -> None:
+        """Write the index as one compact JSON file."""
+        fs.write_json(path, self.to_dict(), indent=None)
+
+    @classmethod
+    def load(
+        cls,
+        fs: LakeFileSystemProtocol,
+        path: str,
+        layouts: Optional[Iterable[PathLayout]] = None,
+    ) -> Optional[LakeCatalogIndex]:
+        """Read an index written by `save`; ``None`` if the file is missing."""
+        data = fs.read_json(path)
+        if data is None:
+            return None
+        return cls.from_dict(data, layouts)  # type: ignore[arg-type]
+
+
+__all__ = ["LakeCatalogIndex"]
@@ -0,0 +1,375 @@
+"""Spark-free reader for Delta Lake transaction logs.
+
+`DeltaLogReader` reads a table's ``_delta_log`` through any
+`LakeFileSystemProtocol` backend and returns a `DeltaSnapshot`: the table
+version, the live data files (with size, partition values and statistics), the
+schema and the table properties.
+
+- A fresh load starts from the checkpoint named in ``_last_checkpoint`` and
+  replays only the JSON commits after it, fetching them in parallel batches.
+- Snapshots are cached per table. Later calls probe for the next commit file
+  and replay only what is new, so polling an unchanged table costs one read.
+
+Checkpoints are Parquet files and need ``pyarrow`` and a backend with
+``read_bytes``. Without them the reader replays the JSON commits from version
+0, which works as long as the log has not been cleaned up.
+
+Only a missing commit file ends the log. Backends are expected to return
+``None`` for missing files and raise on other errors; for
+`AdlsLakeFileSystem`, whose reads return ``None`` on any error, the reader
+uses a read that raises, so a transient failure is not taken for the end of
+the log (and cached as a truncated snapshot).
+
+Example::
+
+    reader = DeltaLogReader(router.get(config, "gold"))
+    snapshot = reader.snapshot()
+    snapshot.version, snapshot.num_files, snapshot.column_names
+    if reader.has_changed(since_version=last_run_version): ...
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import logging
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Iterable, Iterator, Mapping, Optional
+
+from ..tracing import traced
+from .protocols import LakeFileSystemProtocol
+
+logger = logging.getLogger(__name__)
+
+LOG_DIR = "_delta_log"
+
+
+def _commit_name(version: int) -> str:
+    return f"{version:020d}.json"
+
+
+def _checkpoint_names(version: int, parts: Optional[int]) -> list[str]:
+    if not parts:
+        return [f"{version:020d}.checkpoint.parquet"]
+    return [
+        f"{version:020d}.checkpoint.{part:010d}.{parts:010d}.parquet"
+        for part in range(1, parts + 1)
+    ]
+
+
+def _as_dict(value: Any) -> dict[str, Any]:
+    """Parquet maps come back from pyarrow as lists of ``(key, value)`` pairs."""
+    if not value:
+        return {}
+    if isinstance(value, dict):
+        return value
+    return dict(value)
+
+
+@dataclass(frozen=True, slots=True)
+class DeltaFile:
+    """A live data file of a Delta table.
+
+    Attributes:
+        path: Path relative to the table root, as written in the log
+            (URL-encoded).
+        size: File size in bytes.
+        modification_time: Milliseconds since the epoch.
+        partition_values: Partition column -> value (as a string, or ``None``).
+        stats_json: Raw per-file statistics, parsed on demand by `stats`.
+    """
+
+    path: str
+    size: int
+    modification_time: int = 0
+    partition_values: Mapping[str, Optional[str]] = field(default_factory=dict)
+    stats_json: Optional[str] = field(default=None, repr=False)
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Parsed statistics (``numRecords``, ``minValues``, ...); ``{}`` if none."""
+        if not self.stats_json:
+            return {}
+        return json.loads(self.stats_json)
+
+    @property
+    def num_records(self) -> Optional[int]:
+        return self.stats.get("numRecords")
+
+    @classmethod
+    def from_action(cls, add: Mapping[str, Any]) -> DeltaFile:
+        return cls(
+            path=add["path"],
+            size=int(add.get("size") or 0),
+            modification_time=int(add.get("modificationTime") or 0),
+            partition_values=_as_dict(add.get("partitionValues")),
+            stats_json=add.get("stats"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class DeltaSnapshot:
+    """State of a Delta table at one version.
+
+    Attributes:
+        version: Table version.
+        files: Path -> `DeltaFile` for every live data file.
+        metadata: The ``metaData`` action (id, format, partition columns, ...).
+        protocol: The ``protocol`` action (reader/writer versions).
+        schema: The parsed ``schemaString`` (a Spark ``struct`` type).
+        last_commit: ``commitInfo`` of the latest replayed commit; empty when
+            the snapshot was loaded from a checkpoint with no commits after it.
+    """
+
+    version: int
+    files: Mapping[str, DeltaFile]
+    metadata: Mapping[str, Any]
+    protocol: Mapping[str, Any]
+    schema: Mapping[str, Any]
+    last_commit: Mapping[str, Any] = field(default_factory=dict)
+
+    @property
+    def num_files(self) -> int:
+        return len(self.files)
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(f.size for f in self.files.values())
+
+    @property
+    def column_names(self) -> list[str]:
+        return [column["name"] for column in self.schema.get("fields", [])]
+
+    @property
+    def partition_columns(self) -> list[str]:
+        return list(self.metadata.get("partitionColumns") or [])
+
+    @property
+    def properties(self) -> dict[str, str]:
+        """Table properties (``delta.*`` and user properties)."""
+        return _as_dict(self.metadata.get("configuration"))
+
+
+class _State:
+    """Mutable replay state; frozen into a `DeltaSnapshot` when done."""
+
+    __slots__ = ("version", "files", "metadata", "protocol", "last_commit")
+
+    def __init__(self, snapshot: Optional[DeltaSnapshot] = None) -> None:
+        if snapshot is None:
+            self.version = -1
+            self.files: dict[str, DeltaFile] = {}
+            self.metadata: Mapping[str, Any] = {}
+            self.protocol: Mapping[str, Any] = {}
+            self.last_commit: Mapping[str, Any] = {}
+        else:
+            self.version = snapshot.version
+            self.files = dict(snapshot.files)
+            self.metadata = snapshot.metadata
+            self.protocol = snapshot.protocol
+            self.last_commit = snapshot.last_commit
+
+    def apply(self, actions: Iterable[Mapping[str, Any]]) -> None:
+        for action in actions:
+            if (add := action.get("add")) is not None:
+                self.files[add["path"]] = DeltaFile.from_action(add)
+            elif (remove := action.get("remove")) is not None:
+                self.files.pop(remove["path"], None)
+            elif (metadata := action.get("metaData")) is not None:
+                self.metadata = metadata
+            elif (protocol := action.get("protocol")) is not None:
+                self.protocol = protocol
+            elif (commit := action.get("commitInfo")) is not None:
+                self.last_commit = commit
+
+    def freeze(self, previous: Optional[DeltaSnapshot]) -> DeltaSnapshot:
+        if previous is not None and previous.metadata is self.metadata:
+            schema = previous.schema
+        else:
+            schema_string = self.metadata.get("schemaString")
+            schema = json.loads(schema_string) if schema_string else {}
+        return DeltaSnapshot(
+            version=self.version,
+            files=MappingProxyType(self.files),
+            metadata=self.metadata,
+            protocol=self.protocol,
+            schema=schema,
+            last_commit=self.last_commit,
+        )
+
+
+def _parse_commit(content: str) -> Iterator[dict[str, Any]]:
+    for line in content.splitlines():
+        if line.strip():
+            yield json.loads(line)
+
+
+class DeltaLogReader:
+    """Reads and caches Delta table snapshots on a lake filesystem.
+
+    Args:
+        fs: Filesystem the table paths are relative to.
+        max_workers: Commit files fetched in parallel while catching up.
+    """
+
+    def __init__(self, fs: LakeFileSystemProtocol, max_workers: int = 8) -> None:
+        self.fs = fs
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._snapshots: dict[str, DeltaSnapshot] = {}
+        # An AdlsLakeFileSystem instance implies its module is loaded; looking
+        # it up there avoids importing the Azure SDK for other backends
+        adls = sys.modules.get("dataorc_utils.lake.adls_filesystem")
+        self._adls = adls is not None and isinstance(fs, adls.AdlsLakeFileSystem)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    @traced("delta.snapshot", capture=("path",))
+    def snapshot(self, path: str = "", refresh: bool = True) -> Optional[DeltaSnapshot]:
+        """Latest snapshot of the table at *path*; ``None`` if it has no log.
+
+        With ``refresh=False`` a cached snapshot is returned as is. Otherwise
+        the cached snapshot is brought up to date by replaying new commits.
+        """
+        key = path.strip("/")
+        cached = self._snapshots.get(key)
+        if cached is not None and not refresh:
+            return cached
+        snapshot = self._update(key, cached) if cached else self._load(key)
+        if snapshot is not None:
+            with self._lock:
+                self._snapshots[key] = snapshot
+        return snapshot
+
+    def version(self, path: str = "") -> Optional[int]:
+        """Current table version; ``None`` if *path* is not a Delta table."""
+        snapshot = self.snapshot(path)
+        return snapshot.version if snapshot else None
+
+    def has_changed(self, path: str = "", since_version: Optional[int] = None) -> bool:
+        """True if the table moved past *since_version* (or is new)."""
+        version = self.version(path)
+        if version is None:
+            return False
+        return since_version is None or version > since_version
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Drop the cached snapshot of *path*, or of every table."""
+        with self._lock:
+            if path is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(path.strip("/"), None)
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _log_path(self, table: str, name: str) -> str:
+        return f"{table}/{LOG_DIR}/{name}" if table else f"{LOG_DIR}/{name}"
+
+    def _read_text(self, path: str) -> Optional[str]:
+        """Read a log file; ``None`` only if it is missing, errors raise."""
+        if self._adls:
+            data = self.fs._download(path)  # type: ignore[attr-defined]
+            return None if data is None else data.decode("utf-8")
+        return self.fs.read_text(path)
+
+    def _read_bytes(self, path: str) -> Optional[bytes]:
+        if self._adls:
+            return self.fs._download(path)  # type: ignore[attr-defined]
+        return self.fs.read_bytes(path)  # type: ignore[attr-defined]
+
+    def _load(self, table: str) -> Optional[DeltaSnapshot]:
+        state = _State()
+        skipped: Optional[Exception] = None
+        pointer = None
+        content = self._read_text(self._log_path(table, "_last_checkpoint"))
+        if content is not None:
+            try:
+                pointer = json.loads(content)
+            except ValueError as exc:
+                logger.debug("Ignoring unreadable _last_checkpoint: %s", exc)
+        if isinstance(pointer, dict) and "version" in pointer:
+            version = int(pointer["version"])
+            try:
+                state.apply(self._read_checkpoint(table, version, pointer.get("parts")))
+                state.version = version
+            except (ImportError, ValueError) as exc:
+                logger.debug("Replaying the Delta log from version 0: %s", exc)
+                skipped = exc
+        if not self._catch_up(table, state) and state.version < 0:
+            if skipped is not None:
+                # Commits before the checkpoint have been cleaned up
+                raise skipped
+            return None
+        return state.freeze(None)
+
+    def _update(self, table: str, cached: DeltaSnapshot) -> DeltaSnapshot:
+        # One read when nothing changed; copy the file map only on change.
+        first = self._read_text(self._log_path(table, _commit_name(cached.version + 1)))
+        if first is None:
+            return cached
+        state = _State(cached)
+        state.apply(_parse_commit(first))
+        state.version += 1
+        self._catch_up(table, state)
+        return state.freeze(cached)
+
+    def _catch_up(self, table: str, state: _State) -> bool:
+        """Replay consecutive commits after ``state.version``; True if any."""
+        replayed = False
+        batch = max(1, self.max_workers)
+        with ThreadPoolExecutor(max_workers=batch) as pool:
+            while True:
+                start = state.version + 1
+                paths = [
+                    self._log_path(table, _commit_name(v))
+                    for v in range(start, start + batch)
+                ]
+                for content in pool.map(self._read_text, paths):
+                    if content is None:
+                        return replayed
+                    state.apply(_parse_commit(content))
+                    state.version += 1
+                    replayed = True
+
+    def _read_checkpoint(
+        self, table: str, version: int, parts: Optional[int]
+    ) -> list[dict[str, Any]]:
+        """Actions of a Parquet checkpoint.
+
+        Raises:
+            ImportError: If pyarrow is not installed or the backend cannot
+                read binary files.
+            ValueError: If a checkpoint file is missing.
+        """
+        if not hasattr(self.fs, "read_bytes"):
+            raise ImportError(
+                f"{type(self.fs).__name__} cannot read binary Delta checkpoints"
+            )
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError(
+                "Reading Delta checkpoints requires pyarrow. "
+                "Install with 'pip install pyarrow'"
+            ) from exc
+
+        actions: list[dict[str, Any]] = []
+        for name in _checkpoint_names(version, parts):
+            data = self._read_bytes(self._log_path(table, name))
+            if data is None:
+                raise ValueError(f"Delta checkpoint {name} is missing")
+            for row in pq.read_table(io.BytesIO(data)).to_pylist():
+                actions.append({k: v for k, v in row.items() if v is not None})
+        return actions
+
+
+__all__ = ["DeltaFile", "DeltaLogReader", "DeltaSnapshot"]
@@ -8,39 +8,75 @@ On Databricks with FUSE mount, paths should include /dbfs/ prefix.
 from __future__ import annotations
 
 import json
+from typing import TYPE_CHECKING, Iterator
 
-import fsspec
-
+from ..tracing import traced
 from .protocols import JSONValue, LakeFileSystemProtocol
 
+if TYPE_CHECKING:  # pragma: no cover
+    import fsspec
+
 
 class LakeFileSystem(LakeFileSystemProtocol):
     """Unified interface for data lake file operations.
 
+    Any fsspec protocol can be used (``"abfs"``, ``"memory"``, ...); the
+    default is the local filesystem.
+
+    Instances are picklable (for process pools and Spark closures): the
+    fsspec filesystem is not sent unless it was passed in, and is recreated
+    on first use from fsspec's per-process instance cache.
+
     Example:
         fs = LakeFileSystem(base_path="/dbfs/mnt/datalake/bronze")
         fs.write_json("data.json", {"key": "value"})
         data = fs.read_json("data.json")
     """
 
-    def __init__(self, base_path: str | None = None):
-        """Initialize with optional base path prepended to all operations."""
+    def __init__(
+        self,
+        base_path: str | None = None,
+        protocol: str = "file",
+        storage_options: dict | None = None,
+        filesystem: fsspec.AbstractFileSystem | None = None,
+    ):
+        """Initialize with optional base path prepended to all operations.
+
+        Args:
+            base_path: Prefix prepended to every path.
+            protocol: fsspec protocol used when ``filesystem`` is not given.
+            storage_options: Options passed to ``fsspec.filesystem``.
+            filesystem: An existing fsspec filesystem to share between instances.
+        """
         self._base_path = base_path.rstrip("/") if base_path else ""
-        self._fs: fsspec.AbstractFileSystem | None = None
+        self._protocol = protocol
+        self._storage_options = storage_options or {}
+        self._fs: fsspec.AbstractFileSystem | None = filesystem
+        self._shared_fs = filesystem is not None
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        if not self._shared_fs:
+            state["_fs"] = None
+        return state
 
     @property
     def fs(self) -> fsspec.AbstractFileSystem:
         """Lazy initialization of fsspec filesystem."""
         if self._fs is None:
-            self._fs = fsspec.filesystem("file")
+            import fsspec
+
+            self._fs = fsspec.filesystem(self._protocol, **self._storage_options)
         return self._fs
 
     # --- Directory Operations ---
 
+    @traced("lake.exists", capture=("path",))
     def exists(self, path: str) -> bool:
         """Check if a file or directory exists."""
         return self.fs.exists(self._resolve(path))
 
+    @traced("lake.delete", capture=("path",))
     def delete(self, path: str) -> bool:
         """Delete a file. Returns True if deleted, False if didn't exist."""
         resolved = self._resolve(path)
@@ -49,8 +85,20 @@ class LakeFileSystem(LakeFileSystemProtocol):
         self.fs.rm(resolved)
         return True
 
+    def iter_paths(self, path: str = "") -> Iterator[str]:
+        """Yield every file and directory below *path*, relative to the base path."""
+        resolved = self._resolve(path)
+        if not self.fs.exists(resolved):
+            return
+        base = self.fs._strip_protocol(self._base_path) if self._base_path else ""
+        for found in self.fs.find(resolved, withdirs=True):
+            relative = found[len(base) :].lstrip("/") if base else found
+            if relative:
+                yield relative
+
     # --- Text Operations ---
 
+    @traced("lake.read_text", capture=("path",))
     def read_text(self, path: str) -> str | None:
         """Read a text file. Returns None if file doesn't exist."""
         resolved = self._resolve(path)
@@ -59,6 +107,16 @@ class LakeFileSystem(LakeFileSystemProtocol):
         with self.fs.open(resolved, "r", encoding="utf-8") as f:
             return f.read()
 
+    @traced("lake.read_bytes", capture=("path",))
+    def read_bytes(self, path: str) -> bytes | None:
+        """Read a binary file. Returns None if file doesn't exist."""
+        resolved = self._resolve(path)
+        if not self.fs.exists(resolved):
+            return None
+        with self.fs.open(resolved, "rb") as f:
+            return f.read()
+
+    @traced("lake.write_text", capture=("path",))
     def write_text(self, path: str, content: str) -> None:
         """Write a text file, creating parent directories if needed."""
         resolved = self._resolve(path)
@@ -68,8 +126,29 @@ class LakeFileSystem(LakeFileSystemProtocol):
         with self.fs.open(resolved, "w", encoding="utf-8") as f:
             f.write(content)
 
+    @traced("lake.write_bytes", capture=("path",))
+    def write_bytes(self, path: str, data: bytes) -> None:
+        """Write a binary file, creating parent directories if needed."""
+        resolved = self._resolve(path)
+        parent = self.fs._parent(resolved)
+        if parent:
+            self.fs.makedirs(parent, exist_ok=True)
+        with self.fs.open(resolved, "wb") as f:
+            f.write(data)
+
+    @traced("lake.append_text", capture=("path",))
+    def append_text(self, path: str, content: str) -> None:
+        """Append to a text file in append mode, creating it if needed."""
+        resolved = self._resolve(path)
+        parent = self.fs._parent(resolved)
+        if parent:
+            self.fs.makedirs(parent, exist_ok=True)
+        with self.fs.open(resolved, "ab") as f:
+            f.write(content.encode("utf-8"))
+
     # --- JSON Operations (streaming) ---
 
+    @traced("lake.read_json", capture=("path",))
     def read_json(self, path: str) -> JSONValue:
         """Read a JSON file by streaming from the file handle.
 
@@ -81,6 +160,7 @@ class LakeFileSystem(LakeFileSystemProtocol):
         with self.fs.open(resolved, "r", encoding="utf-8") as f:
             return json.load(f)
 
+    @traced("lake.write_json", capture=("path",))
     def write_json(self, path: str, data: JSONValue, indent: int = 2) -> None:
         """Write a JSON file by streaming directly to the file handle.
 
@@ -0,0 +1,270 @@
+"""Hedged requests for idempotent lake operations.
+
+A hedged call starts the request and, if it has not completed within an
+adaptive delay (by default the observed p95 latency of that operation), sends
+a duplicate. The first successful response wins; the other is cancelled if it
+has not started, and its result is otherwise discarded (a synchronous SDK
+call cannot be interrupted).
+
+Extra load is capped by a hedge credit: each request earns
+``max_hedge_ratio`` credits, up to ``hedge_burst``, and each hedge spends
+one. With the defaults, at most about 5% of requests are duplicated.
+
+Primaries and hedges run on separate thread pools, so a hedge never queues
+behind the slow primaries it is meant to back up. A call made without hedge
+credit cannot be hedged and runs inline on the caller's thread.
+
+Only use hedging for idempotent operations: reads, stats and existence
+checks. `AdlsLakeFileSystem` applies it to ``read_text``, ``read_bytes`` and
+``exists`` when created with ``hedging=``.
+
+`shared_hedger` returns one process-wide `Hedger` per policy. Filesystems and
+routers created with ``hedging=True`` or a policy use it, so their thread
+pools are shared rather than created per instance.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Recompute the hedge delay every this many latency samples
+_RECOMPUTE_EVERY = 16
+
+# Process-wide hedgers per policy; dropped in forked children, whose copies
+# have no pool threads
+_shared_lock = threading.Lock()
+_shared: dict["HedgePolicy", "Hedger"] = {}
+_shared_pid = os.getpid()
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """Settings for `Hedger`.
+
+    Attributes:
+        quantile: Latency quantile used as the hedge delay (0.95 = p95).
+        initial_delay: Delay in seconds until ``min_samples`` are observed.
+        min_delay: Lower bound of the delay in seconds.
+        max_delay: Upper bound of the delay in seconds.
+        min_samples: Samples needed before the observed quantile is used.
+        window: Latency samples kept per operation.
+        max_hedge_ratio: Hedge credit earned per request.
+        hedge_burst: Maximum accumulated hedge credit.
+        max_workers: Threads running primary requests.
+        hedge_workers: Threads running hedged requests.
+    """
+
+    quantile: float = 0.95
+    initial_delay: float = 0.05
+    min_delay: float = 0.005
+    max_delay: float = 2.0
+    min_samples: int = 20
+    window: int = 512
+    max_hedge_ratio: float = 0.05
+    hedge_burst: float = 10.0
+    max_workers: int = 32
+    hedge_workers: int = 8
+
+
+@dataclass
+class HedgeStats:
+    """Counters for one operation.
+
+    Attributes:
+        requests: Hedged-call invocations.
+        hedges: Duplicates sent.
+        hedge_wins: Calls answered by the duplicate.
+        capped: Calls past the delay that could not hedge (no credit).
+        delay: Current hedge delay in seconds.
+    """
+
+    requests: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    capped: int = 0
+    delay: float = 0.0
+
+
+class _Latencies:
+    __slots__ = ("samples", "delay", "since_recompute")
+
+    def __init__(self, window: int, delay: float) -> None:
+        self.samples: deque[float] = deque(maxlen=window)
+        self.delay = delay
+        self.since_recompute = 0
+
+
+class Hedger:
+    """Runs idempotent calls with hedging according to a `HedgePolicy`."""
+
+    def __init__(self, policy: Optional[HedgePolicy] = None) -> None:
+        self.policy = policy or HedgePolicy()
+        self._lock = threading.Lock()
+        self._latencies: dict[str, _Latencies] = {}
+        self._stats: dict[str, HedgeStats] = {}
+        self._credit = self.policy.hedge_burst
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._hedge_pool: Optional[ThreadPoolExecutor] = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def call(self, op: str, fn: Callable[[], T]) -> T:
+        """Run *fn*, sending a duplicate if it is slower than the hedge delay.
+
+        Exceptions propagate when both attempts fail (the primary's error
+        is raised).
+        """
+        with self._lock:
+            stats = self._stats.setdefault(op, HedgeStats())
+            stats.requests += 1
+            self._credit = min(
+                self._credit + self.policy.max_hedge_ratio, self.policy.hedge_burst
+            )
+            delay = self._state(op).delay
+            inline = self._credit < 1.0
+            if not inline and self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.policy.max_workers,
+                    thread_name_prefix="lake-primary",
+                )
+            pool = self._pool
+
+        if inline:
+            # No credit to hedge with: skip the thread hand-off
+            start = time.monotonic()
+            result = fn()
+            elapsed = time.monotonic() - start
+            self._observe(op, elapsed)
+            if elapsed > delay:
+                with self._lock:
+                    stats.capped += 1
+            return result
+
+        primary = pool.submit(self._timed, op, fn)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        with self._lock:
+            allowed = self._credit >= 1.0
+            if allowed:
+                self._credit -= 1.0
+                stats.hedges += 1
+                if self._hedge_pool is None:
+                    self._hedge_pool = ThreadPoolExecutor(
+                        max_workers=self.policy.hedge_workers,
+                        thread_name_prefix="lake-hedge",
+                    )
+                hedge_pool = self._hedge_pool
+            else:
+                stats.capped += 1
+        if not allowed:
+            return primary.result()
+
+        hedge = hedge_pool.submit(self._timed, op, fn)
+        return self._first_success(stats, primary, hedge)
+
+    def stats(self) -> dict[str, HedgeStats]:
+        """Snapshot of the counters per operation."""
+        with self._lock:
+            return {
+                op: HedgeStats(
+                    requests=s.requests,
+                    hedges=s.hedges,
+                    hedge_wins=s.hedge_wins,
+                    capped=s.capped,
+                    delay=self._state(op).delay,
+                )
+                for op, s in self._stats.items()
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker threads (they are restarted on the next call)."""
+        with self._lock:
+            pools = (self._pool, self._hedge_pool)
+            self._pool = self._hedge_pool = None
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _first_success(self, stats: HedgeStats, primary: Future, hedge: Future):
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            # Prefer the primary when both finished together
+            for future in sorted(done, key=lambda f: f is not primary):
+                if future.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    if future is hedge:
+                        with self._lock:
+                            stats.hedge_wins += 1
+                    return future.result()
+        return primary.result()  # both failed: raise the primary's error
+
+    def _state(self, op: str) -> _Latencies:
+        """Latency window of *op* (called under the lock)."""
+        state = self._latencies.get(op)
+        if state is None:
+            state = self._latencies[op] = _Latencies(
+                self.policy.window, self.policy.initial_delay
+            )
+        return state
+
+    def _timed(self, op: str, fn: Callable[[], T]) -> T:
+        start = time.monotonic()
+        result = fn()
+        self._observe(op, time.monotonic() - start)
+        return result
+
+    def _observe(self, op: str, seconds: float) -> None:
+        policy = self.policy
+        with self._lock:
+            state = self._state(op)
+            state.samples.append(seconds)
+            state.since_recompute += 1
+            if (
+                len(state.samples) < policy.min_samples
+                or state.since_recompute < _RECOMPUTE_EVERY
+            ):
+                return
+            state.since_recompute = 0
+            ordered = sorted(state.samples)
+            observed = ordered[
+                min(int(len(ordered) * policy.quantile), len(ordered) - 1)
+            ]
+            state.delay = min(max(observed, policy.min_delay), policy.max_delay)
+
+
+def shared_hedger(policy: Optional[HedgePolicy] = None) -> Hedger:
+    """Process-wide `Hedger` for *policy* (the default policy when ``None``).
+
+    Counters are shared too: `Hedger.stats` covers every user of the policy.
+    """
+    global _shared_pid
+    policy = policy or HedgePolicy()
+    with _shared_lock:
+        if _shared_pid != os.getpid():
+            _shared.clear()
+            _shared_pid = os.getpid()
+        hedger = _shared.get(policy)
+        if hedger is None:
+            hedger = _shared[policy] = Hedger(policy)
+        return hedger
+
+
+__all__ = ["HedgePolicy", "HedgeStats", "Hedger", "shared_hedger"]
@@ -0,0 +1,328 @@
+"""LakeLock - lease-based mutual exclusion on a lake path.
+
+Lets jobs that share a path (typically a table's work path) run in parallel
+and wait only when they contend for the same lock.
+
+- On `AdlsLakeFileSystem` the lock is an ADLS Gen2 lease on the lock file.
+- On a local `LakeFileSystem` it is a ``<lock>.lease`` file created with
+  ``O_CREAT | O_EXCL``, whose modification time is its expiry heartbeat.
+
+Both hold a lease of ``lease_duration`` seconds. A background thread renews
+the lease every third of that, so the lease outlives slow work but expires
+soon after a crashed holder stops renewing it.
+
+Every acquisition increments a fencing token stored with the lock file
+(ADLS metadata, or the file content locally). Writers record ``lock.token``
+with what they write, and call `LakeLock.check` before committing to detect
+a lease that was lost, e.g. after a long GC pause.
+
+Example::
+
+    fs = router.get(config, "silver", work=True)
+    with LakeLock(fs, "_lock", timeout=300) as lock:
+        fs.write_json("state.json", {"token": lock.token, ...})
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+from typing import Any, Optional
+
+from ..tracing import traced
+from .filesystem import LakeFileSystem
+from .protocols import LakeFileSystemProtocol
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE_DURATION = 60
+_TOKEN_METADATA_KEY = "fencing_token"
+
+
+class _LocalLease:
+    """``O_EXCL`` lease file next to the lock file, expired by mtime."""
+
+    def __init__(self, path: str, duration: int) -> None:
+        self.path = path
+        self.lease_path = f"{path}.lease"
+        self.duration = duration
+        self.owner = uuid.uuid4().hex
+
+    def acquire(self) -> bool:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        try:
+            fd = os.open(self.lease_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if self._break_stale():
+                return self.acquire()
+            return False
+        with os.fdopen(fd, "w") as f:
+            f.write(self.owner)
+        return True
+
+    def _break_stale(self) -> bool:
+        """Remove an expired lease; True if it was removed."""
+        try:
+            if time.time() - os.stat(self.lease_path).st_mtime <= self.duration:
+                return False
+            # Rename first so two breakers cannot both remove a fresh lease
+            stale = f"{self.lease_path}.{self.owner}.stale"
+            os.rename(self.lease_path, stale)
+        except FileNotFoundError:
+            return True
+        if time.time() - os.stat(stale).st_mtime <= self.duration:
+            # Another breaker already replaced it; put the live lease back
+            try:
+                os.link(stale, self.lease_path)
+            except FileExistsError:
+                pass
+            os.remove(stale)
+            return False
+        logger.warning("Breaking expired lake lock %s", self.lease_path)
+        os.remove(stale)
+        return True
+
+    def held(self) -> bool:
+        try:
+            with open(self.lease_path, encoding="utf-8") as f:
+                return f.read() == self.owner
+        except FileNotFoundError:
+            return False
+
+    def renew(self) -> None:
+        if not self.held():
+            raise RuntimeError(f"Lease {self.lease_path} was lost")
+        os.utime(self.lease_path)
+
+    def release(self) -> None:
+        if self.held():
+            os.remove(self.lease_path)
+
+    def read_token(self) -> int:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return int(f.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def write_token(self, token: int) -> None:
+        tmp = f"{self.path}.{self.owner}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(str(token))
+        os.replace(tmp, self.path)
+
+
+class _AdlsLease:
+    """ADLS Gen2 lease on the lock file; the token lives in its metadata."""
+
+    def __init__(self, file_client: Any, duration: int) -> None:
+        self.file_client = file_client
+        self.duration = duration
+        self.lease: Any = None
+        self._created = False
+
+    def acquire(self) -> bool:
+        from azure.core.exceptions import HttpResponseError, ResourceExistsError
+
+        if not self._created:
+            try:
+                self.file_client.upload_data(b"", overwrite=False)
+            except ResourceExistsError:
+                pass
+            self._created = True
+        try:
+            self.lease = self.file_client.acquire_lease(lease_duration=self.duration)
+        except HttpResponseError as exc:
+            if exc.status_code == 409:  # lease already present
+                return False
+            raise
+        return True
+
+    def held(self) -> bool:
+        # Renewing with our lease id fails once the lease belongs to someone else
+        if self.lease is None:
+            return False
+        try:
+            self.lease.renew()
+        except Exception:
+            return False
+        return True
+
+    def renew(self) -> None:
+        self.lease.renew()
+
+    def release(self) -> None:
+        if self.lease is not None:
+            self.lease.release()
+            self.lease = None
+
+    def read_token(self) -> int:
+        props = self.file_client.get_file_properties()
+        return int((props.metadata or {}).get(_TOKEN_METADATA_KEY, 0))
+
+    def write_token(self, token: int) -> None:
+        self.file_client.set_metadata(
+            {_TOKEN_METADATA_KEY: str(token)}, lease=self.lease
+        )
+
+
+def _lease_for(fs: LakeFileSystemProtocol, path: str, duration: int) -> Any:
+    fs_client = getattr(fs, "_fs_client", None)
+    if fs_client is not None:
+        return _AdlsLease(fs_client.get_file_client(fs._resolve(path)), duration)
+    if isinstance(fs, LakeFileSystem) and fs._protocol in ("file", "local"):
+        return _LocalLease(fs._resolve(path), duration)
+    raise ValueError(
+        "LakeLock needs an AdlsLakeFileSystem or a local LakeFileSystem, "
+        f"got {type(fs).__name__}"
+    )
+
+
+class LakeLock:
+    """Distributed lock on a lake path with lease renewal and fencing tokens.
+
+    Args:
+        fs: `AdlsLakeFileSystem` or local `LakeFileSystem`.
+        path: Lock file, relative to the filesystem's base path.
+        timeout: Seconds to wait in blocking `acquire` (``None`` waits forever).
+        lease_duration: Lease length in seconds (15-60 on ADLS).
+        poll_interval: Seconds between attempts while waiting (with jitter).
+        renew: Renew the lease in a background thread while held.
+    """
+
+    def __init__(
+        self,
+        fs: LakeFileSystemProtocol,
+        path: str = "_lock",
+        timeout: Optional[float] = None,
+        lease_duration: int = DEFAULT_LEASE_DURATION,
+        poll_interval: float = 0.5,
+        renew: bool = True,
+    ) -> None:
+        self.path = path
+        self.timeout = timeout
+        self.lease_duration = lease_duration
+        self.poll_interval = poll_interval
+        self.renew = renew
+        self.token: Optional[int] = None
+        self._lease = _lease_for(fs, path, lease_duration)
+        self._lost = False
+        self._stop = threading.Event()
+        self._renewer: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    @property
+    def locked(self) -> bool:
+        """True while this instance holds the lock."""
+        return self.token is not None
+
+    @traced("lake.lock.acquire")
+    def acquire(self, blocking: bool = True, timeout: Optional[float] = None) -> bool:
+        """Acquire the lock; returns False if it could not be taken in time.
+
+        Args:
+            blocking: Wait for the lock; when False try exactly once.
+            timeout: Overrides the instance ``timeout`` for this call.
+        """
+        if self.locked:
+            raise RuntimeError(f"LakeLock {self.path!r} is already held")
+        timeout = self.timeout if timeout is None else timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._lease.acquire():
+            if not blocking:
+                return False
+            delay = self.poll_interval * random.uniform(0.5, 1.5)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                delay = min(delay, remaining)
+            time.sleep(delay)
+
+        try:
+            token = self._lease.read_token() + 1
+            self._lease.write_token(token)
+        except BaseException:
+            self._lease.release()
+            raise
+        self.token = token
+        self._lost = False
+        if self.renew:
+            self._start_renewer()
+        return True
+
+    def try_acquire(self) -> bool:
+        """Acquire without waiting."""
+        return self.acquire(blocking=False)
+
+    def release(self) -> None:
+        """Stop renewing and release the lease."""
+        if not self.locked:
+            return
+        self._stop.set()
+        if self._renewer is not None:
+            self._renewer.join()
+            self._renewer = None
+        try:
+            self._lease.release()
+        except Exception:
+            logger.warning("Failed to release lake lock %s", self.path, exc_info=True)
+        self.token = None
+
+    def check(self) -> None:
+        """Raise RuntimeError unless this instance still holds the lease.
+
+        Call before committing work guarded by the lock: a lease that could
+        not be renewed may already belong to another writer with a newer token.
+        """
+        if not self.locked:
+            raise RuntimeError(f"LakeLock {self.path!r} is not held")
+        if self._lost or not self._lease.held():
+            raise RuntimeError(f"LakeLock {self.path!r} was lost (token {self.token})")
+        if self._lease.read_token() != self.token:
+            raise RuntimeError(
+                f"LakeLock {self.path!r} token {self.token} was superseded"
+            )
+
+    def __enter__(self) -> LakeLock:
+        if not self.acquire():
+            raise TimeoutError(
+                f"Timed out after {self.timeout}s waiting for LakeLock {self.path!r}"
+            )
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.release()
+
+    # ------------------------------------------------------------------
+    # Renewal
+    # ------------------------------------------------------------------
+
+    def _start_renewer(self) -> None:
+        self._stop = threading.Event()
+        self._renewer = threading.Thread(
+            target=self._renew_loop,
+            name=f"lake-lock-renew:{self.path}",
+            daemon=True,
+        )
+        self._renewer.start()
+
+    def _renew_loop(self) -> None:
+        interval = max(self.lease_duration / 3, 0.01)
+        while not self._stop.wait(interval):
+            try:
+                self._lease.renew()
+            except Exception:
+                logger.warning("Lost lake lock %s", self.path, exc_info=True)
+                self._lost = True
+                return
+
+
+__all__ = ["LakeLock"]
@@ -0,0 +1,398 @@
+"""PartitionedWriter - split a record stream into Hive-style JSONL files.
+
+Records are routed by one or more partition columns to
+``<col>=<value>/.../part-NNNNN.jsonl`` files (``.jsonl.gz`` with gzip
+compression) below a lake path:
+
+- Each open partition buffers its serialised records. When the buffer
+  reaches ``target_file_bytes`` it is written as one part file and the
+  partition rolls over to the next part number.
+- Buffered plus in-flight bytes are capped by ``memory_budget``. Above it the
+  largest buffer is written early as a smaller part, and writers block while
+  uploads drain.
+- Part files are uploaded concurrently on a thread pool through any
+  `LakeFileSystemProtocol` backend. Every part is written whole, so uploads
+  never touch the same file and a retried upload simply overwrites it.
+- `close` returns a `PartitionManifest` listing every part written. Leaving
+  a ``with`` block with an exception calls `abort` instead: buffered records
+  are dropped, in-flight uploads finish and no manifest is written.
+
+Example::
+
+    fs = router.get(config, "silver")
+    with PartitionedWriter(fs, ["date", "site"], compression="gzip") as out:
+        for record in records:
+            out.write(record)
+    out.manifest.records  # rows written
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Iterable, Mapping, Optional, Sequence
+
+from ..tracing import traced
+from .protocols import LakeFileSystemProtocol
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TARGET_FILE_BYTES = 128 * 1024 * 1024
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+
+# Directory value for missing (None) partition values, as in Hive and Spark
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+# Characters Hive percent-encodes in partition column names and values
+_ESCAPED = frozenset("\"#%'*/:=?\\\x7f{[]^")
+
+_COMPRESSION_SUFFIX = {None: "", "gzip": ".gz"}
+
+
+def _escape(value: Any) -> str:
+    if value is None:
+        return NULL_PARTITION
+    return _escape_text(str(value))
+
+
+def _escape_text(text: str) -> str:
+    if not any(c in _ESCAPED or c < " " for c in text):
+        return text
+    return "".join(f"%{ord(c):02X}" if c in _ESCAPED or c < " " else c for c in text)
+
+
+@dataclass(frozen=True, slots=True)
+class PartitionFile:
+    """One part file written by `PartitionedWriter`.
+
+    Attributes:
+        path: File path relative to the filesystem's base path.
+        partition: Partition column -> value (as text; missing values are
+            ``None``).
+        records: Records in the file.
+        bytes: Size of the file as written (after compression).
+    """
+
+    path: str
+    partition: Mapping[str, Optional[str]]
+    records: int
+    bytes: int
+
+
+@dataclass(frozen=True, slots=True)
+class PartitionManifest:
+    """Everything a `PartitionedWriter` wrote, sorted by path."""
+
+    path: str
+    partition_by: tuple[str, ...]
+    compression: Optional[str]
+    files: tuple[PartitionFile, ...]
+
+    @property
+    def records(self) -> int:
+        return sum(f.records for f in self.files)
+
+    @property
+    def bytes(self) -> int:
+        return sum(f.bytes for f in self.files)
+
+    @property
+    def partitions(self) -> list[str]:
+        """Distinct partition directories, sorted."""
+        return sorted({f.path.rsplit("/", 1)[0] for f in self.files})
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "path": self.path,
+            "partition_by": list(self.partition_by),
+            "compression": self.compression,
+            "records": self.records,
+            "bytes": self.bytes,
+            "files": [
+                {
+                    "path": f.path,
+                    "partition": dict(f.partition),
+                    "records": f.records,
+                    "bytes": f.bytes,
+                }
+                for f in self.files
+            ],
+        }
+
+
+class _Partition:
+    __slots__ = ("directory", "values", "chunks", "size", "records", "next_part")
+
+    def __init__(self, directory: str, values: dict[str, Optional[str]]) -> None:
+        self.directory = directory
+        self.values = values
+        self.chunks: list[bytes] = []
+        self.size = 0
+        self.records = 0
+        self.next_part = 0
+
+
+class PartitionedWriter:
+    """Write records as Hive-style partitioned JSON Lines files.
+
+    Args:
+        fs: Backend that receives the part files. Compressed output needs a
+            backend with ``write_bytes`` (`LakeFileSystem`,
+            `AdlsLakeFileSystem`).
+        partition_by: Record fields that select the partition, outermost
+            directory first.
+        path: Directory below the filesystem's base path, e.g. ``""`` for a
+            filesystem already rooted at ``get_lake_path(...)``.
+        compression: ``None`` or ``"gzip"``.
+        target_file_bytes: Uncompressed size at which a part file is written
+            and the partition rolls over to the next part.
+        memory_budget: Cap on buffered plus in-flight (uncompressed) bytes.
+        max_workers: Concurrent uploads.
+        keep_partition_columns: Keep the partition fields in the records; by
+            default they are dropped, as the path already holds them.
+        manifest_path: If set, `close` also writes the manifest as JSON to
+            this path (relative to ``path``).
+
+    Part numbers start at ``00000`` in every partition, so writing twice to
+    the same path overwrites earlier parts.
+    """
+
+    def __init__(
+        self,
+        fs: LakeFileSystemProtocol,
+        partition_by: Sequence[str],
+        path: str = "",
+        compression: Optional[str] = None,
+        target_file_bytes: int = DEFAULT_TARGET_FILE_BYTES,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        max_workers: int = 4,
+        keep_partition_columns: bool = False,
+        manifest_path: Optional[str] = None,
+    ) -> None:
+        if not partition_by:
+            raise ValueError("partition_by must name at least one field")
+        if compression not in _COMPRESSION_SUFFIX:
+            raise ValueError(
+                f"Unsupported compression {compression!r}; use None or 'gzip'"
+            )
+        if compression and not hasattr(fs, "write_bytes"):
+            raise ValueError(
+                f"Compressed output needs a backend with write_bytes, "
+                f"got {type(fs).__name__}"
+            )
+        self.fs = fs
+        self.partition_by = tuple(partition_by)
+        self.path = path.strip("/")
+        self.compression = compression
+        self.target_file_bytes = target_file_bytes
+        self.memory_budget = memory_budget
+        self.max_workers = max_workers
+        self.keep_partition_columns = keep_partition_columns
+        self.manifest_path = manifest_path
+        self.manifest: Optional[PartitionManifest] = None
+        self._suffix = ".jsonl" + _COMPRESSION_SUFFIX[compression]
+        self._cond = threading.Condition()
+        # Keyed by partition directory, so values with the same text (``1``
+        # and ``"1"``) share one partition and one part-number sequence
+        self._partitions: dict[str, _Partition] = {}
+        self._buffered = 0
+        self._in_flight = 0
+        self._uploads = 0
+        self._files: list[PartitionFile] = []
+        self._errors: list[tuple[str, BaseException]] = []
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._closed = False
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def write(self, record: Mapping[str, Any]) -> None:
+        """Buffer one record; may block while the memory budget is used up.
+
+        Raises the first failed upload, if any, instead of buffering more.
+        """
+        key = tuple(record.get(col) for col in self.partition_by)
+        directory = "/".join(
+            f"{_escape_text(col)}={_escape(value)}"
+            for col, value in zip(self.partition_by, key, strict=True)
+        )
+        if not self.keep_partition_columns:
+            record = {k: v for k, v in record.items() if k not in self.partition_by}
+        data = (json.dumps(record, default=str) + "\n").encode("utf-8")
+        size = len(data)
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("PartitionedWriter is closed")
+            if self._errors:
+                self._raise_errors()
+            part = self._partitions.get(directory)
+            if part is None:
+                part = self._open(directory, key)
+            part.chunks.append(data)
+            part.size += size
+            part.records += 1
+            self._buffered += size
+            if part.size >= self.target_file_bytes:
+                self._submit(part)
+            self._enforce_budget()
+
+    def write_many(self, records: Iterable[Mapping[str, Any]]) -> None:
+        """`write` every record of *records*."""
+        for record in records:
+            self.write(record)
+
+    @traced("lake.partitioned.close")
+    def close(self) -> PartitionManifest:
+        """Write all buffers, wait for the uploads and return the manifest.
+
+        Raises the first failed upload (with a note naming the file) instead
+        of returning a manifest.
+        """
+        with self._cond:
+            if self.manifest is not None:
+                return self.manifest
+            self._closed = True
+            for part in self._partitions.values():
+                if part.records:
+                    self._submit(part)
+            while self._uploads:
+                self._cond.wait()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        if self._errors:
+            self._raise_errors()
+
+        manifest = PartitionManifest(
+            path=self.path,
+            partition_by=self.partition_by,
+            compression=self.compression,
+            files=tuple(sorted(self._files, key=lambda f: f.path)),
+        )
+        if self.manifest_path:
+            self.fs.write_json(self._join(self.manifest_path), manifest.to_dict())
+        self.manifest = manifest
+        return manifest
+
+    def __enter__(self) -> PartitionedWriter:
+        return self
+
+    def abort(self) -> None:
+        """Drop buffered records and wait for uploads already in flight.
+
+        No further part files and no manifest are written; parts uploaded so
+        far stay in place. Upload errors are logged, not raised.
+        """
+        with self._cond:
+            if self.manifest is not None:
+                return
+            self._closed = True
+            for part in self._partitions.values():
+                part.chunks, part.size, part.records = [], 0, 0
+            self._buffered = 0
+            while self._uploads:
+                self._cond.wait()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        for path, exc in self._errors:
+            logger.warning("Partitioned lake write to %r failed: %s", path, exc)
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            # Do not write a partial result or mask the body's exception
+            self.abort()
+
+    # ------------------------------------------------------------------
+    # Buffers (called under the lock)
+    # ------------------------------------------------------------------
+
+    def _join(self, path: str) -> str:
+        return f"{self.path}/{path}" if self.path else path
+
+    def _open(self, directory: str, key: tuple[Any, ...]) -> _Partition:
+        values = {
+            col: None if value is None else str(value)
+            for col, value in zip(self.partition_by, key, strict=True)
+        }
+        part = self._partitions[directory] = _Partition(directory, values)
+        return part
+
+    def _enforce_budget(self) -> None:
+        while self._buffered + self._in_flight > self.memory_budget:
+            if self._buffered and (
+                not self._in_flight or 2 * self._buffered >= self.memory_budget
+            ):
+                self._submit(max(self._partitions.values(), key=lambda p: p.size))
+            else:
+                self._cond.wait()
+
+    def _submit(self, part: _Partition) -> None:
+        data = b"".join(part.chunks)
+        path = self._join(f"{part.directory}/part-{part.next_part:05d}{self._suffix}")
+        records = part.records
+        part.chunks = []
+        part.next_part += 1
+        part.records = 0
+        self._buffered -= part.size
+        self._in_flight += part.size
+        part.size = 0
+        self._uploads += 1
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="lake-partition"
+            )
+        self._pool.submit(self._upload, path, part.values, data, records)
+
+    def _raise_errors(self) -> None:
+        path, exc = self._errors[0]
+        note = f"Partitioned lake write to {path!r} failed"
+        if len(self._errors) > 1:
+            note += f" (and {len(self._errors) - 1} more)"
+        if note not in getattr(exc, "__notes__", ()):
+            exc.add_note(note)
+        raise exc
+
+    # ------------------------------------------------------------------
+    # Uploads (worker threads)
+    # ------------------------------------------------------------------
+
+    def _upload(
+        self,
+        path: str,
+        partition: dict[str, Optional[str]],
+        data: bytes,
+        records: int,
+    ) -> None:
+        size = len(data)
+        error: Optional[BaseException] = None
+        written = 0
+        try:
+            if self.compression == "gzip":
+                payload = gzip.compress(data, mtime=0)
+                self.fs.write_bytes(path, payload)  # type: ignore[attr-defined]
+                written = len(payload)
+            else:
+                self.fs.write_text(path, data.decode("utf-8"))
+                written = size
+        except BaseException as exc:
+            error = exc
+        with self._cond:
+            self._in_flight -= size
+            self._uploads -= 1
+            if error is None:
+                self._files.append(PartitionFile(path, partition, records, written))
+            else:
+                self._errors.append((path, error))
+            self._cond.notify_all()
+
+
+__all__ = ["PartitionFile", "PartitionManifest", "PartitionedWriter"]
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import Any, Protocol, runtime_checkable
+from typing import Any, Iterable, Protocol, runtime_checkable
 
 logger = logging.getLogger(__name__)
 
@@ -20,10 +20,11 @@ class LakeFileSystemProtocol(Protocol):
         def ingest(fs: LakeFileSystemProtocol, path: str) -> dict: ...
 
     Subclasses that explicitly inherit from this protocol get the
-    concrete ``read_json``, ``write_json``, and ``_resolve``
-    implementations for free — only the four primitives
-    (``read_text``, ``write_text``, ``exists``, ``delete``)
-    need to be provided by each backend.
+    concrete ``read_json``, ``write_json``, ``append_text``,
+    ``append_jsonl`` and ``_resolve`` implementations for free — only the
+    four primitives (``read_text``, ``write_text``, ``exists``, ``delete``)
+    need to be provided by each backend. Backends with native appends
+    override ``append_text``.
     """
 
     _base_path: str
@@ -71,3 +72,21 @@ class LakeFileSystemProtocol(Protocol):
     def write_json(self, path: str, data: JSONValue, indent: int = 2) -> None:
         """Write a JSON file."""
         self.write_text(path, json.dumps(data, indent=indent, default=str))
+
+    # -- appends; the default rewrites the file, backends override it --
+
+    def append_text(self, path: str, content: str) -> None:
+        """Append UTF-8 text to a file, creating it if needed.
+
+        This fallback reads and rewrites the whole file; the built-in backends
+        append natively in O(appended bytes).
+        """
+        self.write_text(path, (self.read_text(path) or "") + content)
+
+    def append_jsonl(self, path: str, records: JSONValue | Iterable[JSONValue]) -> None:
+        """Append one record (a dict) or many as JSON Lines, in a single append."""
+        if isinstance(records, dict):
+            records = [records]
+        lines = "".join(json.dumps(r, default=str) + "\n" for r in records)
+        if lines:
+            self.append_text(path, lines)
@@ -0,0 +1,238 @@
+"""LakeRouter - filesystem instances for the layers of a config.
+
+Maps the lake (or work) path of each layer of a `CorePipelineConfig`, or the
+layer roots of an `InfraContext`, to a ready-to-use filesystem rooted at that
+path. Instances are cached per path, and all instances for one storage
+account share one underlying client, so a job over hundreds of tables opens a
+handful of connections instead of one per table and layer.
+
+The backend is chosen per config from the infrastructure variables:
+
+- ``datalake_backend`` set to ``local``, ``adls`` or ``fsspec``, or else
+- ``local`` when ``datalake_mount_root`` is set, or else
+- ``adls`` when ``datalake_name`` is set, or else
+- ``local``.
+
+The first segment of a lake path is its container (``datalake_container_name``,
+or the layer in layer-as-container mode). Backends map it as follows:
+
+- ``local``: ``{datalake_mount_root}/{container}/...``; the root defaults to
+  ``/dbfs/mnt``, i.e. containers mounted at ``/mnt/<container>``.
+- ``adls``: `AdlsLakeFileSystem` on ``https://{datalake_name}.dfs.core.windows.net``.
+- ``fsspec``: `LakeFileSystem` over an fsspec protocol (default ``abfs``) with
+  ``account_name`` set to ``datalake_name``.
+
+Variables read here shape storage endpoints and paths, so they cannot be
+``kv://`` Key Vault references (see `config.paths.path_variable`).
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Mapping, Optional
+
+from ..config.enums import CoreParam
+from ..config.models import CorePipelineConfig, InfraContext
+from ..config.paths import LAYERS, path_variable
+from .hedging import HedgePolicy, Hedger, shared_hedger
+from .protocols import LakeFileSystemProtocol
+
+BACKENDS = ("local", "adls", "fsspec")
+DEFAULT_MOUNT_ROOT = "/dbfs/mnt"
+
+_CONTAINER_KEY = CoreParam.DATALAKE_CONTAINER_NAME.value
+
+
+class LakeRouter:
+    """Cached, shared filesystem instances per layer.
+
+    Args:
+        backend: Force a backend instead of reading ``datalake_backend``.
+        mount_root: Local mount root; overrides ``datalake_mount_root``.
+        credential: Azure credential for the ADLS backend; defaults to the
+            shared ``dataorc_utils.azure.get_credential()``.
+        protocol: fsspec protocol for the ``fsspec`` backend.
+        storage_options: Extra fsspec options for the ``fsspec`` backend.
+        hedging: Hedge idempotent ADLS requests (``True`` or a `HedgePolicy`)
+            with the process-wide `shared_hedger` for the policy.
+
+    Example::
+
+        router = LakeRouter()
+        silver = router.get(config, "silver")
+        silver.write_json("_meta/run.json", {...})
+        work = router.get(config, "silver", work=True)
+    """
+
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        mount_root: Optional[str] = None,
+        credential: Any | None = None,
+        protocol: str = "abfs",
+        storage_options: Optional[Mapping[str, Any]] = None,
+        hedging: HedgePolicy | bool | None = None,
+    ) -> None:
+        if backend is not None and backend not in BACKENDS:
+            raise ValueError(f"Unknown lake backend {backend!r}; expected {BACKENDS}")
+        self.backend = backend
+        self.mount_root = mount_root
+        self.credential = credential
+        self.protocol = protocol
+        self.storage_options = dict(storage_options or {})
+        if isinstance(hedging, HedgePolicy):
+            self.hedger: Optional[Hedger] = shared_hedger(hedging)
+        else:
+            self.hedger = shared_hedger() if hedging else None
+        self._lock = threading.Lock()
+        self._instances: dict[tuple[str, str, str], LakeFileSystemProtocol] = {}
+        self._clients: dict[tuple[str, str], Any] = {}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(
+        self,
+        target: CorePipelineConfig | InfraContext,
+        layer: str,
+        work: bool = False,
+    ) -> LakeFileSystemProtocol:
+        """Filesystem rooted at *layer*'s path.
+
+        For a `CorePipelineConfig` this is the layer's lake path (or work
+        path with ``work=True``); for an `InfraContext` it is the layer root.
+        """
+        if isinstance(target, CorePipelineConfig):
+            env_vars = target.env_vars
+            path = target.get_work_path(layer) if work else target.get_lake_path(layer)
+        else:
+            if work:
+                raise ValueError(
+                    "Work paths need a CorePipelineConfig, not InfraContext"
+                )
+            env_vars = target.variables
+            container = path_variable(env_vars, _CONTAINER_KEY)
+            path = f"{container}/{layer}" if container else layer
+        return self.for_path(env_vars, path)
+
+    def layers(
+        self, target: CorePipelineConfig | InfraContext, work: bool = False
+    ) -> dict[str, LakeFileSystemProtocol]:
+        """`get` for every layer."""
+        return {layer: self.get(target, layer, work=work) for layer in LAYERS}
+
+    def for_path(
+        self, env_vars: Mapping[str, str], path: str
+    ) -> LakeFileSystemProtocol:
+        """Filesystem rooted at a lake *path* (``container/...``)."""
+        backend = self.resolve_backend(env_vars)
+        account = path_variable(env_vars, CoreParam.DATALAKE_NAME.value)
+        path = path.strip("/")
+        if backend == "local":
+            root = (
+                self.mount_root
+                or path_variable(env_vars, CoreParam.DATALAKE_MOUNT_ROOT.value)
+                or DEFAULT_MOUNT_ROOT
+            )
+            path = f"{root.rstrip('/')}/{path}"
+        key = (backend, account, path)
+        instance = self._instances.get(key)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(key)
+                if instance is None:
+                    instance = self._build(backend, account, path)
+                    self._instances[key] = instance
+        return instance
+
+    def resolve_backend(self, env_vars: Mapping[str, str]) -> str:
+        """Backend name for a set of infrastructure variables."""
+        backend = self.backend or path_variable(
+            env_vars, CoreParam.DATALAKE_BACKEND.value
+        )
+        if backend:
+            if backend not in BACKENDS:
+                raise ValueError(
+                    f"Unknown lake backend {backend!r}; expected {BACKENDS}"
+                )
+            return backend
+        if self.mount_root or path_variable(
+            env_vars, CoreParam.DATALAKE_MOUNT_ROOT.value
+        ):
+            return "local"
+        if path_variable(env_vars, CoreParam.DATALAKE_NAME.value):
+            return "adls"
+        return "local"
+
+    def clear(self) -> None:
+        """Drop cached instances and clients."""
+        with self._lock:
+            self._instances.clear()
+            self._clients.clear()
+
+    def __len__(self) -> int:
+        """Number of cached filesystem instances."""
+        return len(self._instances)
+
+    # ------------------------------------------------------------------
+    # Backends
+    # ------------------------------------------------------------------
+
+    def _build(self, backend: str, account: str, path: str) -> LakeFileSystemProtocol:
+        if backend == "local":
+            from .filesystem import LakeFileSystem
+
+            # path already includes the mount root
+            return LakeFileSystem(base_path=path, filesystem=self._client("local", ""))
+
+        if not account:
+            raise ValueError(f"datalake_name must be set for the {backend!r} backend")
+        container, _, base_path = path.partition("/")
+
+        if backend == "adls":
+            from .adls_filesystem import AdlsLakeFileSystem
+
+            return AdlsLakeFileSystem(
+                account_url=f"https://{account}.dfs.core.windows.net",
+                container=container,
+                base_path=base_path,
+                credential=self.credential,
+                service_client=self._client("adls", account),
+                hedging=self.hedger,
+            )
+
+        from .filesystem import LakeFileSystem
+
+        return LakeFileSystem(
+            base_path=path,
+            filesystem=self._client("fsspec", account),
+        )
+
+    def _client(self, backend: str, account: str) -> Any:
+        """Shared client per backend and account (called under the lock)."""
+        key = (backend, account)
+        client = self._clients.get(key)
+        if client is None:
+            client = self._clients[key] = self._new_client(backend, account)
+        return client
+
+    def _new_client(self, backend: str, account: str) -> Any:
+        import fsspec
+
+        if backend == "local":
+            return fsspec.filesystem("file")
+        if backend == "adls":
+            from azure.storage.filedatalake import DataLakeServiceClient
+
+            from ..azure.credentials import get_credential
+
+            return DataLakeServiceClient(
+                account_url=f"https://{account}.dfs.core.windows.net",
+                credential=self.credential or get_credential(),
+            )
+        options = {"account_name": account, **self.storage_options}
+        return fsspec.filesystem(self.protocol, **options)
+
+
+__all__ = ["BACKENDS", "DEFAULT_MOUNT_ROOT", "LakeRouter"]
@@ -0,0 +1,399 @@
+"""Wait for upstream outputs to arrive in the lake.
+
+`wait_for_paths` replaces ``while not fs.exists(path): time.sleep(...)``
+loops. Each poll:
+
+- checks every outstanding path in one round, concurrently;
+- lists a directory once instead of checking its files one by one when
+  ``list_threshold`` or more outstanding paths share it;
+- treats a file as arrived only once its size and ETag (modification time
+  for local files) are unchanged between consecutive polls, so files that
+  are still being written are not picked up.
+
+Polls back off exponentially with jitter, so many waiting jobs spread their
+requests instead of checking in lockstep.
+
+Conditions combine paths with `AllOf` and `AnyOf`; `Marker` waits for a
+``_SUCCESS`` file, which needs no stability check as it is written last::
+
+    wait_for_paths(fs, [Marker("bronze/orders"), AnyOf("a.json", "b.json")])
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+
+from ..tracing import traced
+from .filesystem import LakeFileSystem
+from .protocols import LakeFileSystemProtocol
+
+logger = logging.getLogger(__name__)
+
+# What a poll saw of a path: (size, etag or mtime); None when missing
+_State = Optional[tuple[Any, Any]]
+
+
+class Marker:
+    """Completion marker file (``<directory>/_SUCCESS`` by default).
+
+    The marker only has to exist; it is not checked for stability.
+    """
+
+    def __init__(self, directory: str, name: str = "_SUCCESS") -> None:
+        directory = directory.rstrip("/")
+        self.path = f"{directory}/{name}" if directory else name
+
+    def _leaves(self) -> Iterator[tuple[str, bool]]:
+        yield self.path, False
+
+    def _met(self, ready: set[str]) -> bool:
+        return self.path in ready
+
+    def __repr__(self) -> str:
+        return f"Marker({self.path!r})"
+
+
+class AllOf:
+    """Met when every condition is met; paths are plain strings."""
+
+    def __init__(self, *conditions: Condition) -> None:
+        self.conditions = tuple(conditions)
+
+    def _leaves(self) -> Iterator[tuple[str, bool]]:
+        for condition in self.conditions:
+            yield from _leaves(condition)
+
+    def _met(self, ready: set[str]) -> bool:
+        return all(_met(c, ready) for c in self.conditions)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(map(repr, self.conditions))})"
+
+
+class AnyOf(AllOf):
+    """Met when at least one condition is met."""
+
+    def _met(self, ready: set[str]) -> bool:
+        return any(_met(c, ready) for c in self.conditions)
+
+
+Condition = Union[str, Marker, AllOf]
+
+
+def _leaves(condition: Condition) -> Iterator[tuple[str, bool]]:
+    """(path, needs stability check) pairs of *condition*."""
+    if isinstance(condition, str):
+        yield condition, True
+    else:
+        yield from condition._leaves()
+
+
+def _met(condition: Condition, ready: set[str]) -> bool:
+    if isinstance(condition, str):
+        return condition in ready
+    return condition._met(ready)
+
+
+# ---------------------------------------------------------------------------
+# Backend probes
+# ---------------------------------------------------------------------------
+
+
+def _probes(
+    fs: LakeFileSystemProtocol,
+) -> tuple[
+    Callable[[str], _State], Optional[Callable[[str], dict[str, tuple[Any, Any]]]]
+]:
+    """``(stat, list_dir)`` for *fs*; ``list_dir`` maps child name -> state."""
+    # An AdlsLakeFileSystem instance implies its module is loaded; looking it
+    # up there avoids importing the Azure SDK for other backends
+    adls = sys.modules.get("dataorc_utils.lake.adls_filesystem")
+    if adls is not None and isinstance(fs, adls.AdlsLakeFileSystem):
+        from azure.core.exceptions import ResourceNotFoundError
+
+        fs_client = fs._fs_client
+
+        def adls_stat(path: str) -> _State:
+            file_client = fs_client.get_file_client(fs._resolve(path))
+            try:
+                props = fs._idempotent("exists", file_client.get_file_properties)
+            except ResourceNotFoundError:
+                return None
+            return props.size, props.etag
+
+        def adls_list(directory: str) -> dict[str, tuple[Any, Any]]:
+            resolved = fs._resolve(directory).rstrip("/")
+            try:
+                return {
+                    p.name.rsplit("/", 1)[-1]: (p.content_length, p.etag)
+                    for p in fs_client.get_paths(path=resolved or None, recursive=False)
+                }
+            except ResourceNotFoundError:
+                return {}
+
+        return adls_stat, adls_list
+
+    if isinstance(fs, LakeFileSystem):
+
+        def _state(info: dict[str, Any]) -> tuple[Any, Any]:
+            tag = info.get("etag") or info.get("mtime") or info.get("last_modified")
+            return info.get("size"), tag
+
+        def fsspec_stat(path: str) -> _State:
+            try:
+                return _state(fs.fs.info(fs._resolve(path)))
+            except FileNotFoundError:
+                return None
+
+        def fsspec_list(directory: str) -> dict[str, tuple[Any, Any]]:
+            try:
+                entries = fs.fs.ls(fs._resolve(directory), detail=True)
+            except FileNotFoundError:
+                return {}
+            return {
+                e["name"].rstrip("/").rsplit("/", 1)[-1]: _state(e) for e in entries
+            }
+
+        return fsspec_stat, fsspec_list
+
+    # Any other backend: existence only, so stability cannot be observed
+    def exists_stat(path: str) -> _State:
+        return (None, None) if fs.exists(path) else None
+
+    return exists_stat, None
+
+
+# ---------------------------------------------------------------------------
+# Polling
+# ---------------------------------------------------------------------------
+
+
+class _Poller:
+    """Shared state of one wait; `poll` runs one round of checks."""
+
+    def __init__(
+        self,
+        fs: LakeFileSystemProtocol,
+        condition: Condition,
+        stable_polls: int,
+        list_threshold: int,
+        max_workers: int,
+    ) -> None:
+        self.condition = condition
+        self.stable_polls = stable_polls
+        self.list_threshold = list_threshold
+        self.max_workers = max_workers
+        self.stat, self.list_dir = _probes(fs)
+        self.stable: dict[str, bool] = {}
+        for path, stable in _leaves(condition):
+            self.stable[path] = self.stable.get(path, False) or stable
+        self.ready: set[str] = set()
+        self.seen: dict[str, tuple[Any, Any]] = {}
+        self.unchanged: dict[str, int] = {}
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def met(self) -> bool:
+        return _met(self.condition, self.ready)
+
+    def missing(self) -> list[str]:
+        return sorted(p for p in self.stable if p not in self.ready)
+
+    def poll(self) -> bool:
+        """Check every outstanding path once; True if something changed."""
+        states = self._observe(self.missing())
+        changed = False
+        for path, state in states.items():
+            previous = self.seen.get(path)
+            if state is None:
+                changed |= self.seen.pop(path, None) is not None
+                self.unchanged.pop(path, None)
+                continue
+            if state == previous:
+                self.unchanged[path] = self.unchanged.get(path, 0) + 1
+            else:
+                self.seen[path] = state
+                self.unchanged[path] = 0
+                changed = True
+            if not self.stable[path] or self.unchanged[path] >= self.stable_polls:
+                self.ready.add(path)
+        return changed
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    def _observe(self, paths: list[str]) -> dict[str, _State]:
+        by_dir: dict[str, list[str]] = {}
+        for path in paths:
+            directory = path.rsplit("/", 1)[0] if "/" in path else ""
+            by_dir.setdefault(directory, []).append(path)
+
+        jobs: list[tuple[Callable[[], Any], list[str], bool]] = []
+        for directory, members in by_dir.items():
+            if self.list_dir is not None and len(members) >= self.list_threshold:
+                jobs.append((lambda d=directory: self.list_dir(d), members, True))
+            else:
+                jobs.extend(((lambda p=p: self.stat(p)), [p], False) for p in members)
+        if not jobs:
+            return {}
+
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="lake-sensor"
+            )
+        futures = [self._pool.submit(fn) for fn, _, _ in jobs]
+        states: dict[str, _State] = {}
+        for future, (_, members, listed) in zip(futures, jobs, strict=True):
+            try:
+                result = future.result()
+            except Exception:
+                logger.warning("Lake check of %s failed", members, exc_info=True)
+                continue
+            if listed:
+                for path in members:
+                    states[path] = result.get(path.rsplit("/", 1)[-1])
+            else:
+                states[members[0]] = result
+        return states
+
+
+def _condition(paths: Union[Condition, Iterable[Condition]], mode: str) -> Condition:
+    if isinstance(paths, (str, Marker, AllOf)):
+        return paths
+    conditions = tuple(paths)
+    if mode == "all":
+        return AllOf(*conditions)
+    if mode == "any":
+        return AnyOf(*conditions)
+    raise ValueError(f"mode must be 'all' or 'any', got {mode!r}")
+
+
+class _Backoff:
+    """Exponential delays with jitter; reset while paths are settling."""
+
+    def __init__(self, initial: float, maximum: float, factor: float) -> None:
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.current = initial
+
+    def next(self, changed: bool, deadline: Optional[float]) -> float:
+        if changed:
+            self.current = self.initial
+        delay = self.current * random.uniform(0.5, 1.5)
+        self.current = min(self.current * self.factor, self.maximum)
+        if deadline is not None:
+            delay = min(delay, max(deadline - time.monotonic(), 0.0))
+        return delay
+
+
+def _timeout_error(poller: _Poller, timeout: Optional[float]) -> TimeoutError:
+    return TimeoutError(
+        f"Timed out after {timeout}s waiting for {poller.condition!r}; "
+        f"not ready: {', '.join(poller.missing())}"
+    )
+
+
+@traced("lake.wait_for_paths")
+def wait_for_paths(
+    fs: LakeFileSystemProtocol,
+    paths: Union[Condition, Iterable[Condition]],
+    timeout: Optional[float] = None,
+    mode: str = "all",
+    poll_interval: float = 1.0,
+    max_interval: float = 60.0,
+    backoff: float = 2.0,
+    stable_polls: int = 1,
+    list_threshold: int = 4,
+    max_workers: int = 8,
+) -> list[str]:
+    """Block until the paths (or a combined condition) are present and stable.
+
+    Args:
+        fs: Filesystem the paths are relative to.
+        paths: A path, a `Marker`, an `AllOf` / `AnyOf` condition, or an
+            iterable of them combined according to ``mode``.
+        timeout: Seconds to wait; ``None`` waits forever.
+        mode: ``"all"`` or ``"any"`` for an iterable of conditions.
+        poll_interval: First delay between polls, in seconds.
+        max_interval: Upper bound of the delay.
+        backoff: Factor applied to the delay after each poll without change.
+        stable_polls: Consecutive polls a file's size and ETag must stay the
+            same before it counts; ``0`` accepts files on first sight.
+        list_threshold: Outstanding paths in one directory from which the
+            directory is listed instead of checking each path.
+        max_workers: Concurrent checks per poll.
+
+    Returns:
+        The paths that were ready when the condition was met, sorted.
+
+    Raises:
+        TimeoutError: If the condition is not met within ``timeout``; the
+            message lists the paths that were not ready.
+    """
+    poller = _Poller(
+        fs, _condition(paths, mode), stable_polls, list_threshold, max_workers
+    )
+    delays = _Backoff(poll_interval, max_interval, backoff)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    try:
+        while True:
+            changed = poller.poll()
+            if poller.met():
+                return sorted(poller.ready)
+            if deadline is not None and time.monotonic() >= deadline:
+                raise _timeout_error(poller, timeout)
+            time.sleep(delays.next(changed, deadline))
+    finally:
+        poller.close()
+
+
+@traced("lake.wait_for_paths_async")
+async def wait_for_paths_async(
+    fs: LakeFileSystemProtocol,
+    paths: Union[Condition, Iterable[Condition]],
+    timeout: Optional[float] = None,
+    mode: str = "all",
+    poll_interval: float = 1.0,
+    max_interval: float = 60.0,
+    backoff: float = 2.0,
+    stable_polls: int = 1,
+    list_threshold: int = 4,
+    max_workers: int = 8,
+) -> list[str]:
+    """Async `wait_for_paths`: checks run in a worker thread, sleeps yield.
+
+    Takes the same arguments and raises the same errors as `wait_for_paths`.
+    """
+    poller = _Poller(
+        fs, _condition(paths, mode), stable_polls, list_threshold, max_workers
+    )
+    delays = _Backoff(poll_interval, max_interval, backoff)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    try:
+        while True:
+            changed = await asyncio.to_thread(poller.poll)
+            if poller.met():
+                return sorted(poller.ready)
+            if deadline is not None and time.monotonic() >= deadline:
+                raise _timeout_error(poller, timeout)
+            await asyncio.sleep(delays.next(changed, deadline))
+    finally:
+        poller.close()
+
+
+__all__ = [
+    "AllOf",
+    "AnyOf",
+    "Condition",
+    "Marker",
+    "wait_for_paths",
+    "wait_for_paths_async",
+]
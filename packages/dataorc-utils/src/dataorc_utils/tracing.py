@@ -0,0 +1,481 @@
+"""Run-level tracing spans for dataorc_utils.
+
+Records a timeline of where a job's time goes: credentials, Key Vault calls
+and retry backoff, mounts, config building and lake I/O. The package's public
+entry points are instrumented; add your own spans with `span` or `traced`.
+
+Tracing is off by default. When disabled, `span` returns a shared no-op
+object and `traced` functions call straight through after one flag check.
+
+Enable it in code with `enable`, or set ``DATAORC_TRACE=1`` in the
+environment (``DATAORC_TRACE=memory`` also captures ``tracemalloc`` peaks).
+Only the most recent ``max_spans`` spans are kept, so long-running jobs do
+not grow without bound.
+
+Example::
+
+    from dataorc_utils import tracing
+
+    tracing.enable()
+    with tracing.span("job.startup"):
+        config = manager.build_core_config(...)
+    trace = tracing.get_trace()
+    print(trace.summary())
+    trace.save(router.get(config, "bronze", work=True))  # _trace/<run>.json
+
+The exported Chrome trace format opens in ``chrome://tracing`` and Perfetto.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional, TypeVar
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .lake.protocols import LakeFileSystemProtocol
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+TRACE_ENV_VAR = "DATAORC_TRACE"
+DEFAULT_MAX_SPANS = 100_000
+
+
+@dataclass(slots=True)
+class SpanRecord:
+    """One finished span.
+
+    Attributes:
+        name: Span name, e.g. ``"keyvault.get_secret"``.
+        start_ns: Start, in ns since the run started (monotonic clock).
+        duration_ns: Wall-clock duration in ns.
+        span_id: Unique within the run.
+        parent_id: Enclosing span in the same thread or task, or ``None``.
+        thread_id: Native id of the thread the span ran in.
+        attrs: Attributes given to the span.
+        error: Exception type name if the span exited with an exception.
+        memory_peak: Peak ``tracemalloc`` growth in bytes, when captured
+            (main thread only).
+    """
+
+    name: str
+    start_ns: int
+    duration_ns: int
+    span_id: int
+    parent_id: Optional[int]
+    thread_id: int
+    attrs: dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    memory_peak: Optional[int] = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "duration_ns": self.duration_ns,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "thread_id": self.thread_id,
+            "attrs": self.attrs,
+            "error": self.error,
+            "memory_peak": self.memory_peak,
+        }
+
+
+def _new_run_id() -> str:
+    return os.urandom(6).hex()
+
+
+class _State:
+    __slots__ = (
+        "enabled",
+        "memory",
+        "owns_tracemalloc",
+        "run_id",
+        "origin_ns",
+        "wall_origin",
+        "spans",
+        "dropped",
+    )
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.memory = False
+        self.owns_tracemalloc = False
+        self.run_id = _new_run_id()
+        self.origin_ns = time.perf_counter_ns()
+        self.wall_origin = time.time()
+        self.spans: deque[SpanRecord] = deque(maxlen=DEFAULT_MAX_SPANS)
+        self.dropped = 0
+
+
+_state = _State()
+_ids = iter(range(1, 1 << 62))
+_ids_lock = threading.Lock()
+
+
+def _next_id() -> int:
+    with _ids_lock:
+        return next(_ids)
+
+
+class _NoopSpan:
+    """Returned by `span` while tracing is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> _NoopSpan:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+    def set(self, **attrs: Any) -> None:
+        """Ignore attributes."""
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = (
+        "name",
+        "attrs",
+        "span_id",
+        "parent",
+        "start_ns",
+        "token",
+        "mem_base",
+        "mem_peak",
+    )
+
+    def __init__(self, name: str, attrs: dict[str, Any]) -> None:
+        self.name = name
+        self.attrs = attrs
+        self.span_id = _next_id()
+        self.parent: Optional[_Span] = None
+        self.start_ns = 0
+        self.token: Any = None
+        self.mem_base: Optional[int] = None
+        self.mem_peak = 0
+
+    def set(self, **attrs: Any) -> None:
+        """Add attributes while the span is open."""
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> _Span:
+        self.parent = _current.get()
+        self.token = _current.set(self)
+        # The tracemalloc peak is process-global: resetting it from other
+        # threads would corrupt each other's readings
+        if _state.memory and threading.current_thread() is threading.main_thread():
+            import tracemalloc
+
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+                self.mem_base = tracemalloc.get_traced_memory()[0]
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        end = time.perf_counter_ns()
+        _current.reset(self.token)
+        memory_peak = None
+        if self.mem_base is not None:
+            import tracemalloc
+
+            # Children reset the peak, so fold their absolute peaks in
+            peak = max(tracemalloc.get_traced_memory()[1], self.mem_peak)
+            memory_peak = max(peak - self.mem_base, 0)
+            if self.parent is not None:
+                self.parent.mem_peak = max(self.parent.mem_peak, peak)
+        spans = _state.spans
+        if len(spans) == spans.maxlen:
+            _state.dropped += 1
+        spans.append(
+            SpanRecord(
+                name=self.name,
+                start_ns=self.start_ns - _state.origin_ns,
+                duration_ns=end - self.start_ns,
+                span_id=self.span_id,
+                parent_id=self.parent.span_id if self.parent else None,
+                thread_id=threading.get_native_id(),
+                attrs=self.attrs,
+                error=exc_type.__name__ if exc_type is not None else None,
+                memory_peak=memory_peak,
+            )
+        )
+
+
+_current: contextvars.ContextVar[Optional[_Span]] = contextvars.ContextVar(
+    "dataorc_trace_span", default=None
+)
+
+
+# ----------------------------------------------------------------------
+# Control
+# ----------------------------------------------------------------------
+
+
+def enable(memory: bool = False, max_spans: Optional[int] = None) -> None:
+    """Start recording spans; ``memory=True`` also captures tracemalloc peaks.
+
+    Memory capture starts ``tracemalloc`` if needed, which slows allocation
+    heavy code noticeably; use it for investigations, not routinely. The
+    ``tracemalloc`` peak is process-wide, so peaks are recorded for spans on
+    the main thread only, and overlapping asyncio tasks share one reading.
+
+    Args:
+        memory: Capture ``tracemalloc`` peaks.
+        max_spans: Keep at most this many spans, dropping the oldest;
+            defaults to the current limit (``DEFAULT_MAX_SPANS`` initially).
+    """
+    if memory:
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _state.owns_tracemalloc = True
+    if max_spans is not None and max_spans != _state.spans.maxlen:
+        if max_spans < 1:
+            raise ValueError("max_spans must be at least 1")
+        _state.spans = deque(_state.spans, maxlen=max_spans)
+    _state.memory = memory
+    _state.enabled = True
+
+
+def disable() -> None:
+    """Stop recording spans (recorded spans are kept until `reset`).
+
+    Stops ``tracemalloc`` if `enable` started it.
+    """
+    _state.enabled = False
+    _state.memory = False
+    if _state.owns_tracemalloc:
+        import tracemalloc
+
+        tracemalloc.stop()
+        _state.owns_tracemalloc = False
+
+
+def is_enabled() -> bool:
+    return _state.enabled
+
+
+def reset() -> None:
+    """Discard recorded spans and start a new run id and time origin."""
+    _state.run_id = _new_run_id()
+    _state.origin_ns = time.perf_counter_ns()
+    _state.wall_origin = time.time()
+    _state.spans = deque(maxlen=_state.spans.maxlen)
+    _state.dropped = 0
+
+
+# ----------------------------------------------------------------------
+# Spans
+# ----------------------------------------------------------------------
+
+
+def span(name: str, **attrs: Any) -> Any:
+    """Context manager timing a block.
+
+    Returns a no-op object while tracing is disabled. Attributes can be added
+    after entering with ``.set(key=value)``.
+    """
+    if not _state.enabled:
+        return _NOOP
+    return _Span(name, attrs)
+
+
+def traced(name: Optional[str] = None, capture: Iterable[str] = ()) -> Callable[[F], F]:
+    """Decorator recording a span per call of a function or coroutine function.
+
+    Args:
+        name: Span name; defaults to ``module.qualname``.
+        capture: Argument names whose values are recorded as span attributes.
+    """
+    capture = tuple(capture)
+
+    def decorate(fn: F) -> F:
+        span_name = name or f"{fn.__module__}.{fn.__qualname__}"
+        # Positional slots of captured arguments, read from the code object
+        # once instead of binding a signature on every call
+        code = fn.__code__
+        positional = code.co_varnames[: code.co_argcount]
+        slots = {key: positional.index(key) for key in capture if key in positional}
+        varargs = None
+        if code.co_flags & inspect.CO_VARARGS:
+            varargs = code.co_varnames[code.co_argcount + code.co_kwonlyargcount]
+
+        def attrs_for(args: tuple, kwargs: dict) -> dict[str, Any]:
+            attrs = {}
+            for key in capture:
+                if key in kwargs:
+                    attrs[key] = kwargs[key]
+                elif key in slots and slots[key] < len(args):
+                    attrs[key] = args[slots[key]]
+                elif key == varargs:
+                    attrs[key] = list(args[code.co_argcount :])
+            return attrs
+
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not _state.enabled:
+                    return await fn(*args, **kwargs)
+                with _Span(span_name, attrs_for(args, kwargs)):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _state.enabled:
+                return fn(*args, **kwargs)
+            with _Span(span_name, attrs_for(args, kwargs)):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+# ----------------------------------------------------------------------
+# Export
+# ----------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Trace:
+    """Snapshot of the spans recorded in one run.
+
+    ``dropped`` counts the oldest spans discarded to stay within
+    ``max_spans``.
+    """
+
+    run_id: str
+    started_at: float
+    spans: tuple[SpanRecord, ...]
+    dropped: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "run_id": self.run_id,
+            "started_at": self.started_at,
+            "dropped": self.dropped,
+            "spans": [s.to_dict() for s in self.spans],
+        }
+
+    def to_json(self, indent: Optional[int] = None) -> str:
+        return json.dumps(self.to_dict(), indent=indent, default=str)
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """Chrome trace event format (complete ``"X"`` events, microseconds)."""
+        pid = os.getpid()
+        events = []
+        for s in self.spans:
+            args = dict(s.attrs)
+            if s.error:
+                args["error"] = s.error
+            if s.memory_peak is not None:
+                args["memory_peak"] = s.memory_peak
+            events.append(
+                {
+                    "name": s.name,
+                    "cat": s.name.split(".", 1)[0],
+                    "ph": "X",
+                    "ts": s.start_ns / 1000,
+                    "dur": s.duration_ns / 1000,
+                    "pid": pid,
+                    "tid": s.thread_id,
+                    "args": args,
+                }
+            )
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "run_id": self.run_id,
+                "started_at": self.started_at,
+                "dropped": self.dropped,
+            },
+        }
+
+    def summary(self, limit: int = 20) -> str:
+        """Table of span names by total time, slowest first."""
+        totals: dict[str, list[int]] = {}
+        for s in self.spans:
+            entry = totals.setdefault(s.name, [0, 0, 0])
+            entry[0] += 1
+            entry[1] += s.duration_ns
+            entry[2] = max(entry[2], s.duration_ns)
+        rows = sorted(totals.items(), key=lambda item: item[1][1], reverse=True)
+        lines = [f"{'span':<40} {'calls':>6} {'total ms':>10} {'max ms':>10}"]
+        for span_name, (calls, total, longest) in rows[:limit]:
+            lines.append(
+                f"{span_name:<40} {calls:>6} {total / 1e6:>10.1f} {longest / 1e6:>10.1f}"
+            )
+        return "\n".join(lines)
+
+    def save(
+        self,
+        fs: LakeFileSystemProtocol,
+        path: Optional[str] = None,
+        chrome: bool = True,
+    ) -> str:
+        """Write the trace through *fs*, e.g. one rooted at a table's work path.
+
+        Args:
+            fs: Target filesystem.
+            path: File path; defaults to ``_trace/<run_id>.json``.
+            chrome: Write the Chrome trace format instead of `to_dict`.
+
+        Returns:
+            The path written.
+        """
+        path = path or f"_trace/{self.run_id}.json"
+        data = self.to_chrome_trace() if chrome else self.to_dict()
+        fs.write_json(path, data, indent=None)
+        return path
+
+
+def get_trace() -> Trace:
+    """Spans recorded so far in this run, in completion order."""
+    return Trace(
+        run_id=_state.run_id,
+        started_at=_state.wall_origin,
+        spans=tuple(_state.spans),
+        dropped=_state.dropped,
+    )
+
+
+def _enable_from_env() -> None:
+    value = os.environ.get(TRACE_ENV_VAR, "").strip().lower()
+    if value in ("1", "true", "yes", "on"):
+        enable()
+    elif value == "memory":
+        enable(memory=True)
+
+
+_enable_from_env()
+
+__all__ = [
+    "DEFAULT_MAX_SPANS",
+    "SpanRecord",
+    "Trace",
+    "disable",
+    "enable",
+    "get_trace",
+    "is_enabled",
+    "reset",
+    "span",
+    "traced",
+]
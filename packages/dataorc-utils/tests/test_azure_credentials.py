@@ -0,0 +1,146 @@
+"""Tests for dataorc_utils.azure.credentials."""
+
+from __future__ import annotations
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from azure.core.exceptions import ServiceRequestError
+from azure.identity import CredentialUnavailableError
+
+from dataorc_utils.azure import credentials
+from dataorc_utils.azure.credentials import (
+    KEYVAULT_SCOPE,
+    STORAGE_SCOPE,
+    PinnedChainCredential,
+)
+
+
+@pytest.fixture(autouse=True)
+def _isolated(monkeypatch, tmp_path):
+    monkeypatch.setenv("DATAORC_CREDENTIAL_CACHE_DIR", str(tmp_path))
+    credentials.reset_credentials()
+    yield
+    credentials.reset_credentials()
+
+
+def _builder(working: set[str]):
+    """Return a build function where only kinds in *working* yield tokens."""
+    built: list[str] = []
+
+    def build(kind: str, persist_tokens: bool):
+        built.append(kind)
+        cred = MagicMock(name=kind)
+        if kind in working:
+            cred.get_token.return_value = f"token-from-{kind}"
+        else:
+            cred.get_token.side_effect = CredentialUnavailableError(
+                f"{kind} unavailable"
+            )
+        return cred
+
+    return build, built
+
+
+def test_pinned_chain_probes_once_then_pins():
+    build, built = _builder({"managed_identity", "cli"})
+    cred = PinnedChainCredential(build=build)
+
+    assert cred.get_token(STORAGE_SCOPE) == "token-from-managed_identity"
+    assert cred.get_token(KEYVAULT_SCOPE) == "token-from-managed_identity"
+    assert cred.kind == "managed_identity"
+    assert built == ["environment", "workload_identity", "managed_identity"]
+
+
+def test_pin_is_shared_with_new_instances():
+    build, _ = _builder({"cli"})
+    PinnedChainCredential(build=build).get_token(STORAGE_SCOPE)
+
+    build, built = _builder({"cli"})
+    cred = PinnedChainCredential(build=build)
+
+    assert cred.kind == "cli"
+    assert cred.get_token(STORAGE_SCOPE) == "token-from-cli"
+    assert built == ["cli"]
+
+
+def test_failing_pin_falls_back_to_full_probe():
+    build, _ = _builder({"cli"})
+    PinnedChainCredential(build=build).get_token(STORAGE_SCOPE)
+
+    build, _ = _builder({"environment"})
+    cred = PinnedChainCredential(build=build)
+
+    assert cred.get_token(STORAGE_SCOPE) == "token-from-environment"
+    assert cred.kind == "environment"
+    assert credentials._read_pin() == "environment"
+
+
+def test_transient_error_keeps_the_pin():
+    build, _ = _builder({"cli"})
+    cred = PinnedChainCredential(build=build)
+    cred.get_token(STORAGE_SCOPE)
+    cred._active.get_token.side_effect = ServiceRequestError("connection reset")
+
+    with pytest.raises(ServiceRequestError):
+        cred.get_token(STORAGE_SCOPE)
+    assert cred.kind == "cli"
+    assert credentials._read_pin() == "cli"
+
+
+def test_failed_probe_credentials_are_closed():
+    build, _ = _builder({"cli"})
+    made: list[MagicMock] = []
+
+    def tracking_build(kind, persist_tokens):
+        made.append(build(kind, persist_tokens))
+        return made[-1]
+
+    cred = PinnedChainCredential(build=tracking_build)
+    cred.get_token(STORAGE_SCOPE)
+
+    assert [c.close.call_count for c in made] == [1, 1, 1, 0]
+
+
+def test_concurrent_probes_are_coalesced():
+    build, built = _builder({"cli"})
+
+    def slow_build(kind, persist_tokens):
+        time.sleep(0.01)
+        return build(kind, persist_tokens)
+
+    cred = PinnedChainCredential(build=slow_build)
+    barrier = threading.Barrier(4)
+
+    def call():
+        barrier.wait()
+        return cred.get_token(STORAGE_SCOPE)
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert built.count("cli") == 1
+
+
+def test_get_credential_is_shared_per_mode():
+    with patch("azure.identity.DefaultAzureCredential") as default_cls:
+        assert credentials.get_credential() is credentials.get_credential()
+    default_cls.assert_called_once()
+
+    fast = credentials.get_credential(fast=True)
+    assert isinstance(fast, PinnedChainCredential)
+    assert credentials.get_credential(fast=True) is fast
+
+
+def test_prefetch_tokens_requests_each_scope():
+    cred = MagicMock()
+    credentials.prefetch_tokens(credential=cred, background=False)
+    assert [c.args for c in cred.get_token.call_args_list] == [
+        (STORAGE_SCOPE,),
+        (KEYVAULT_SCOPE,),
+    ]
@@ -0,0 +1,566 @@
+"""Tests for dataorc_utils.azure.keyvault and the secret cache."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from azure.core.exceptions import ClientAuthenticationError, HttpResponseError
+
+from dataorc_utils.azure import credentials, keyvault, keyvault_async
+from dataorc_utils.azure.keyvault_async import (
+    close_keyvault_async,
+    get_keyvault_secret_async,
+    get_keyvault_secrets_async,
+)
+from dataorc_utils.azure.rate_limit import TokenBucket, retry_after_seconds
+from dataorc_utils.azure.secret_cache import SecretCache
+from dataorc_utils.config import (
+    CorePipelineConfig,
+    SecretRef,
+    parse_secret_ref,
+    prefetch_secrets,
+    print_config,
+)
+
+VAULT = "https://myvault.vault.azure.net/"
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def _reset_module_state():
+    keyvault._clear_cache()
+    keyvault.disable_secret_cache()
+    credentials.reset_credentials()
+    yield
+    keyvault._clear_cache()
+    keyvault.disable_secret_cache()
+    credentials.reset_credentials()
+
+
+@pytest.fixture
+def secret_client():
+    """Patch the Azure SDK so SecretClient.get_secret is a controllable mock."""
+    client = MagicMock()
+    client.get_secret.side_effect = lambda name, version=None: MagicMock(
+        value=f"{name}:{version or 'latest'}"
+    )
+    with (
+        patch("azure.identity.DefaultAzureCredential"),
+        patch("azure.keyvault.secrets.SecretClient", return_value=client),
+    ):
+        yield client
+
+
+# --- get_keyvault_secret ---
+
+
+def test_get_secret_without_cache_hits_vault_every_call(secret_client):
+    assert keyvault.get_keyvault_secret(VAULT, "conn") == "conn:latest"
+    assert keyvault.get_keyvault_secret(VAULT, "conn") == "conn:latest"
+    assert secret_client.get_secret.call_count == 2
+
+
+def test_get_secret_with_cache_is_served_from_memory(secret_client):
+    keyvault.configure_secret_cache(ttl=60)
+
+    for _ in range(5):
+        assert keyvault.get_keyvault_secret(VAULT, "conn") == "conn:latest"
+    assert keyvault.get_keyvault_secret(VAULT, "conn", version="abc") == "conn:abc"
+
+    assert secret_client.get_secret.call_count == 2
+
+
+def test_get_secret_use_cache_false_bypasses_cache(secret_client):
+    keyvault.configure_secret_cache(ttl=60)
+    keyvault.get_keyvault_secret(VAULT, "conn")
+    keyvault.get_keyvault_secret(VAULT, "conn", use_cache=False)
+    assert secret_client.get_secret.call_count == 2
+
+
+def test_invalidate_secret_forces_reload(secret_client):
+    keyvault.configure_secret_cache(ttl=60)
+    keyvault.get_keyvault_secret(VAULT, "conn")
+
+    assert keyvault.invalidate_secret(VAULT, "conn") == 1
+    keyvault.get_keyvault_secret(VAULT, "conn")
+
+    assert secret_client.get_secret.call_count == 2
+
+
+def test_get_secret_honours_retry_after(secret_client):
+    throttled = HttpResponseError("throttled")
+    throttled.response = MagicMock(headers={"Retry-After": "3"})
+    secret_client.get_secret.side_effect = [throttled, MagicMock(value="ok")]
+
+    with (
+        patch.object(keyvault.time, "sleep") as sleep,
+        patch.object(TokenBucket, "pause") as pause,
+    ):
+        assert keyvault.get_keyvault_secret(VAULT, "conn", retry_delay=1.0) == "ok"
+
+    pause.assert_called_once_with(3.0)
+    sleep.assert_called_once_with(3.0)
+
+
+# --- Thread safety / single-flight ---
+
+
+def test_concurrent_requests_share_one_call(secret_client):
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow_get_secret(name, version=None):
+        started.set()
+        release.wait(timeout=5)
+        return MagicMock(value="shared")
+
+    secret_client.get_secret.side_effect = slow_get_secret
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [
+            pool.submit(keyvault.get_keyvault_secret, VAULT, "conn") for _ in range(8)
+        ]
+        started.wait(timeout=5)
+        assert keyvault._inflight.in_flight() == 1
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert set(results) == {"shared"}
+    assert secret_client.get_secret.call_count < 8
+
+
+def test_concurrent_first_calls_build_one_credential():
+    barrier = threading.Barrier(8)
+
+    def get_client():
+        barrier.wait()
+        return keyvault._get_client(VAULT)
+
+    with (
+        patch("azure.identity.DefaultAzureCredential") as credential_cls,
+        patch("azure.keyvault.secrets.SecretClient") as client_cls,
+        ThreadPoolExecutor(max_workers=8) as pool,
+    ):
+        pairs = list(pool.map(lambda _: get_client(), range(8)))
+
+    assert credential_cls.call_count == 1
+    assert client_cls.call_count == 1
+    assert len({id(client) for client, _ in pairs}) == 1
+
+
+def test_clear_cache_ignores_stale_credential():
+    with (
+        patch("azure.identity.DefaultAzureCredential", side_effect=MagicMock),
+        patch("azure.keyvault.secrets.SecretClient"),
+    ):
+        _, first = keyvault._get_client(VAULT)
+        keyvault._clear_cache(stale_credential=first)
+        _, second = keyvault._get_client(VAULT)
+
+    # A late failure reported against the old credential keeps the new one
+    assert first is not second
+    keyvault._clear_cache(stale_credential=first)
+    assert keyvault._credential is second
+
+
+# --- get_keyvault_secrets ---
+
+
+def test_get_secrets_returns_values_and_errors(secret_client):
+    def get_secret(name, version=None):
+        if name == "missing":
+            raise ValueError("not found")
+        return MagicMock(value=f"{name}-value")
+
+    secret_client.get_secret.side_effect = get_secret
+
+    values, errors = keyvault.get_keyvault_secrets(
+        VAULT, ["a", "b", "a", "missing"], max_retries=1
+    )
+
+    assert values == {"a": "a-value", "b": "b-value"}
+    assert list(errors) == ["missing"]
+    assert isinstance(errors["missing"], ValueError)
+    assert secret_client.get_secret.call_count == 3
+
+
+def test_get_secrets_empty_names_makes_no_calls(secret_client):
+    assert keyvault.get_keyvault_secrets(VAULT, []) == ({}, {})
+    secret_client.get_secret.assert_not_called()
+
+
+# --- TokenBucket ---
+
+
+def test_token_bucket_waits_when_empty():
+    clock = _FakeClock()
+    slept: list[float] = []
+
+    def sleep(seconds: float) -> None:
+        slept.append(seconds)
+        clock.now += seconds
+
+    bucket = TokenBucket(rate=2, capacity=2, clock=clock, sleep=sleep)
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == pytest.approx(0.5)
+
+    bucket.pause(5)
+    assert bucket.acquire() == pytest.approx(5.5)
+    assert slept[0] == pytest.approx(0.5)
+
+
+def test_retry_after_seconds_parses_header():
+    exc = HttpResponseError("throttled")
+    exc.response = MagicMock(headers={"Retry-After": "7"})
+    assert retry_after_seconds(exc) == 7.0
+    assert retry_after_seconds(ValueError("x")) is None
+
+
+# --- SecretCache ---
+
+
+def test_cache_expires_after_ttl():
+    clock = _FakeClock()
+    cache = SecretCache(ttl=10, refresh_ahead=0, clock=clock)
+    loader = MagicMock(side_effect=["a", "b"])
+
+    assert cache.get((VAULT, "s", None), loader) == "a"
+    clock.now = 11
+    assert cache.get((VAULT, "s", None), loader) == "b"
+
+
+def test_cache_evicts_least_recently_used():
+    cache = SecretCache(ttl=10, max_size=2)
+    cache.put((VAULT, "a", None), "1")
+    cache.put((VAULT, "b", None), "2")
+    cache.get((VAULT, "a", None), MagicMock())
+    cache.put((VAULT, "c", None), "3")
+
+    assert (VAULT, "a", None) in cache
+    assert (VAULT, "b", None) not in cache
+    assert len(cache) == 2
+
+
+def test_cache_serves_stale_value_when_reload_fails():
+    clock = _FakeClock()
+    cache = SecretCache(ttl=10, refresh_ahead=0, max_stale=100, clock=clock)
+    cache.put((VAULT, "s", None), "old")
+    clock.now = 50
+
+    failing = MagicMock(side_effect=HttpResponseError("throttled"))
+    assert cache.get((VAULT, "s", None), failing) == "old"
+
+    clock.now = 200
+    with pytest.raises(HttpResponseError):
+        cache.get((VAULT, "s", None), failing)
+
+
+def test_cache_refreshes_ahead_of_expiry_in_background():
+    clock = _FakeClock()
+    cache = SecretCache(ttl=10, refresh_ahead=0.5, clock=clock)
+    cache.put((VAULT, "s", None), "old")
+    clock.now = 6
+
+    with patch.object(cache, "_start_refresh") as start:
+        assert cache.get((VAULT, "s", None), MagicMock()) == "old"
+    start.assert_called_once()
+
+    key, loader, generation = start.call_args.args
+    cache._refresh(key, lambda: "new", generation)
+    assert cache.get((VAULT, "s", None), MagicMock()) == "new"
+
+
+def test_refresh_in_flight_does_not_resurrect_invalidated_entry():
+    clock = _FakeClock()
+    cache = SecretCache(ttl=10, refresh_ahead=0.5, clock=clock)
+    key = (VAULT, "s", None)
+    cache.put(key, "old")
+    clock.now = 6
+
+    with patch.object(cache, "_start_refresh") as start:
+        cache.get(key, MagicMock())
+    _, _, generation = start.call_args.args
+
+    assert cache.invalidate(VAULT, "s") == 1
+    cache._refresh(key, lambda: "rotated-away", generation)
+    assert key not in cache
+
+    cache.put(key, "old")
+    clock.now = 12
+    with patch.object(cache, "_start_refresh") as start:
+        cache.get(key, MagicMock())
+    cache.clear()
+    assert not cache._refreshing
+    cache._refresh(key, lambda: "stale", start.call_args.args[2])
+    assert len(cache) == 0
+
+
+# --- Async API ---
+
+
+@pytest.fixture
+def async_secret_client():
+    """Patch the async Azure SDK so SecretClient.get_secret is awaitable."""
+    client = MagicMock()
+    client.close = AsyncMock()
+
+    async def get_secret(name, version=None):
+        if name == "missing":
+            raise ValueError("not found")
+        return MagicMock(value=f"{name}:{version or 'latest'}")
+
+    client.get_secret = AsyncMock(side_effect=get_secret)
+    client.credentials = []
+
+    def new_credential(**kwargs):
+        credential = MagicMock(close=AsyncMock())
+        client.credentials.append(credential)
+        return credential
+
+    with (
+        patch("azure.identity.DefaultAzureCredential"),
+        patch("azure.identity.aio.DefaultAzureCredential", side_effect=new_credential),
+        patch("azure.keyvault.secrets.aio.SecretClient", return_value=client),
+    ):
+        yield client
+
+
+def test_get_secret_async_uses_cache(async_secret_client):
+    keyvault.configure_secret_cache(ttl=60)
+
+    async def main():
+        first = await get_keyvault_secret_async(VAULT, "conn")
+        second = await get_keyvault_secret_async(VAULT, "conn")
+        await close_keyvault_async()
+        return first, second
+
+    assert asyncio.run(main()) == ("conn:latest", "conn:latest")
+    assert async_secret_client.get_secret.await_count == 1
+
+
+def test_get_secrets_async_gathers_values_and_errors(async_secret_client):
+    async def main():
+        return await get_keyvault_secrets_async(
+            VAULT, ["a", "b", "missing"], max_retries=1
+        )
+
+    values, errors = asyncio.run(main())
+
+    assert values == {"a": "a:latest", "b": "b:latest"}
+    assert isinstance(errors["missing"], ValueError)
+
+
+def test_get_secret_async_retries_with_asyncio_sleep(async_secret_client):
+    async_secret_client.get_secret.side_effect = [
+        HttpResponseError("boom"),
+        MagicMock(value="ok"),
+    ]
+
+    async def main():
+        with patch.object(keyvault_async.asyncio, "sleep", AsyncMock()) as sleep:
+            value = await get_keyvault_secret_async(VAULT, "conn", retry_delay=0.5)
+        return value, sleep
+
+    value, sleep = asyncio.run(main())
+    assert value == "ok"
+    sleep.assert_awaited_once_with(0.5)
+
+
+def test_async_auth_error_keeps_clients_open_for_sibling_requests(
+    async_secret_client,
+):
+    calls = {"auth": 0}
+
+    async def main():
+        gate = asyncio.Event()
+
+        async def get_secret(name, version=None):
+            if name == "slow":
+                await gate.wait()
+            elif calls["auth"] == 0:
+                calls["auth"] += 1
+                raise ClientAuthenticationError("token expired")
+            else:
+                # The sibling request still uses the retired client
+                assert async_secret_client.close.await_count == 0
+                gate.set()
+            return MagicMock(value=name)
+
+        async_secret_client.get_secret.side_effect = get_secret
+        return await get_keyvault_secrets_async(VAULT, ["slow", "auth"], retry_delay=0)
+
+    values, errors = asyncio.run(main())
+
+    assert values == {"slow": "slow", "auth": "auth"}
+    assert errors == {}
+    # The failing credential was replaced and closed with its client once idle
+    first, second = async_secret_client.credentials
+    assert async_secret_client.close.await_count == 1
+    assert first.close.await_count == 1
+    assert second.close.await_count == 0
+
+
+def test_async_state_is_built_off_the_event_loop(async_secret_client):
+    import threading
+
+    from azure.keyvault.secrets import aio as secrets_aio
+
+    threads = []
+    client_cls = secrets_aio.SecretClient
+    client_cls.side_effect = lambda **kwargs: (
+        threads.append(threading.get_ident()) or async_secret_client
+    )
+
+    async def main():
+        value = await get_keyvault_secret_async(VAULT, "conn")
+        await close_keyvault_async()
+        return value, threading.get_ident()
+
+    value, loop_thread = asyncio.run(main())
+    assert value == "conn:latest"
+    assert threads and loop_thread not in threads
+    # Closing the loop's state closes its own aio credential
+    (credential,) = async_secret_client.credentials
+    assert credential.close.await_count == 1
+
+
+def test_async_fallback_never_touches_the_shared_credential(async_secret_client):
+    async_secret_client.get_secret.side_effect = [
+        ClientAuthenticationError("token expired"),
+        MagicMock(value="ok"),
+    ]
+    shared = credentials.get_credential()
+
+    async def main():
+        with patch(
+            "azure.identity.aio.DefaultAzureCredential",
+            side_effect=ImportError("aiohttp"),
+        ):
+            value = await get_keyvault_secret_async(VAULT, "conn", retry_delay=0)
+            await close_keyvault_async()
+        return value
+
+    assert asyncio.run(main()) == "ok"
+    assert credentials.get_credential() is shared
+    shared.close.assert_not_called()
+
+
+# --- kv:// references in configs ---
+
+
+def _ref_config(**env_vars):
+    return CorePipelineConfig(
+        env="dev",
+        domain="finance",
+        product="forecast",
+        table_name="positions",
+        env_vars={"datalake_name": "dlakeacct", **env_vars},
+    )
+
+
+def test_parse_secret_ref_forms():
+    assert parse_secret_ref("kv://myvault/conn") == SecretRef(VAULT, "conn")
+    assert parse_secret_ref("kv://v.vault.azure.cn/conn/abc") == SecretRef(
+        "https://v.vault.azure.cn/", "conn", "abc"
+    )
+    with pytest.raises(ValueError, match="expected kv://"):
+        parse_secret_ref("kv://myvault")
+
+
+def test_config_get_resolves_reference_lazily(secret_client):
+    cfg = _ref_config(sql_password="kv://myvault/sql-password")
+    assert secret_client.get_secret.call_count == 0
+
+    assert cfg.get("sql_password") == "sql-password:latest"
+    assert cfg["sql_password"] == "sql-password:latest"
+    assert cfg.get("datalake_name") == "dlakeacct"
+    assert secret_client.get_secret.call_count == 1
+    assert cfg.env_vars["sql_password"] == "kv://myvault/sql-password"
+    assert "sql-password:latest" not in repr(cfg)
+
+
+def test_prefetch_deduplicates_across_configs(secret_client):
+    env_vars = {
+        "sql_password": "kv://myvault/sql-password",
+        "api_key": "kv://myvault/api-key/v2",
+        "alias": "kv://myvault/sql-password",
+    }
+    configs = [_ref_config(**env_vars) for _ in range(5)]
+
+    assert prefetch_secrets(configs) == 2
+    assert secret_client.get_secret.call_count == 2
+    assert configs[3].get("api_key") == "api-key:v2"
+    assert configs[4].get("alias") == "sql-password:latest"
+    assert secret_client.get_secret.call_count == 2
+
+
+def test_prefetch_failure_names_variables(secret_client):
+    secret_client.get_secret.side_effect = ValueError("denied")
+    cfg = _ref_config(token="kv://myvault/token")
+    with pytest.raises(RuntimeError, match="token") as info:
+        cfg.prefetch()
+    assert isinstance(info.value.__cause__, ValueError)
+
+
+def test_print_config_never_shows_secret_values(secret_client, capsys):
+    cfg = _ref_config(sql_password="kv://myvault/sql-password").prefetch()
+    print_config(cfg)
+    out = capsys.readouterr().out
+    assert "kv://myvault/sql-password (Key Vault reference)" in out
+    assert "sql-password:latest" not in out
+
+
+@pytest.mark.parametrize("key", ["datalake_name", "datalake_container_name"])
+def test_path_variables_cannot_be_references(secret_client, key):
+    from dataorc_utils.config.paths import abfss_uri
+
+    cfg = _ref_config(**{key: "kv://myvault/account"})
+    with pytest.raises(ValueError, match=f"'{key}'.*Key Vault reference"):
+        abfss_uri(cfg, "bronze")
+    assert secret_client.get_secret.call_count == 0
+
+
+def test_router_and_abfss_refuse_reference_accounts(secret_client):
+    from dataorc_utils.config import InfraContext
+    from dataorc_utils.databricks.abfss import configure_abfss
+    from dataorc_utils.lake import LakeRouter
+
+    cfg = _ref_config(datalake_name="kv://myvault/account")
+    infra = InfraContext(env="dev", variables=dict(cfg.env_vars))
+    router = LakeRouter()
+    for call in (
+        lambda: router.get(cfg, "bronze"),
+        lambda: router.get(infra, "bronze"),
+        lambda: configure_abfss(cfg, "tenant", "scope", "id", "secret"),
+    ):
+        with pytest.raises(ValueError, match="'datalake_name'.*Key Vault reference"):
+            call()
+    assert len(router) == 0
+    assert secret_client.get_secret.call_count == 0
+
+
+def test_config_secrets_follow_the_secret_cache(secret_client):
+    cache = keyvault.configure_secret_cache(ttl=60)
+    cfg = _ref_config(sql_password="kv://myvault/sql-password").prefetch()
+    assert cfg.get("sql_password") == "sql-password:latest"
+    assert secret_client.get_secret.call_count == 1
+
+    # Invalidation in the cache is seen by the config on the next get
+    secret_client.get_secret.side_effect = lambda name, version=None: MagicMock(
+        value="rotated"
+    )
+    cache.invalidate()
+    assert cfg.get("sql_password") == "rotated"
+    assert secret_client.get_secret.call_count == 2
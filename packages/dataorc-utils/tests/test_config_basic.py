@@ -1,5 +1,6 @@
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
@@ -13,7 +14,10 @@ from dataorc_utils.config import (  # noqa: E402
     CoreParam,
     CorePipelineConfig,
     PipelineParameterManager,
+    register_layout,
+    render_paths,
 )
+from dataorc_utils.config import paths as paths_module  # noqa: E402
 
 
 def make_config(container_name="raw", **overrides):
@@ -83,6 +87,100 @@ def test_work_path(container_name):
     assert path.endswith("bronze/finance/forecast/positions/v1/work")
 
 
+def test_lake_paths_are_memoised(monkeypatch):
+    cfg = make_config()
+    calls = []
+    original = paths_module.build_paths
+    monkeypatch.setattr(
+        "dataorc_utils.config.models.build_paths",
+        lambda c: calls.append(c) or original(c),
+    )
+
+    cfg.validate_rules()
+    assert cfg.get_work_path("gold") == "raw/gold/finance/forecast/positions/v3/work"
+    assert len(calls) == 1
+
+
+def test_memoised_values_are_not_dataclass_fields():
+    import dataclasses
+
+    cfg = make_config()
+    cfg.get_lake_path("bronze")
+    cfg.fingerprint()
+
+    names = {f.name for f in dataclasses.fields(cfg)}
+    assert not any(name.startswith("_") for name in names)
+    assert set(dataclasses.asdict(cfg)) == names
+    assert (
+        dataclasses.replace(cfg, table_name="other")
+        .get_lake_path("bronze")
+        .endswith("/other/v1/output/incremental")
+    )
+
+
+def test_env_vars_are_frozen_on_every_construction_path():
+    env_vars = {"datalake_name": "dlakeacct", "datalake_container_name": "raw"}
+    direct = make_config(env_vars=env_vars)
+    loaded = CorePipelineConfig.from_bytes(direct.to_bytes())
+
+    env_vars["datalake_container_name"] = "changed"
+    for cfg in (direct, loaded):
+        assert cfg.get_lake_path("silver").startswith("raw/")
+        assert cfg.get_lake_path("gold", version_override="v9").startswith("raw/")
+        with pytest.raises(TypeError):
+            cfg.env_vars["datalake_container_name"] = "x"  # type: ignore[index]
+
+
+def test_manager_configs_support_asdict_deepcopy_and_pickle():
+    import copy
+    import dataclasses
+    import pickle
+
+    mgr = PipelineParameterManager()
+    infra = _infra(datalake_name="dlakeacct")
+    single = mgr.build_core_config(infra, "finance", "forecast", "sales")
+    (bulk,) = mgr.build_core_configs(
+        infra, [{"domain": "finance", "product": "forecast", "table_name": "sales"}]
+    )
+
+    for cfg in (single, bulk):
+        assert dataclasses.asdict(cfg)["env_vars"] == dict(infra.variables)
+        assert copy.deepcopy(cfg) == cfg
+        assert pickle.loads(pickle.dumps(cfg)) == cfg
+
+
+def test_custom_layout_with_date_partition():
+    register_layout(
+        "dated",
+        "{layer}/{domain}/{product}/{table_name}/{version}/output/{processing_method}/date={run_date}",
+    )
+    cfg = make_config(
+        container_name=None,
+        env_vars={"datalake_path_layout": "dated", "run_date": "2026-01-31"},
+    )
+
+    assert cfg.get_lake_path("silver") == (
+        "silver/finance/forecast/positions/v2/output/full/date=2026-01-31"
+    )
+    assert cfg.get_work_path("silver") == "silver/finance/forecast/positions/v2/work"
+
+
+def test_unknown_layout_raises():
+    cfg = make_config(env_vars={"datalake_path_layout": "nope"})
+    with pytest.raises(ValueError, match="Unknown lake path layout"):
+        cfg.get_lake_path("bronze")
+
+
+def test_render_paths_bulk_matches_get_lake_path():
+    configs = [make_config(table_name=f"t{i}") for i in range(5)]
+    configs.append(make_config(container_name=None))
+
+    assert render_paths(configs, "gold") == [c.get_lake_path("gold") for c in configs]
+    assert render_paths(configs, "gold", work=True) == [
+        c.get_work_path("gold") for c in configs
+    ]
+
+
 # --- Validation rules ---
 
 
@@ -110,6 +208,125 @@ def test_validate_rules_pass_revision_format():
     assert cfg.validate_rules() is True
 
 
+def test_validate_config_returns_structured_report():
+    from dataorc_utils.config.rules import validate_config
+
+    report = validate_config(make_config(domain="Finance", bronze_version="x1"))
+
+    assert not report.ok
+    assert {(v.rule, v.layer, v.field) for v in report.violations} >= {
+        ("lowercase_lake_path", "bronze", "lake_path"),
+        ("version_format", "bronze", "version"),
+    }
+    with pytest.raises(ValueError, match="Rule checks failed"):
+        report.raise_for_violations()
+
+
+def test_bad_version_is_reported_once():
+    from dataorc_utils.config.rules import validate_config
+
+    report = validate_config(make_config(bronze_version="x1"))
+    assert [(v.rule, v.layer) for v in report.violations] == [
+        ("version_format", "bronze")
+    ]
+    with pytest.raises(ValueError) as info:
+        make_config(bronze_version="x1").validate_rules()
+    assert str(info.value).count("[bronze]") == 1
+
+
+def test_rule_engine_memoises_per_distinct_input():
+    from dataorc_utils.config.rules import Rule, RuleEngine
+
+    calls = []
+
+    def check(layer, version):
+        calls.append((layer, version))
+        return None
+
+    engine = RuleEngine([Rule("counting", ("layer", "version"), check)])
+    engine.validate_many([make_config(table_name=f"t{i}") for i in range(20)])
+
+    assert sorted(calls) == [("bronze", "v1"), ("gold", "v3"), ("silver", "v2")]
+
+
+def test_legacy_rule_func_is_adapted():
+    from dataorc_utils.config.rules import run_rules_checks, validate_configs
+
+    def no_gold(config, layer):
+        if layer == "gold":
+            raise ValueError("gold is not allowed")
+        return True
+
+    with pytest.raises(ValueError, match=r"\[gold\] gold is not allowed"):
+        run_rules_checks(make_config(), rules=[no_gold])
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        reports = validate_configs(
+            [make_config(), make_config(table_name="other")],
+            rules=[no_gold],
+            executor=pool,
+        )
+    assert [[v.rule for v in r.violations] for r in reports] == [
+        ["no_gold"],
+        ["no_gold"],
+    ]
+
+
+def _no_bronze(config, layer):
+    if layer == "bronze":
+        raise ValueError("bronze is not allowed")
+    return True
+
+
+def test_validate_configs_with_process_pool():
+    import pickle
+    from concurrent.futures import ProcessPoolExecutor
+
+    from dataorc_utils.config.rules import RULES, get_engine, validate_configs
+
+    engine = pickle.loads(pickle.dumps(get_engine([*RULES, _no_bronze])))
+    assert engine.validate(make_config()).violations[0].rule == "_no_bronze"
+
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        reports = validate_configs(
+            [make_config(), make_config(domain="Finance")],
+            rules=[*RULES, _no_bronze],
+            executor=pool,
+        )
+    assert [sorted({v.rule for v in r.violations}) for r in reports] == [
+        ["_no_bronze"],
+        ["_no_bronze", "lowercase_lake_path"],
+    ]
+
+
+def test_report_cache_expires_when_layout_is_registered():
+    import dataclasses
+
+    from dataorc_utils.config.rules import validate_config
+
+    def config():
+        cfg = make_config()
+        env_vars = {**cfg.env_vars, "datalake_path_layout": "rules_cache_test"}
+        return dataclasses.replace(cfg, env_vars=env_vars)
+
+    register_layout(
+        "rules_cache_test", "{layer}/Upper/{domain}/{table_name}/{version}/out"
+    )
+    assert not validate_config(config())
+    register_layout(
+        "rules_cache_test", "{layer}/lower/{domain}/{table_name}/{version}/out"
+    )
+    assert validate_config(config())
+
+
+def test_engine_registry_is_bounded():
+    from dataorc_utils.config import rules
+
+    for i in range(rules._MAX_ENGINES + 5):
+        rules.get_engine([rules.Rule(f"r{i}", ("layer",), lambda layer: None)])
+    assert len(rules._engines) <= rules._MAX_ENGINES
+
+
 # --- Case fallback ---
 
 
@@ -129,3 +346,327 @@ def test_case_fallback_env_uppercase_resolution(monkeypatch):
     infra = mgr.prepare_infrastructure(["datalake_name", "datalake_container_name"])
     assert infra.variables.get("datalake_name") == "LakeAcctFallback"
     assert infra.variables.get("datalake_container_name") == "container-fb"
+
+
+def test_env_snapshot_matches_any_casing(monkeypatch):
+    monkeypatch.setenv("Datalake_Name", "MixedCase")
+    mgr = PipelineParameterManager(case_fallback=True)
+
+    assert mgr.get_env_variables(["datalake_name"]) == {"datalake_name": "MixedCase"}
+
+    # Changes after the manager was created are seen by the next lookup
+    monkeypatch.setenv("Datalake_Name", "changed")
+    assert mgr.get_env_variables(["datalake_name"])["datalake_name"] == "changed"
+    monkeypatch.setenv("Datalake_Name", "again")
+    resolved = mgr.resolve(env_var_names=["datalake_name"])
+    assert resolved["datalake_name"] == "again"
+
+
+# --- Hierarchical resolution ---
+
+
+def _layered_manager():
+    return PipelineParameterManager(
+        environments_config={"prod": {"silver_version": "v2", "retention": "30"}},
+        domain_configs={"finance": {"gold_processing_method": "full"}},
+        product_configs={
+            "forecast": {"retention": "90"},
+            "finance.forecast": {"bronze_version": "v3"},
+        },
+    )
+
+
+def test_resolve_layers_with_provenance(monkeypatch):
+    monkeypatch.setenv("retention", "7")
+    mgr = _layered_manager()
+
+    resolved = mgr.resolve(
+        "prod", "finance", "forecast", overrides={"gold_version": "v4"}
+    )
+
+    assert resolved["silver_version"] == "v2"
+    assert resolved.source("silver_version") == "environment"
+    assert resolved["gold_processing_method"] == "full"
+    assert resolved.source("gold_processing_method") == "domain"
+    assert resolved["bronze_version"] == "v3"
+    assert resolved.source("bronze_version") == "product"
+    assert resolved["gold_version"] == "v4"
+    assert resolved.source("gold_version") == "overrides"
+    assert resolved["retention"] == "7"
+    assert resolved.source("retention") == "env_vars"
+    assert resolved.source("bronze_processing_method") == "defaults"
+
+    no_env = mgr.resolve("prod", "finance", "forecast", use_env_vars=False)
+    assert no_env["retention"] == "90"
+    assert mgr.resolver.resolve_layers("prod", "finance", "forecast") is (
+        mgr.resolver.resolve_layers("prod", "finance", "forecast")
+    )
+
+
+def test_build_core_config_uses_layered_defaults():
+    mgr = _layered_manager()
+    infra = _infra()
+    infra = type(infra)(env="prod", variables=infra.variables)
+
+    config = mgr.build_core_config(
+        infra, "finance", "forecast", "sales", silver_version="v5"
+    )
+    assert config.bronze_version == "v3"
+    assert config.silver_version == "v5"
+    assert config.gold_processing_method == "full"
+
+    infra.variables["datalake_name"] = "changed"
+    assert "datalake_name" not in config.env_vars
+    with pytest.raises(TypeError):
+        config.env_vars["datalake_name"] = "changed"  # type: ignore[index]
+
+    (bulk,) = mgr.build_core_configs(
+        infra, [{"domain": "finance", "product": "forecast", "table_name": "sales"}]
+    )
+    assert bulk.bronze_version == "v3"
+    assert bulk.silver_version == "v2"
+
+
+# --- Bulk config builder ---
+
+
+def _infra(**variables):
+    from dataorc_utils.config import InfraContext
+
+    return InfraContext(
+        env="dev", variables={"datalake_container_name": "raw", **variables}
+    )
+
+
+def test_build_core_configs_from_rows_applies_defaults():
+    mgr = PipelineParameterManager()
+    specs = [
+        {"domain": "finance", "product": "forecast", "table_name": "a"},
+        {
+            "domain": "finance",
+            "product": "forecast",
+            "table_name": "b",
+            "silver_version": "v2",
+            "gold_processing_method": "full",
+        },
+    ]
+
+    configs = mgr.build_core_configs(_infra(), specs)
+
+    assert [c.table_name for c in configs] == ["a", "b"]
+    assert configs[0].silver_version == "v1"
+    assert configs[1].silver_version == "v2"
+    assert configs[1].gold_processing_method == "full"
+    assert configs[0].env_vars is configs[1].env_vars
+    with pytest.raises(TypeError):
+        configs[0].env_vars["datalake_name"] = "x"  # type: ignore[index]
+
+
+def test_build_core_configs_from_columns():
+    mgr = PipelineParameterManager()
+    columns = {
+        "domain": ["finance", "finance"],
+        "product": ["forecast", "forecast"],
+        "table_name": ["a", "b"],
+    }
+
+    configs = mgr.build_core_configs(_infra(), columns)
+
+    assert [c.get_lake_path("bronze") for c in configs] == [
+        "raw/bronze/finance/forecast/a/v1/output/incremental",
+        "raw/bronze/finance/forecast/b/v1/output/incremental",
+    ]
+
+
+def test_build_core_configs_collects_all_errors():
+    mgr = PipelineParameterManager()
+    specs = [
+        {"domain": "Finance", "product": "forecast", "table_name": "a"},
+        {"domain": "finance", "product": "forecast", "table_name": "ok"},
+        {
+            "domain": "finance",
+            "product": "forecast",
+            "table_name": "b",
+            "bronze_version": "x",
+        },
+        {"domain": "finance", "product": "forecast", "table_name": "c", "typo": "1"},
+    ]
+
+    with pytest.raises(ValueError) as excinfo:
+        mgr.build_core_configs(_infra(), specs)
+
+    message = str(excinfo.value)
+    assert "Invalid table specs (3)" in message
+    assert "Finance.forecast.a" in message
+    assert "finance.forecast.b" in message
+    assert "typo" in message
+
+
+def test_iter_core_configs_is_lazy():
+    mgr = PipelineParameterManager()
+    specs = (
+        {"domain": "finance", "product": "forecast", "table_name": f"t{i}"}
+        for i in range(50_000)
+    )
+
+    configs = mgr.iter_core_configs(_infra(), specs)
+
+    first = next(configs)
+    assert first.table_name == "t0"
+
+
+# --- Fingerprint / serialisation ---
+
+
+def test_fingerprint_is_stable_and_covers_env_vars():
+    a = make_config()
+    b = make_config()
+    assert a.fingerprint() == b.fingerprint()
+    assert len(a.fingerprint()) == 64
+
+    other = CorePipelineConfig(
+        env=a.env,
+        domain=a.domain,
+        product=a.product,
+        table_name=a.table_name,
+        env_vars={**a.env_vars, "datalake_name": "other"},
+    )
+    assert other.fingerprint() != a.fingerprint()
+
+
+def test_to_bytes_round_trip_revalidates(monkeypatch):
+    import pickle
+
+    config = make_config()
+    data = config.to_bytes()
+
+    calls = []
+    monkeypatch.setattr(
+        CorePipelineConfig, "validate_rules", lambda self, layers=None: calls.append(1)
+    )
+    restored = CorePipelineConfig.from_bytes(data)
+    assert restored == config
+    assert restored.get_lake_path("bronze") == config.get_lake_path("bronze")
+    assert calls == [1]
+    CorePipelineConfig.from_bytes(data, validate=False)
+    assert calls == [1]
+
+    assert pickle.loads(pickle.dumps(config)) == config
+
+    with pytest.raises(ValueError, match="Invalid serialised config"):
+        CorePipelineConfig.from_bytes(b"not json")
+
+
+def test_from_bytes_validates_unvalidated_payload():
+    bad = CorePipelineConfig(
+        env="dev", domain="Finance", product="p", table_name="t", env_vars={}
+    )
+    data = bad.to_bytes(validate=False)
+    with pytest.raises(ValueError, match="uppercase"):
+        CorePipelineConfig.from_bytes(data)
+
+
+def test_from_bytes_ignores_senders_validated_flag():
+    import json
+
+    bad = CorePipelineConfig(
+        env="dev", domain="Finance", product="p", table_name="t", env_vars={}
+    )
+    payload = json.loads(bad.to_bytes(validate=False))
+    payload[-1] = True  # claims to be validated, with a matching digest
+    with pytest.raises(ValueError, match="uppercase"):
+        CorePipelineConfig.from_bytes(json.dumps(payload).encode())
+
+
+def test_config_cache_files_are_private(tmp_path, monkeypatch):
+    import stat
+
+    from dataorc_utils.config import ConfigCache
+
+    def no_chmod(*args, **kwargs):
+        raise AssertionError("cache files must be created private, not chmod-ed")
+
+    monkeypatch.setattr(os, "chmod", no_chmod)
+    old_umask = os.umask(0)
+    try:
+        ConfigCache(tmp_path).store("key", make_config())
+    finally:
+        os.umask(old_umask)
+    mode = stat.S_IMODE((tmp_path / "key.json").stat().st_mode)
+    assert mode == 0o600
+
+
+def test_load_core_config_warm_start(tmp_path):
+    from dataorc_utils.config import ConfigCache
+
+    cache = ConfigCache(tmp_path)
+    mgr = PipelineParameterManager()
+    infra = _infra()
+
+    first = mgr.load_core_config(infra, "finance", "forecast", "a", cache=cache)
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+    mgr.build_core_config = None  # type: ignore[method-assign]
+    second = mgr.load_core_config(infra, "finance", "forecast", "a", cache=cache)
+    assert second == first
+
+
+# --- Path parsing / catalog index ---
+
+
+@pytest.mark.parametrize("container_name", ["raw", None])
+def test_parse_lake_path_inverts_layouts(container_name):
+    from dataorc_utils.config import parse_lake_path
+
+    config = make_config(container_name=container_name)
+    parsed = parse_lake_path(config.get_lake_path("silver") + "/part-0.parquet")
+
+    assert parsed.container == (container_name or "")
+    assert (parsed.layer, parsed.domain, parsed.product, parsed.table_name) == (
+        "silver",
+        "finance",
+        "forecast",
+        "positions",
+    )
+    assert (parsed.version, parsed.processing_method) == (
+        "v2",
+        config.silver_processing_method,
+    )
+    assert parsed.rest == "part-0.parquet"
+
+    work = parse_lake_path(config.get_work_path("gold"))
+    assert (work.kind, work.version) == ("work", "v3")
+
+    with pytest.raises(ValueError, match="does not match"):
+        parse_lake_path("raw/landing/file.csv")
+
+
+def test_catalog_index_refresh_and_ordering():
+    from dataorc_utils.config.rules import version_sort_key
+    from dataorc_utils.lake.catalog import LakeCatalogIndex
+
+    assert sorted(["v2", "v10", "v1r2", "v1"], key=version_sort_key) == [
+        "v1",
+        "v1r2",
+        "v2",
+        "v10",
+    ]
+
+    listing = [
+        ["raw/bronze/sales/orders/lines/v1/output/incremental"],
+        ["raw/bronze/sales/orders/lines/v1r2/output/incremental/x.parquet"],
+        ["raw/bronze/sales/orders/returns/v1/output/full", "raw/_tmp/junk"],
+    ]
+    index = LakeCatalogIndex.from_paths(listing)
+    key = ("bronze", "sales", "orders", "lines")
+    assert index.latest_version(*key) == "v1r2"
+    assert len(index) == 2
+    assert index.skipped == 1
+
+    index.refresh(["raw/bronze/sales/orders/lines/v2/output/full"], *key)
+    assert index.versions(*key) == ["v2"]
+    assert index.processing_methods(*key, "v2") == ["full"]
+
+    index.remove("bronze", "sales", "orders", "returns")
+    assert index.tables() == [key]
+    assert LakeCatalogIndex.from_dict(index.to_dict()).versions(*key) == ["v2"]
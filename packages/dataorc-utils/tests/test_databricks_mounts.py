@@ -0,0 +1,166 @@
+"""Tests for dataorc_utils.databricks.mounts batch mounting."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from dataorc_utils.databricks import mounts
+from dataorc_utils.databricks.mounts import MountSpec, ensure_mounts
+
+
+@pytest.fixture
+def dbutils(monkeypatch, tmp_path):
+    monkeypatch.setenv("DATAORC_MOUNT_STATE_DIR", str(tmp_path))
+    fake = MagicMock()
+    fake.secrets.get.side_effect = lambda scope, key: f"{scope}:{key}"
+    fake.fs.mounts.return_value = []
+    monkeypatch.setattr(mounts, "dbutils", fake, raising=False)
+    monkeypatch.setattr(mounts, "_key", None)
+    return fake
+
+
+def _specs(account="lake", layers=("bronze", "silver", "gold")):
+    return [
+        MountSpec(
+            layer, account, "tenant", "scope", "sp-id", "sp-secret", f"/mnt/{layer}"
+        )
+        for layer in layers
+    ]
+
+
+def test_ensure_mounts_batches_secrets_and_mounts(dbutils):
+    summary = ensure_mounts(_specs())
+
+    assert [r.action for r in summary.results] == ["mounted"] * 3
+    assert summary.ok
+    assert dbutils.secrets.get.call_count == 2  # one per (scope, key)
+    assert dbutils.fs.mounts.call_count == 1
+    assert dbutils.fs.mount.call_count == 3
+    assert all(r.verified for r in summary.results)
+
+
+def test_ensure_mounts_skips_unchanged_fingerprint(dbutils):
+    ensure_mounts(_specs())
+    dbutils.fs.mounts.return_value = [
+        SimpleNamespace(
+            mountPoint=f"/mnt/{layer}",
+            source=f"abfss://{layer}@lake.dfs.core.windows.net/",
+        )
+        for layer in ("bronze", "silver", "gold")
+    ]
+    dbutils.reset_mock(return_value=False)
+
+    summary = ensure_mounts(_specs())
+    assert [r.action for r in summary.results] == ["unchanged"] * 3
+    dbutils.fs.updateMount.assert_not_called()
+    dbutils.fs.ls.assert_not_called()
+
+    # Rotated secret -> new fingerprint -> update
+    dbutils.secrets.get.side_effect = lambda scope, key: f"{scope}:{key}:rotated"
+    summary = ensure_mounts(_specs())
+    assert [r.action for r in summary.changed] == ["updated"] * 3
+
+
+def test_fingerprints_are_keyed_and_private(dbutils, tmp_path, monkeypatch):
+    import hashlib
+    import json
+    import os
+    import stat
+
+    def no_chmod(*args, **kwargs):
+        raise AssertionError("state files must be created private, not chmod-ed")
+
+    monkeypatch.setattr(os, "chmod", no_chmod)
+    old_umask = os.umask(0)
+    try:
+        ensure_mounts(_specs(layers=("bronze",)))
+    finally:
+        os.umask(old_umask)
+
+    for name in ("mounts.key", "mounts.json"):
+        assert stat.S_IMODE((tmp_path / name).stat().st_mode) == 0o600
+    stored = json.loads((tmp_path / "mounts.json").read_text())["/mnt/bronze"]
+    configs = mounts.OAuthConfig("tenant", "scope:sp-id", "scope:sp-secret")
+    source = "abfss://bronze@lake.dfs.core.windows.net/"
+    payload = json.dumps([source, configs.to_dict()], sort_keys=True).encode()
+    assert stored != hashlib.sha256(payload).hexdigest()
+    assert stored == mounts._fingerprint(source, configs.to_dict())
+
+
+def test_ensure_mount_does_not_write_state(dbutils, tmp_path):
+    dbutils.fs.mounts.return_value = []
+    mounts.ensure_mount("bronze", "lake", "tenant", "scope", "id", "secret")
+    assert not (tmp_path / "mounts.json").exists()
+
+
+def test_ensure_mounts_reports_failures(dbutils):
+    def mount(source, mount_point, extra_configs):
+        if mount_point == "/mnt/silver":
+            raise RuntimeError("boom")
+
+    dbutils.fs.mount.side_effect = mount
+
+    summary = ensure_mounts(_specs())
+
+    assert not summary.ok
+    assert [(r.mount_point, r.error) for r in summary.failed] == [
+        ("/mnt/silver", "boom")
+    ]
+    with pytest.raises(ValueError, match="Duplicate mount points"):
+        ensure_mounts(_specs() + _specs(layers=("bronze",)))
+
+
+# --- Direct abfss:// access ---
+
+
+def test_oauth_config_account_scoped_keys():
+    oauth = mounts.OAuthConfig("tenant", "id", "secret")
+
+    scoped = oauth.to_dict("lake")
+    assert scoped["fs.azure.account.auth.type.lake.dfs.core.windows.net"] == "OAuth"
+    assert len(scoped) == len(oauth.to_dict())
+    assert oauth.to_storage_options("lake")["account_name"] == "lake"
+
+
+@pytest.mark.parametrize(
+    ("container_name", "expected"),
+    [
+        (
+            "raw",
+            "abfss://raw@lake.dfs.core.windows.net/silver/sales/orders/t/v1/output/incremental",
+        ),
+        (
+            "",
+            "abfss://silver@lake.dfs.core.windows.net/sales/orders/t/v1/output/incremental",
+        ),
+    ],
+)
+def test_configure_abfss_applies_once(dbutils, container_name, expected):
+    from dataorc_utils.config import CorePipelineConfig
+    from dataorc_utils.databricks.abfss import clear_abfss_cache, configure_abfss
+
+    clear_abfss_cache()
+    config = CorePipelineConfig(
+        env="dev",
+        domain="sales",
+        product="orders",
+        table_name="t",
+        env_vars={"datalake_name": "lake", "datalake_container_name": container_name},
+    )
+    spark = MagicMock()
+
+    first = configure_abfss(
+        config, "tenant", "scope", "sp-id", "sp-secret", spark=spark
+    )
+    second = configure_abfss(
+        config, "tenant", "scope", "sp-id", "sp-secret", spark=spark
+    )
+
+    assert first.uris["silver"] == expected
+    assert (first.applied, second.applied) == (True, False)
+    assert spark.conf.set.call_count == 5
+    assert dbutils.secrets.get.call_count == 2
+    assert first.storage_options["client_secret"] == "scope:sp-secret"
@@ -0,0 +1,70 @@
+"""Import-time budget for dataorc_utils.
+
+Short Databricks wheel tasks pay the package import on every start, so the
+public packages must not pull in the Azure SDK, fsspec, asyncio or the
+Databricks runtime until they are used.
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+
+# Cumulative import time for the packages below, in microseconds. Generous
+# enough for slow CI machines; eager Azure SDK imports alone exceed it.
+IMPORT_BUDGET_US = 200_000
+
+PACKAGES = (
+    "dataorc_utils",
+    "dataorc_utils.azure",
+    "dataorc_utils.config",
+    "dataorc_utils.databricks",
+    "dataorc_utils.lake",
+    "dataorc_utils.tracing",
+)
+
+HEAVY_MODULES = ("azure.", "fsspec", "asyncio", "databricks.sdk")
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_import_does_not_load_heavy_dependencies():
+    code = (
+        f"import sys, json; import {', '.join(PACKAGES)}; "
+        "print(json.dumps(sorted(sys.modules)))"
+    )
+    loaded = json.loads(_run(code).stdout)
+
+    heavy = [m for m in loaded if m.startswith(HEAVY_MODULES) or m == "azure"]
+    assert heavy == []
+
+
+def test_import_time_budget():
+    result = _run(f"import {', '.join(PACKAGES)}", "-X", "importtime")
+
+    # Lines look like "import time:   self [us] | cumulative | module"
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            cumulative[parts[2].rstrip()] = int(parts[1])
+    total = sum(cumulative.get(f" {name}", 0) for name in PACKAGES)
+
+    assert 0 < total < IMPORT_BUDGET_US, f"dataorc_utils import took {total} us"
+
+
+def test_lazy_exports_resolve():
+    import dataorc_utils
+    from dataorc_utils import lake
+
+    assert dataorc_utils.config.CorePipelineConfig.__name__ == "CorePipelineConfig"
+    assert lake.LakeFileSystem.__module__ == "dataorc_utils.lake.filesystem"
+    assert "AdlsLakeFileSystem" in dir(lake)
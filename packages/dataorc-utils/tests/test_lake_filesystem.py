@@ -2,14 +2,31 @@
 
 from __future__ import annotations
 
+import json
+import os
+import pickle
+import sys
 import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from dataorc_utils.lake import (
+    AllOf,
+    AnyOf,
+    HedgePolicy,
+    Hedger,
     LakeFileSystem,
     LakeFileSystemProtocol,
+    Marker,
+    PartitionedWriter,
+    shared_hedger,
+    wait_for_paths,
+    wait_for_paths_async,
 )
 from dataorc_utils.lake.adls_filesystem import AdlsLakeFileSystem
 
@@ -24,13 +41,16 @@ class _InMemoryFileClient:
     def __init__(self, store: dict[str, bytes], path: str):
         self._store = store
         self._path = path
+        self._staged: dict[int, bytes] = {}
 
     def upload_data(self, data: bytes, *, overwrite: bool = False) -> None:
         self._store[self._path] = data
 
     def download_file(self):
+        from azure.core.exceptions import ResourceNotFoundError
+
         if self._path not in self._store:
-            raise FileNotFoundError(self._path)
+            raise ResourceNotFoundError(self._path)
         blob = self._store[self._path]
 
         dl = MagicMock()
@@ -38,9 +58,33 @@ class _InMemoryFileClient:
         return dl
 
     def get_file_properties(self):
+        from azure.core.exceptions import ResourceNotFoundError
+
         if self._path not in self._store:
-            raise FileNotFoundError(self._path)
-        return {}
+            raise ResourceNotFoundError(self._path)
+        data = self._store[self._path]
+        return SimpleNamespace(size=len(data), etag=str(hash(data)), metadata={})
+
+    def create_file(self, **kwargs):
+        self._store.setdefault(self._path, b"")
+
+    def append_data(self, data: bytes, offset: int, length: int | None = None):
+        self._staged[offset] = data
+
+    def flush_data(self, offset: int, etag=None, match_condition=None):
+        from azure.core.exceptions import ResourceModifiedError
+
+        current = self._store[self._path]
+        if etag is not None and etag != str(hash(current)):
+            self._staged.clear()
+            exc = ResourceModifiedError("ConditionNotMet")
+            exc.status_code = 412
+            raise exc
+        data = current + b"".join(v for _, v in sorted(self._staged.items()))
+        assert len(data) == offset
+        self._store[self._path] = data
+        self._staged.clear()
+        return {"etag": str(hash(data))}
 
     def delete_file(self):
         if self._path not in self._store:
@@ -57,6 +101,18 @@ class _InMemoryFsClient:
     def get_file_client(self, path: str) -> _InMemoryFileClient:
         return _InMemoryFileClient(self._store, path)
 
+    def get_paths(self, path: str | None = None, recursive: bool = True):
+        self.listings = getattr(self, "listings", 0) + 1
+        prefix = f"{path}/" if path else ""
+        for name in sorted(self._store):
+            if name.startswith(prefix) and (
+                recursive or "/" not in name[len(prefix) :]
+            ):
+                data = self._store[name]
+                yield SimpleNamespace(
+                    name=name, content_length=len(data), etag=str(hash(data))
+                )
+
 
 # ---------------------------------------------------------------------------
 # Fixtures — each yields a ready-to-use filesystem instance
@@ -77,7 +133,7 @@ def adls_fs():
         patch(
             "dataorc_utils.lake.adls_filesystem.DataLakeServiceClient"
         ) as mock_service_cls,
-        patch("dataorc_utils.lake.adls_filesystem.DefaultAzureCredential"),
+        patch("dataorc_utils.lake.adls_filesystem.get_credential"),
     ):
         mock_service = mock_service_cls.return_value
         mock_service.get_file_system_client.return_value = _InMemoryFsClient()
@@ -95,7 +151,7 @@ def adls_abfss_fs():
         patch(
             "dataorc_utils.lake.adls_filesystem.DataLakeServiceClient"
         ) as mock_service_cls,
-        patch("dataorc_utils.lake.adls_filesystem.DefaultAzureCredential"),
+        patch("dataorc_utils.lake.adls_filesystem.get_credential"),
     ):
         mock_service = mock_service_cls.return_value
         mock_service.get_file_system_client.return_value = _InMemoryFsClient()
@@ -135,6 +191,12 @@ class TestFileSystem:
 
         assert result is None
 
+    def test_read_bytes(self, fs):
+        fs.write_text("blob.txt", "bytes")
+
+        assert fs.read_bytes("blob.txt") == b"bytes"
+        assert fs.read_bytes("missing.bin") is None
+
     def test_write_and_read_json(self, fs):
         data = {"key": "value", "number": 42}
 
@@ -150,6 +212,113 @@ class TestFileSystem:
         assert not fs.exists("to_delete.txt")
         assert not fs.delete("to_delete.txt")  # Already deleted
 
+    def test_append_text_and_jsonl(self, fs):
+        fs.append_text("logs/run.log", "first\n")
+        fs.append_text("logs/run.log", "second\n")
+        fs.append_jsonl("audit.jsonl", {"step": 1})
+        fs.append_jsonl("audit.jsonl", [{"step": 2}, {"step": 3}])
+
+        assert fs.read_text("logs/run.log") == "first\nsecond\n"
+        lines = fs.read_text("audit.jsonl").splitlines()
+        assert [json.loads(line)["step"] for line in lines] == [1, 2, 3]
+
+    def test_iter_paths_and_catalog_index(self, fs):
+        from dataorc_utils.lake import LakeCatalogIndex
+
+        root = "silver/finance/forecast/positions"
+        fs.write_text(f"{root}/v1/output/delta/part-0.json", "{}")
+        fs.write_text(f"{root}/v2/output/delta/part-0.json", "{}")
+        fs.write_text(f"{root}/v1r2/output/full/part-0.json", "{}")
+        fs.write_text("silver/finance/other/t/v1/work/tmp.json", "{}")
+
+        assert f"{root}/v2/output/delta/part-0.json" in set(fs.iter_paths("silver"))
+
+        index = LakeCatalogIndex.scan(fs)
+        assert index.tables("silver", "finance") == [
+            ("silver", "finance", "forecast", "positions")
+        ]
+        assert (
+            index.latest_version("silver", "finance", "forecast", "positions") == "v2"
+        )
+
+        index.save(fs, "_catalog/index.json")
+        loaded = LakeCatalogIndex.load(fs, "_catalog/index.json")
+        assert loaded.versions("silver", "finance", "forecast", "positions") == [
+            "v1",
+            "v1r2",
+            "v2",
+        ]
+
+
+class TestAdlsAppend:
+    def test_append_retries_after_concurrent_append(self, adls_fs):
+        adls_fs.write_text("log.txt", "a\n")
+        file_client = adls_fs._fs_client.get_file_client("log.txt")
+        original = file_client.append_data
+        calls = []
+
+        def racing_append(data, offset, length=None):
+            if not calls:  # another writer commits first
+                file_client._store["log.txt"] += b"other\n"
+            calls.append(offset)
+            original(data, offset, length)
+
+        file_client.append_data = racing_append
+        adls_fs._fs_client.get_file_client = lambda path: file_client
+        adls_fs.append_text("log.txt", "b\n")
+
+        assert adls_fs.read_text("log.txt") == "a\nother\nb\n"
+        assert calls == [2, 8]
+
+    def test_consecutive_appends_reuse_the_known_end(self, adls_fs):
+        file_client = adls_fs._fs_client.get_file_client("log.txt")
+        probes = []
+        original = file_client.get_file_properties
+        file_client.get_file_properties = lambda: probes.append(1) or original()
+        adls_fs._fs_client.get_file_client = lambda path: file_client
+
+        for line in ("a\n", "b\n", "c\n"):
+            adls_fs.append_text("log.txt", line)
+        assert len(probes) == 2  # missing file, then after create_file
+
+        # Another writer moves the end: the stale ETag fails and is re-probed
+        file_client._store["log.txt"] += b"other\n"
+        adls_fs.append_text("log.txt", "d\n")
+        assert adls_fs.read_text("log.txt") == "a\nb\nc\nother\nd\n"
+        assert len(probes) == 3
+
+    def test_concurrent_appends_are_batched(self, adls_fs):
+        adls_fs.write_text("log.txt", "")
+        file_client = adls_fs._fs_client.get_file_client("log.txt")
+        adls_fs._fs_client.get_file_client = lambda path: file_client
+        original = file_client.flush_data
+        started, release = threading.Event(), threading.Event()
+        flushes = []
+
+        def gated_flush(offset, etag=None, match_condition=None):
+            flushes.append(offset)
+            started.set()
+            release.wait(5)
+            return original(offset, etag=etag, match_condition=match_condition)
+
+        file_client.flush_data = gated_flush
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            first = pool.submit(adls_fs.append_text, "log.txt", "0\n")
+            assert started.wait(5)
+            rest = [
+                pool.submit(adls_fs.append_text, "log.txt", f"{i}\n")
+                for i in range(1, 5)
+            ]
+            while sum(len(q) for q in adls_fs._append_queues.values()) < 4:
+                time.sleep(0.001)
+            release.set()
+            for future in [first, *rest]:
+                future.result()
+
+        assert flushes == [2, 10]
+        lines = adls_fs.read_text("log.txt").splitlines()
+        assert lines[0] == "0" and sorted(lines) == ["0", "1", "2", "3", "4"]
+
 
 # ---------------------------------------------------------------------------
 # LakeFileSystem-specific tests
@@ -162,3 +331,883 @@ class TestLakeFileSystemSpecific:
 
         assert lake_fs.exists("nested/subdir/file.txt")
         assert lake_fs.read_text("nested/subdir/file.txt") == "content"
+
+
+# ---------------------------------------------------------------------------
+# LakeRouter
+# ---------------------------------------------------------------------------
+
+
+def _router_config(**env_vars):
+    from dataorc_utils.config import CorePipelineConfig
+
+    return lambda table: CorePipelineConfig(
+        env="dev",
+        domain="sales",
+        product="orders",
+        table_name=table,
+        env_vars=env_vars,
+    )
+
+
+class TestLakeRouter:
+    def test_local_backend_roots_layers_under_mount_root(self, tmp_path):
+        from dataorc_utils.lake import LakeRouter
+
+        router = LakeRouter()
+        make = _router_config(datalake_mount_root=str(tmp_path))
+
+        silver = router.get(make("lines"), "silver")
+        silver.write_text("x.txt", "hi")
+
+        path = tmp_path / "silver/sales/orders/lines/v1/output/incremental/x.txt"
+        assert path.read_text() == "hi"
+        assert router.get(make("lines"), "silver") is silver
+        work = router.get(make("lines"), "silver", work=True)
+        assert work._base_path.endswith("silver/sales/orders/lines/v1/work")
+        assert work.fs is silver.fs
+
+    def test_adls_backend_shares_one_client_per_account(self):
+        from dataorc_utils.config import InfraContext
+        from dataorc_utils.lake import LakeRouter
+
+        router = LakeRouter()
+        make = _router_config(datalake_name="acct")
+        with (
+            patch("azure.storage.filedatalake.DataLakeServiceClient") as service_cls,
+            patch("dataorc_utils.azure.credentials.get_credential"),
+        ):
+            filesystems = [
+                fs
+                for table in ("a", "b", "c")
+                for fs in router.layers(make(table)).values()
+            ]
+            root = router.get(InfraContext("dev", {"datalake_name": "acct"}), "gold")
+
+        assert len(filesystems) == 9
+        assert len({id(fs) for fs in filesystems}) == 9
+        service_cls.assert_called_once()
+        assert {fs._service for fs in filesystems} == {service_cls.return_value}
+        assert root._base_path == ""
+        service_cls.return_value.get_file_system_client.assert_any_call(
+            file_system="gold"
+        )
+
+    def test_fsspec_backend_and_unknown_backend(self):
+        from dataorc_utils.lake import LakeRouter
+
+        make = _router_config(
+            datalake_name="acct",
+            datalake_container_name="raw",
+            datalake_backend="fsspec",
+        )
+        router = LakeRouter(protocol="memory", storage_options={})
+        with patch("fsspec.filesystem") as filesystem:
+            bronze = router.get(make("t"), "bronze")
+            router.get(make("u"), "bronze")
+
+        filesystem.assert_called_once_with("memory", account_name="acct")
+        assert bronze._base_path == "raw/bronze/sales/orders/t/v1/output/incremental"
+        with pytest.raises(ValueError, match="Unknown lake backend"):
+            LakeRouter(backend="s3")
+
+
+# ---------------------------------------------------------------------------
+# DeltaLogReader
+# ---------------------------------------------------------------------------
+
+_SCHEMA = (
+    '{"type":"struct","fields":[{"name":"id","type":"long","nullable":true,'
+    '"metadata":{}},{"name":"day","type":"string","nullable":true,"metadata":{}}]}'
+)
+
+
+def _commit(fs, table, version, *actions):
+    content = "\n".join(json.dumps(action) for action in actions)
+    fs.write_text(f"{table}/_delta_log/{version:020d}.json", content)
+
+
+def _add(path, size, records=1):
+    stats = json.dumps({"numRecords": records})
+    return {
+        "add": {
+            "path": path,
+            "size": size,
+            "partitionValues": {"day": path[4:14]},
+            "modificationTime": 1,
+            "dataChange": True,
+            "stats": stats,
+        }
+    }
+
+
+class TestDeltaLogReader:
+    table = "gold/finance/forecast/positions/v1/output/delta"
+
+    def _create(self, fs):
+        _commit(
+            fs,
+            self.table,
+            0,
+            {"protocol": {"minReaderVersion": 1, "minWriterVersion": 2}},
+            {
+                "metaData": {
+                    "id": "t-1",
+                    "schemaString": _SCHEMA,
+                    "partitionColumns": ["day"],
+                    "configuration": {"delta.appendOnly": "false"},
+                }
+            },
+            _add("day=2026-01-01/part-0.parquet", 100, records=10),
+            {"commitInfo": {"operation": "WRITE"}},
+        )
+
+    def test_snapshot_replays_and_updates_incrementally(self, fs):
+        from dataorc_utils.lake import DeltaLogReader
+
+        reader = DeltaLogReader(fs)
+        assert reader.snapshot(self.table) is None
+        self._create(fs)
+        _commit(fs, self.table, 1, _add("day=2026-01-02/part-0.parquet", 50))
+
+        snapshot = reader.snapshot(self.table)
+        assert snapshot.version == 1
+        assert snapshot.num_files == 2
+        assert snapshot.size_bytes == 150
+        assert snapshot.column_names == ["id", "day"]
+        assert snapshot.partition_columns == ["day"]
+        assert snapshot.properties == {"delta.appendOnly": "false"}
+        first = snapshot.files["day=2026-01-01/part-0.parquet"]
+        assert first.partition_values == {"day": "2026-01-01"}
+        assert first.num_records == 10
+
+        # Unchanged table: one probe for the next commit, same snapshot back
+        with patch.object(reader, "_read_text", wraps=reader._read_text) as read_text:
+            assert reader.snapshot(self.table) is snapshot
+        read_text.assert_called_once()
+        assert not reader.has_changed(self.table, since_version=1)
+
+        _commit(
+            fs,
+            self.table,
+            2,
+            {"remove": {"path": "day=2026-01-01/part-0.parquet"}},
+            _add("day=2026-01-01/part-1.parquet", 70),
+            {"commitInfo": {"operation": "OPTIMIZE"}},
+        )
+        updated = reader.snapshot(self.table)
+        assert updated.version == 2
+        assert sorted(updated.files) == [
+            "day=2026-01-01/part-1.parquet",
+            "day=2026-01-02/part-0.parquet",
+        ]
+        assert updated.last_commit == {"operation": "OPTIMIZE"}
+        assert updated.schema is snapshot.schema
+        assert reader.has_changed(self.table, since_version=1)
+        assert snapshot.version == 1 and snapshot.num_files == 2
+
+    def test_checkpoint_without_pyarrow_falls_back_to_replay(self, fs):
+        from dataorc_utils.lake import DeltaLogReader
+
+        self._create(fs)
+        _commit(fs, self.table, 1, _add("day=2026-01-02/part-0.parquet", 50))
+        fs.write_json(f"{self.table}/_delta_log/_last_checkpoint", {"version": 1})
+
+        with patch.dict(sys.modules, {"pyarrow": None, "pyarrow.parquet": None}):
+            assert DeltaLogReader(fs).version(self.table) == 1
+
+            fs.delete(f"{self.table}/_delta_log/{0:020d}.json")
+            with pytest.raises(ImportError, match="pyarrow"):
+                DeltaLogReader(fs).snapshot(self.table)
+
+    def test_read_errors_are_not_end_of_log(self, adls_fs):
+        from azure.core.exceptions import ServiceRequestError
+
+        from dataorc_utils.lake import DeltaLogReader
+
+        self._create(adls_fs)
+        reader = DeltaLogReader(adls_fs)
+        assert reader.version(self.table) == 0
+        _commit(adls_fs, self.table, 1, _add("day=2026-01-02/part-0.parquet", 50))
+
+        client = adls_fs._fs_client
+        original = client.get_file_client
+
+        def flaky(path):
+            file_client = original(path)
+            file_client.download_file = MagicMock(
+                side_effect=ServiceRequestError("connection reset")
+            )
+            return file_client
+
+        with patch.object(client, "get_file_client", side_effect=flaky):
+            with pytest.raises(ServiceRequestError):
+                reader.snapshot(self.table)
+            with pytest.raises(ServiceRequestError):
+                DeltaLogReader(adls_fs).snapshot(self.table)
+        assert adls_fs.read_text("missing.json") is None
+        assert reader.version(self.table) == 1
+
+    def test_checkpoint_is_loaded_before_later_commits(self, lake_fs):
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+        from dataorc_utils.lake import DeltaLogReader
+
+        self._create(lake_fs)
+        rows = [
+            {"metaData": {"id": "t-1", "schemaString": _SCHEMA}},
+            {"add": {"path": "a.parquet", "size": 5}},
+        ]
+        path = f"{self.table}/_delta_log/{3:020d}.checkpoint.parquet"
+        lake_fs.write_text(path, "")
+        pq.write_table(pa.Table.from_pylist(rows), lake_fs._resolve(path))
+        lake_fs.write_json(f"{self.table}/_delta_log/_last_checkpoint", {"version": 3})
+        _commit(lake_fs, self.table, 4, _add("day=2026-01-03/part-0.parquet", 7))
+
+        snapshot = DeltaLogReader(lake_fs).snapshot(self.table)
+        assert snapshot.version == 4
+        assert sorted(snapshot.files) == ["a.parquet", "day=2026-01-03/part-0.parquet"]
+
+
+# ---------------------------------------------------------------------------
+# LakeLock
+# ---------------------------------------------------------------------------
+
+
+class _FakeLeasedFile:
+    """ADLS file client with single-holder leases and metadata."""
+
+    def __init__(self):
+        self.holder = None
+        self.metadata = {}
+        self.renewals = 0
+
+    def upload_data(self, data, overwrite=False):
+        pass
+
+    def acquire_lease(self, lease_duration):
+        from azure.core.exceptions import HttpResponseError
+
+        if self.holder is not None:
+            exc = HttpResponseError(message="LeaseAlreadyPresent")
+            exc.status_code = 409
+            raise exc
+        lease = MagicMock()
+        lease.renew.side_effect = lambda: self._renew(lease)
+        lease.release.side_effect = lambda: setattr(self, "holder", None)
+        self.holder = lease
+        return lease
+
+    def _renew(self, lease):
+        if self.holder is not lease:
+            raise RuntimeError("LeaseIdMismatch")
+        self.renewals += 1
+
+    def get_file_properties(self):
+        return SimpleNamespace(metadata=dict(self.metadata))
+
+    def set_metadata(self, metadata, lease=None):
+        assert lease is self.holder
+        self.metadata = dict(metadata)
+
+
+class TestLakeLock:
+    def test_local_lock_excludes_and_increments_fencing_token(self, lake_fs):
+        from dataorc_utils.lake import LakeLock
+
+        first = LakeLock(lake_fs, "work/_lock", renew=False)
+        second = LakeLock(lake_fs, "work/_lock", timeout=0.05, poll_interval=0.01)
+
+        with first:
+            assert first.token == 1
+            assert not second.try_acquire()
+            with pytest.raises(TimeoutError):
+                with second:
+                    pass
+            first.check()
+
+        assert second.acquire()
+        assert second.token == 2
+        with pytest.raises(RuntimeError, match="not held"):
+            first.check()
+        second.release()
+        assert not lake_fs.exists("work/_lock.lease")
+
+    def test_local_lock_breaks_expired_lease(self, lake_fs):
+        from dataorc_utils.lake import LakeLock
+
+        crashed = LakeLock(lake_fs, "_lock", lease_duration=1, renew=False)
+        assert crashed.try_acquire()
+        lease_path = lake_fs._resolve("_lock.lease")
+        os.utime(lease_path, (0, 0))
+
+        successor = LakeLock(lake_fs, "_lock", lease_duration=1, renew=False)
+        assert successor.try_acquire()
+        assert successor.token == 2
+        with pytest.raises(RuntimeError, match="lost"):
+            crashed.check()
+        successor.check()
+        successor.release()
+
+    def test_adls_lock_uses_leases_with_background_renewal(self, adls_fs):
+        from dataorc_utils.lake import LakeLock
+
+        leased = _FakeLeasedFile()
+        adls_fs._fs_client = MagicMock()
+        adls_fs._fs_client.get_file_client.return_value = leased
+
+        lock = LakeLock(adls_fs, "_lock", lease_duration=0.03)
+        other = LakeLock(adls_fs, "_lock", renew=False)
+        with lock:
+            assert lock.token == 1
+            assert leased.metadata == {"fencing_token": "1"}
+            assert not other.try_acquire()
+            time.sleep(0.1)
+            assert leased.renewals >= 1
+            lock.check()
+
+        assert leased.holder is None
+        assert other.try_acquire()
+        assert other.token == 2
+        other.release()
+
+    def test_unsupported_filesystem(self):
+        from dataorc_utils.lake import LakeLock
+
+        with pytest.raises(ValueError, match="LakeLock needs"):
+            LakeLock(LakeFileSystem(protocol="memory"))
+
+
+# ---------------------------------------------------------------------------
+# BufferedLakeWriter
+# ---------------------------------------------------------------------------
+
+
+class _GatedFileSystem(LakeFileSystemProtocol):
+    """In-memory backend whose writes wait for ``gate`` and may fail."""
+
+    def __init__(self, fail=()):
+        self._base_path = ""
+        self.store: dict[str, str] = {}
+        self.writes: list[str] = []
+        self.gate = threading.Event()
+        self.fail = set(fail)
+
+    def read_text(self, path):
+        return self.store.get(path)
+
+    def write_text(self, path, content):
+        self.gate.wait(5)
+        if path in self.fail:
+            raise OSError(f"upload of {path} failed")
+        self.writes.append(path)
+        self.store[path] = content
+
+    def exists(self, path):
+        return path in self.store
+
+    def delete(self, path):
+        return self.store.pop(path, None) is not None
+
+    def append_text(self, path, content):
+        self.gate.wait(5)
+        self.writes.append(f"+{path}")
+        self.store[path] = self.store.get(path, "") + content
+
+
+class TestBufferedLakeWriter:
+    def test_writes_are_queued_and_coalesced(self):
+        from dataorc_utils.lake import BufferedLakeWriter
+
+        backend = _GatedFileSystem()
+        with BufferedLakeWriter(backend, max_workers=1) as out:
+            out.write_json("a.json", {"n": 0})  # in flight, blocked on the gate
+            for n in range(3):
+                out.write_json("status.json", {"n": n})
+            out.write_text("gone.txt", "x")
+            assert out.delete("gone.txt")
+
+            assert out.read_json("status.json") == {"n": 2}
+            assert out.exists("status.json")
+            assert backend.store == {}
+            backend.gate.set()
+
+        assert backend.writes == ["a.json", "status.json"]
+        assert json.loads(backend.store["status.json"]) == {"n": 2}
+        assert out.coalesced == 2
+        assert out.written == 2
+        with pytest.raises(RuntimeError, match="closed"):
+            out.write_text("late.txt", "x")
+
+    def test_queued_appends_are_sent_as_one_append(self):
+        from dataorc_utils.lake import BufferedLakeWriter
+
+        backend = _GatedFileSystem()
+        backend.store["log.txt"] = "0\n"
+        out = BufferedLakeWriter(backend, max_workers=1)
+        out.write_text("block.txt", "x")  # holds the only worker
+        for n in range(1, 4):
+            out.append_jsonl("events.jsonl", {"n": n})
+            out.append_text("log.txt", f"{n}\n")
+        out.write_text("status.txt", "a")
+        out.append_text("status.txt", "b")
+
+        backend.gate.set()
+        assert out.read_text("log.txt") == "0\n1\n2\n3\n"
+        out.close()
+        assert sorted(backend.writes) == [
+            "+events.jsonl",
+            "+log.txt",
+            "block.txt",
+            "status.txt",
+        ]
+        assert backend.store["status.txt"] == "ab"
+        assert len(backend.store["events.jsonl"].splitlines()) == 3
+
+    def test_flush_reraises_background_errors(self):
+        from dataorc_utils.lake import BufferedLakeWriter
+
+        backend = _GatedFileSystem(fail={"bad.txt", "worse.txt"})
+        backend.gate.set()
+        out = BufferedLakeWriter(backend)
+        out.write_text("bad.txt", "x")
+        out.write_text("worse.txt", "x")
+        out.write_text("good.txt", "x")
+
+        with pytest.raises(OSError, match="failed") as excinfo:
+            out.flush()
+        assert "and 1 more" in excinfo.value.__notes__[0]
+        assert backend.store == {"good.txt": "x"}
+        out.close()  # errors are reported once
+
+    def test_byte_budget_blocks_writers(self):
+        from dataorc_utils.lake import BufferedLakeWriter
+
+        backend = _GatedFileSystem()
+        out = BufferedLakeWriter(backend, max_buffered_bytes=10)
+        out.write_text("first.txt", "12345678")
+        second = threading.Thread(
+            target=out.write_text, args=("second.txt", "12345678")
+        )
+        second.start()
+        second.join(0.05)
+        assert second.is_alive()
+
+        backend.gate.set()
+        second.join(5)
+        out.close()
+        assert sorted(backend.store) == ["first.txt", "second.txt"]
+
+
+# ---------------------------------------------------------------------------
+# Pickling
+# ---------------------------------------------------------------------------
+
+
+def _read_in_worker(fs, path):
+    return fs.read_text(path)
+
+
+def _sas_token():
+    return "sv=2024&sig=token"
+
+
+class TestPickling:
+    def test_lake_filesystem_round_trip_and_process_pool(self, lake_fs):
+        lake_fs.write_text("a.txt", "hello")
+        assert lake_fs.fs is not None  # connect
+
+        clone = pickle.loads(pickle.dumps(lake_fs))
+        assert clone._fs is None
+        assert clone.read_text("a.txt") == "hello"
+
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            assert pool.submit(_read_in_worker, lake_fs, "a.txt").result() == "hello"
+
+    def test_injected_fsspec_filesystem_is_kept(self):
+        import fsspec
+
+        memory = fsspec.filesystem("memory")
+        fs = LakeFileSystem(base_path="/pickle-test", filesystem=memory)
+        fs.write_text("a.txt", "x")
+
+        clone = pickle.loads(pickle.dumps(fs))
+        assert clone.read_text("a.txt") == "x"
+
+    def test_adls_reconnects_through_per_process_pool(self):
+        from dataorc_utils.lake import adls_filesystem
+
+        adls_filesystem.clear_client_pool()
+        with (
+            patch.object(adls_filesystem, "DataLakeServiceClient") as service_cls,
+            patch.object(adls_filesystem, "get_credential") as get_credential,
+        ):
+            service_cls.return_value.get_file_system_client.return_value = (
+                _InMemoryFsClient()
+            )
+            fs = AdlsLakeFileSystem(
+                "https://acct.dfs.core.windows.net", "silver", base_path="t"
+            )
+            fs.write_text("a.txt", "hello")
+            payload = pickle.dumps(fs)
+            assert b"MagicMock" not in payload
+
+            first, second = pickle.loads(payload), pickle.loads(payload)
+            assert first.read_text("a.txt") == "hello"
+            second.exists("a.txt")
+
+            # one client at construction, one shared by both unpickled copies
+            assert service_cls.call_count == 2
+            assert first._service is second._service
+            assert get_credential.call_count == 2
+
+            sas = AdlsLakeFileSystem(
+                "https://acct.dfs.core.windows.net",
+                "gold",
+                credential_factory=_sas_token,
+            )
+            assert pickle.loads(pickle.dumps(sas))._fs_client is not None
+            assert service_cls.call_args.kwargs["credential"] == "sv=2024&sig=token"
+
+            custom = AdlsLakeFileSystem(
+                "https://acct.dfs.core.windows.net", "gold", credential=object()
+            )
+            with pytest.raises(TypeError, match="credential_factory"):
+                pickle.dumps(custom)
+        adls_filesystem.clear_client_pool()
+
+
+# ---------------------------------------------------------------------------
+# Hedging
+# ---------------------------------------------------------------------------
+
+
+def _fixed_delay(delay=0.02, **kwargs):
+    # min_samples out of reach keeps the delay at initial_delay
+    return HedgePolicy(initial_delay=delay, min_samples=10**6, **kwargs)
+
+
+class TestHedging:
+    def test_slow_primary_is_hedged_and_hedge_wins(self):
+        hedger = Hedger(_fixed_delay())
+        calls = []
+
+        def fetch():
+            calls.append(None)
+            if len(calls) == 1:
+                time.sleep(0.5)
+                return "slow"
+            return "fast"
+
+        assert hedger.call("read", fetch) == "fast"
+        assert hedger.call("read", lambda: "quick") == "quick"
+        stats = hedger.stats()["read"]
+        assert (stats.requests, stats.hedges, stats.hedge_wins) == (2, 1, 1)
+        hedger.shutdown()
+
+    def test_hedge_rate_is_capped(self):
+        hedger = Hedger(_fixed_delay(max_hedge_ratio=0.0, hedge_burst=1.0))
+
+        def slow():
+            time.sleep(0.05)
+            return 1
+
+        assert hedger.call("stat", slow) == 1
+        assert hedger.call("stat", slow) == 1
+        stats = hedger.stats()["stat"]
+        assert (stats.hedges, stats.capped) == (1, 1)
+        hedger.shutdown()
+
+    def test_hedges_do_not_queue_behind_primaries(self):
+        hedger = Hedger(_fixed_delay(max_workers=2, hedge_workers=2))
+        release = threading.Event()
+        started = []
+
+        def fetch():
+            with hedger._lock:
+                started.append(None)
+                first_two = len(started) <= 2
+            if first_two:
+                release.wait(5)  # both primary threads are stuck
+                return "slow"
+            return "fast"
+
+        with ThreadPoolExecutor(max_workers=2) as callers:
+            results = list(callers.map(lambda _: hedger.call("read", fetch), range(2)))
+        release.set()
+        assert results == ["fast", "fast"]
+        hedger.shutdown()
+
+    def test_calls_without_credit_run_inline(self):
+        hedger = Hedger(_fixed_delay(max_hedge_ratio=0.0, hedge_burst=0.0))
+        caller = threading.get_ident()
+        assert hedger.call("read", threading.get_ident) == caller
+        assert hedger._pool is None
+
+    def test_both_attempts_failing_raises_primary_error(self):
+        hedger = Hedger(_fixed_delay(delay=0.0))
+        calls = []
+
+        def fail():
+            calls.append(None)
+            n = len(calls)
+            time.sleep(0.05)
+            raise OSError(f"attempt {n}")
+
+        with pytest.raises(OSError, match="attempt 1"):
+            hedger.call("read", fail)
+        hedger.shutdown()
+
+    def test_delay_adapts_to_observed_quantile(self):
+        hedger = Hedger(HedgePolicy(initial_delay=1.0, min_samples=16, min_delay=0))
+        for _ in range(16):
+            hedger.call("read", lambda: None)
+        assert hedger.stats()["read"].delay < 0.1
+        hedger.shutdown()
+
+    def test_adls_reads_and_exists_are_hedged(self, adls_fs):
+        adls_fs._hedger = Hedger(_fixed_delay())
+        adls_fs.write_text("a.txt", "hello")
+
+        assert adls_fs.read_text("a.txt") == "hello"
+        assert adls_fs.read_bytes("a.txt") == b"hello"
+        assert adls_fs.exists("a.txt")
+        assert not adls_fs.exists("missing.txt")
+
+        stats = adls_fs.hedge_stats
+        assert stats["read"].requests == 2
+        assert stats["exists"].requests == 2
+        clone = pickle.loads(pickle.dumps(adls_fs))
+        assert clone._hedger is shared_hedger(adls_fs._hedger.policy)
+
+    def test_instances_share_one_hedger_per_policy(self):
+        from dataorc_utils.lake import LakeRouter
+
+        policy = _fixed_delay(hedge_workers=3)
+        with patch(
+            "dataorc_utils.lake.adls_filesystem.DataLakeServiceClient",
+            return_value=MagicMock(),
+        ):
+            instances = [
+                AdlsLakeFileSystem("https://acct.dfs.core.windows.net", "c", hedging=h)
+                for h in (policy, policy, True, True)
+            ]
+        router = LakeRouter(hedging=policy)
+
+        assert instances[0]._hedger is instances[1]._hedger is router.hedger
+        assert instances[2]._hedger is instances[3]._hedger is shared_hedger()
+        assert instances[0]._hedger is not instances[2]._hedger
+
+
+# ---------------------------------------------------------------------------
+# PartitionedWriter
+# ---------------------------------------------------------------------------
+
+
+def _read_jsonl(fs, path):
+    return [json.loads(line) for line in fs.read_text(path).splitlines()]
+
+
+class TestPartitionedWriter:
+    def test_routes_records_to_hive_partitions(self, fs):
+        with PartitionedWriter(
+            fs, ["date", "site"], path="out", manifest_path="_manifest.json"
+        ) as out:
+            out.write({"date": "2024-01-01", "site": "A", "v": 1})
+            out.write_many(
+                [
+                    {"date": "2024-01-01", "site": "A", "v": 2},
+                    {"date": "2024-01-02", "site": "B/C", "v": 3},
+                    {"date": "2024-01-02", "v": 4},
+                ]
+            )
+
+        manifest = out.manifest
+        assert [f.path for f in manifest.files] == [
+            "out/date=2024-01-01/site=A/part-00000.jsonl",
+            "out/date=2024-01-02/site=B%2FC/part-00000.jsonl",
+            "out/date=2024-01-02/site=__HIVE_DEFAULT_PARTITION__/part-00000.jsonl",
+        ]
+        assert manifest.records == 4
+        assert manifest.files[1].partition == {"date": "2024-01-02", "site": "B/C"}
+        assert _read_jsonl(fs, manifest.files[0].path) == [{"v": 1}, {"v": 2}]
+        assert fs.read_json("out/_manifest.json") == manifest.to_dict()
+
+    def test_values_with_the_same_text_share_a_partition(self, fs):
+        with PartitionedWriter(fs, ["k"], target_file_bytes=1) as out:
+            out.write_many(
+                [{"k": 1, "v": 1}, {"k": "1", "v": 2}, {"k": True}, {"k": "True"}]
+            )
+
+        assert [f.path for f in out.manifest.files] == [
+            "k=1/part-00000.jsonl",
+            "k=1/part-00001.jsonl",
+            "k=True/part-00000.jsonl",
+            "k=True/part-00001.jsonl",
+        ]
+        assert len(out.manifest.partitions) == 2
+        rows = [_read_jsonl(fs, f.path) for f in out.manifest.files[:2]]
+        assert rows == [[{"v": 1}], [{"v": 2}]]
+
+    def test_rolls_files_at_target_size_with_gzip(self, lake_fs):
+        import gzip
+
+        out = PartitionedWriter(
+            lake_fs,
+            ["k"],
+            compression="gzip",
+            target_file_bytes=40,
+            keep_partition_columns=True,
+        )
+        for i in range(10):
+            out.write({"k": i % 2, "n": i})
+        manifest = out.close()
+
+        assert len(manifest.partitions) == 2
+        assert len(manifest.files) > 2
+        assert all(f.path.endswith(".jsonl.gz") for f in manifest.files)
+        seen = []
+        for f in manifest.files:
+            payload = lake_fs.read_bytes(f.path)
+            assert f.bytes == len(payload)
+            rows = [json.loads(line) for line in gzip.decompress(payload).splitlines()]
+            assert {r["k"] for r in rows} == {int(f.partition["k"])}
+            seen += [r["n"] for r in rows]
+        assert sorted(seen) == list(range(10))
+
+    def test_memory_budget_flushes_largest_partition_early(self):
+        backend = _GatedFileSystem()
+        backend.gate.set()
+        out = PartitionedWriter(backend, ["k"], memory_budget=200, max_workers=2)
+        peak = 0
+        for i in range(200):
+            out.write({"k": i % 7, "payload": "x" * 10})
+            peak = max(peak, out._buffered + out._in_flight)
+        manifest = out.close()
+
+        assert peak <= 200 + 40  # at most one record over the budget
+        assert manifest.records == 200
+        assert len(manifest.files) > 7
+        assert sum(len(_read_jsonl(backend, f.path)) for f in manifest.files) == 200
+
+    def test_upload_errors_are_raised_on_close(self):
+        backend = _GatedFileSystem(fail={"k=1/part-00000.jsonl"})
+        backend.gate.set()
+        out = PartitionedWriter(backend, ["k"])
+        out.write({"k": 1})
+        out.write({"k": 2})
+        with pytest.raises(OSError, match="upload") as info:
+            out.close()
+        assert "k=1/part-00000.jsonl" in info.value.__notes__[0]
+        assert "k=2/part-00000.jsonl" in backend.store
+        with pytest.raises(RuntimeError, match="closed"):
+            out.write({"k": 3})
+
+    def test_exception_in_with_block_aborts(self):
+        backend = _GatedFileSystem()
+        threading.Timer(0.05, backend.gate.set).start()
+        with pytest.raises(KeyError):
+            with PartitionedWriter(
+                backend, ["k"], target_file_bytes=1, manifest_path="_manifest.json"
+            ) as out:
+                out.write({"k": 1})  # submitted, waits for the gate
+                out.target_file_bytes = 1 << 20
+                out.write({"k": 2})  # buffered only
+                raise KeyError("boom")
+
+        assert list(backend.store) == ["k=1/part-00000.jsonl"]
+        assert out.manifest is None
+        with pytest.raises(RuntimeError, match="closed"):
+            out.write({"k": 3})
+
+    def test_escapes_partition_column_names(self, fs):
+        with PartitionedWriter(fs, ["a/b", "c=d"]) as out:
+            out.write({"a/b": "x", "c=d": "y"})
+        (part,) = out.manifest.files
+        assert part.path == "a%2Fb=x/c%3Dd=y/part-00000.jsonl"
+        assert part.partition == {"a/b": "x", "c=d": "y"}
+
+    def test_rejects_unsupported_settings(self):
+        with pytest.raises(ValueError, match="write_bytes"):
+            PartitionedWriter(_GatedFileSystem(), ["k"], compression="gzip")
+        with pytest.raises(ValueError, match="compression"):
+            PartitionedWriter(_GatedFileSystem(), ["k"], compression="zstd")
+
+
+# ---------------------------------------------------------------------------
+# wait_for_paths
+# ---------------------------------------------------------------------------
+
+
+_FAST = {"poll_interval": 0.01, "max_interval": 0.02}
+
+
+class TestWaitForPaths:
+    def test_file_counts_once_size_and_etag_are_stable(self, fs):
+        from dataorc_utils.lake.sensor import _Poller
+
+        poller = _Poller(fs, AllOf("in/a.json"), 1, 4, 2)
+        assert not poller.poll() and not poller.met()
+        fs.write_text("in/a.json", "{")
+        assert poller.poll() and not poller.met()  # first sighting
+        fs.append_text("in/a.json", "}")
+        assert poller.poll() and not poller.met()  # still growing
+        assert not poller.poll() and poller.met()  # unchanged since last poll
+        poller.close()
+
+    def test_conditions_markers_and_timeout(self, lake_fs):
+        lake_fs.write_text("bronze/orders/_SUCCESS", "")
+        lake_fs.write_text("b.json", "{}")
+
+        ready = wait_for_paths(
+            lake_fs,
+            [Marker("bronze/orders"), AnyOf("a.json", "b.json")],
+            timeout=5,
+            **_FAST,
+        )
+        assert ready == ["b.json", "bronze/orders/_SUCCESS"]
+        assert wait_for_paths(lake_fs, "b.json", stable_polls=0) == ["b.json"]
+
+        with pytest.raises(TimeoutError, match="not ready: a.json, c.json"):
+            wait_for_paths(lake_fs, ["a.json", "b.json", "c.json"], timeout=0.05)
+        with pytest.raises(ValueError, match="mode"):
+            wait_for_paths(lake_fs, ["b.json"], mode="some")
+
+    def test_shared_directory_is_listed_once_per_poll(self, adls_fs):
+        names = [f"bronze/part-{i}.json" for i in range(6)]
+        for name in names:
+            adls_fs.write_text(name, "{}")
+        client = adls_fs._fs_client
+        with patch.object(
+            client, "get_file_client", wraps=client.get_file_client
+        ) as get_file_client:
+            ready = wait_for_paths(adls_fs, names, timeout=5, **_FAST)
+
+        assert ready == names
+        assert client.listings == 2  # first sighting, then stability check
+        get_file_client.assert_not_called()
+
+    def test_other_backends_with_fs_client_use_exists(self):
+        from dataorc_utils.lake.sensor import _probes
+
+        backend = _GatedFileSystem()
+        backend._fs_client = MagicMock()
+        backend.store["x"] = ""
+        stat, list_dir = _probes(backend)
+
+        assert list_dir is None
+        assert stat("x") == (None, None)
+        backend._fs_client.get_file_client.assert_not_called()
+
+    def test_waits_for_late_arrivals_and_async_variant(self, lake_fs):
+        import asyncio
+
+        timer = threading.Timer(0.05, lake_fs.write_text, ("late.json", "{}"))
+        timer.start()
+        assert wait_for_paths(lake_fs, "late.json", timeout=5, **_FAST) == ["late.json"]
+        timer.join()
+
+        backend = _GatedFileSystem()
+        backend.store["x"] = ""
+        ready = asyncio.run(wait_for_paths_async(backend, ["x"], timeout=5, **_FAST))
+        assert ready == ["x"]
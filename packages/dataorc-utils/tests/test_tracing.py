@@ -0,0 +1,142 @@
+"""Tests for dataorc_utils.tracing."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+from dataorc_utils import tracing
+from dataorc_utils.config import InfraContext, PipelineParameterManager
+from dataorc_utils.lake import LakeFileSystem
+
+
+@pytest.fixture(autouse=True)
+def _tracing():
+    tracing.reset()
+    yield
+    tracing.disable()
+    tracing.reset()
+
+
+def test_disabled_tracing_records_nothing():
+    calls = []
+
+    @tracing.traced("work")
+    def work(x):
+        calls.append(x)
+        return x * 2
+
+    with tracing.span("outer", a=1) as s:
+        s.set(b=2)
+        assert work(2) == 4
+
+    assert calls == [2]
+    assert tracing.get_trace().spans == ()
+    assert tracing.span("outer") is tracing.span("other")
+
+
+def test_nested_spans_attributes_and_errors():
+    tracing.enable()
+
+    @tracing.traced("lake.load", capture=("path", "tags"))
+    def load(path, *tags, strict=False):
+        if strict:
+            raise ValueError(path)
+        return path
+
+    with tracing.span("job", run="r1") as job:
+        load("a.json", "x", "y")
+        with pytest.raises(ValueError):
+            load(path="b.json", strict=True)
+        job.set(tables=2)
+
+    spans = {
+        s.name + str(s.attrs.get("path", "")): s for s in tracing.get_trace().spans
+    }
+    outer = spans["job"]
+    first, failed = spans["lake.loada.json"], spans["lake.loadb.json"]
+    assert outer.parent_id is None
+    assert first.parent_id == failed.parent_id == outer.span_id
+    assert first.attrs == {"path": "a.json", "tags": ["x", "y"]}
+    assert failed.error == "ValueError"
+    assert outer.attrs == {"run": "r1", "tables": 2}
+    assert outer.duration_ns >= first.duration_ns + failed.duration_ns
+
+
+def test_async_functions_and_memory_capture():
+    tracing.enable(memory=True)
+
+    @tracing.traced()
+    async def fetch():
+        await asyncio.sleep(0)
+        return 1
+
+    assert asyncio.run(fetch()) == 1
+    with tracing.span("alloc"):
+        block = bytearray(2_000_000)
+    del block
+
+    by_name = {s.name: s for s in tracing.get_trace().spans}
+    assert any(name.endswith("<locals>.fetch") for name in by_name)
+    assert by_name["alloc"].memory_peak >= 2_000_000
+
+
+def test_memory_peaks_only_on_main_thread():
+    tracing.enable(memory=True)
+
+    def worker():
+        with tracing.span("worker"):
+            bytearray(1_000_000)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    with tracing.span("main"):
+        pass
+
+    by_name = {s.name: s for s in tracing.get_trace().spans}
+    assert by_name["worker"].memory_peak is None
+    assert by_name["main"].memory_peak is not None
+
+
+def test_span_buffer_is_bounded():
+    tracing.enable(max_spans=3)
+    try:
+        for i in range(5):
+            with tracing.span(f"s{i}"):
+                pass
+        trace = tracing.get_trace()
+        assert [s.name for s in trace.spans] == ["s2", "s3", "s4"]
+        assert trace.dropped == 2
+        assert trace.to_dict()["dropped"] == 2
+    finally:
+        tracing.enable(max_spans=tracing.DEFAULT_MAX_SPANS)
+
+
+def test_public_entry_points_and_export(tmp_path):
+    tracing.enable()
+    mgr = PipelineParameterManager()
+    infra = InfraContext(env="dev", variables={"datalake_container_name": "raw"})
+    mgr.build_core_config(infra, "finance", "forecast", "sales")
+    fs = LakeFileSystem(base_path=str(tmp_path))
+    fs.write_text("a.txt", "x")
+    fs.read_text("a.txt")
+
+    trace = tracing.get_trace()
+    names = [s.name for s in trace.spans]
+    assert "config.build_core_config" in names
+    assert ["lake.write_text", "lake.read_text"] == [
+        n for n in names if n.startswith("lake.")
+    ]
+    assert "config.build_core_config" in trace.summary()
+
+    path = trace.save(fs)
+    assert path == f"_trace/{trace.run_id}.json"
+    chrome = json.loads(fs.read_text(path))
+    events = {e["name"]: e for e in chrome["traceEvents"]}
+    assert events["lake.read_text"]["ph"] == "X"
+    assert events["lake.read_text"]["args"] == {"path": "a.txt"}
+    assert json.loads(trace.to_json())["run_id"] == trace.run_id